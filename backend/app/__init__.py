@@ -1,57 +1,131 @@
+import os
+from importlib import import_module
+
 from flask import Flask
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 
-from .config import Config, DevelopmentConfig, ProductionConfig 
+from .config import Config, DevelopmentConfig, ProductionConfig, TestingConfig
 from .models import db
 
-# Routers
-from .routes.auth import auth_bp
-from .routes.usuario_routes import usuario_bp
-from .routes.sala_routes import sala_bp
-from .routes.tarea_routes import tarea_bp
-from .routes.sesion_routes import sesion_bp
-from .routes.tecnica_routes import tecnica_bp
-from .routes.recompensa_routes import recompensa_bp
-from .routes.progreso_routes import progreso_bp
-
-# Controllers
-from .controllers.pomodoro_controller import pomodoro_controller
-from .controllers.meditacion_controller import meditacion_controller
-from .controllers.todo_controller import todo_controller
-from .controllers.recompensa_controller import recompensa_controller
-
-def create_app(config_name='development'):
+CONFIGURACIONES = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
+
+# Blueprints de la API por nombre (SYNAPSE_BLUEPRINTS): módulo, atributo y prefijo. Cada
+# módulo se importa solo si su blueprint se registra; '/' y /health se registran siempre.
+BLUEPRINTS = {
+    # Routers
+    'auth': [('.routes.auth', 'auth_bp', '/api/auth')],
+    'usuarios': [('.routes.usuario_routes', 'usuario_bp', '/api/usuarios')],
+    'salas': [('.routes.sala_routes', 'sala_bp', '/api/salas')],
+    'tareas': [('.routes.tarea_routes', 'tarea_bp', '/api/tareas')],
+    'sesiones': [('.routes.sesion_routes', 'sesion_bp', '/api/sesiones')],
+    'tecnicas': [('.routes.tecnica_routes', 'tecnica_bp', '/api/tecnicas')],
+    'recompensas': [('.routes.recompensa_routes', 'recompensa_bp', '/api/recompensas')],
+    'progreso': [('.routes.progreso_routes', 'progreso_bp', '/api/progreso')],
+    'dashboard': [('.routes.dashboard_routes', 'dashboard_bp', '/api/dashboard')],
+    # Controllers
+    'productividad': [
+        ('.controllers.pomodoro_controller', 'pomodoro_controller', '/api/productividad'),
+        ('.controllers.todo_controller', 'todo_controller', '/api/productividad'),
+    ],
+    'bienestar': [('.controllers.meditacion_controller', 'meditacion_controller', '/api/bienestar')],
+    'gamificacion': [('.controllers.recompensa_controller', 'recompensa_controller', '/api/gamificacion')],
+}
+
+
+def create_app(config_name='development', blueprints=None):
+    """App completa para servir la API.
+
+    blueprints (o SYNAPSE_BLUEPRINTS, separados por comas) limita los blueprints de la API
+    que se importan y registran; vacío o 'todos' los registra todos, 'ninguno' solo deja '/'
+    y /health (sin JWT, CORS ni eventos). Migrate solo se inicializa bajo el CLI de flask
+    (flask db ...) o con init_migraciones().
+    """
+    app = _crear_base(config_name)
+    seleccion = _seleccionar_blueprints(blueprints if blueprints is not None else app.config.get('BLUEPRINTS'))
+
+    from .utils.compression import configurar_compresion
+    from .utils.json_provider import configurar_json
+    from .utils.sql_profiler import configurar_perfil_sql
+
+    configurar_json(app)
+    configurar_perfil_sql(app, db)
+
+    # Inicializar extensiones; las de la API solo si se registra alguno de sus blueprints
+    if seleccion:
+        from flask_cors import CORS
+        from flask_jwt_extended import JWTManager
+        from .services.acceso_service import AccesoService
+        from .services.evento_service import EventoService
+
+        CORS(app, origins=app.config.get('CORS_ORIGINS', '*'), expose_headers=['X-Next-Cursor', 'Link', 'X-Query-Count', 'Server-Timing'])
+        JWTManager(app)
+        EventoService.init_app(app)
+        AccesoService.init_app(app)
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        init_migraciones(app)
+    configurar_compresion(app)
+    if app.config.get('METRICAS_ACTIVAS', True):
+        from .utils.metrics import configurar_metricas
+        configurar_metricas(app, db)
+
+    # Registrar blueprints
+    from .routes.sistema_routes import sistema_bp
+    app.register_blueprint(sistema_bp)
+    for nombre in seleccion:
+        for modulo, atributo, prefijo in BLUEPRINTS[nombre]:
+            app.register_blueprint(getattr(import_module(modulo, __name__), atributo), url_prefix=prefijo)
+
+    return app
+
+
+def create_models_app(config_name='development'):
+    """App mínima para scripts y CLI: configuración, base de datos y modelos.
+
+    Sin blueprints, JWT, CORS ni métricas. Mantiene los listeners que toda escritura necesita
+    (versiones de colección e índice de búsqueda).
+    """
+    return _crear_base(config_name)
+
+
+def init_migraciones(app):
+    """Registra Flask-Migrate (y el grupo 'flask db'); lo necesitan upgrade() y compañía"""
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    return app
+
+
+def _crear_base(config_name):
     app = Flask(__name__)
 
     # Cargar configuración
-    if config_name == "development":
-        app.config.from_object(DevelopmentConfig)
-    elif config_name == "production":
-        app.config.from_object(ProductionConfig)
-    else:
-        app.config.from_object(Config)
-
-    # Inicializar extensiones
+    app.config.from_object(CONFIGURACIONES.get(config_name, Config))
+
+    from .utils.database import instrumentar_motor, opciones_motor
+
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = opciones_motor(app.config)
     db.init_app(app)
-    CORS(app, origins=app.config.get('CORS_ORIGINS', '*'))
-    jwt = JWTManager(app)
-    migrate = Migrate(app, db)
+    instrumentar_motor(app, db)
 
-    # Registrar blueprints
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(usuario_bp, url_prefix='/api/usuarios')
-    app.register_blueprint(sala_bp, url_prefix='/api/salas')
-    app.register_blueprint(tarea_bp, url_prefix='/api/tareas')
-    app.register_blueprint(sesion_bp, url_prefix='/api/sesiones')
-    app.register_blueprint(tecnica_bp, url_prefix='/api/tecnicas')
-    app.register_blueprint(recompensa_bp, url_prefix='/api/recompensas')
-    app.register_blueprint(progreso_bp, url_prefix='/api/progreso')
-
-    app.register_blueprint(pomodoro_controller, url_prefix='/api/productividad')
-    app.register_blueprint(meditacion_controller, url_prefix='/api/bienestar')
-    app.register_blueprint(todo_controller, url_prefix='/api/productividad')
-    app.register_blueprint(recompensa_controller, url_prefix='/api/gamificacion')
-
-    return app
\ No newline at end of file
+    # Listeners de sesión y de mapper registrados al importar: sin ellos una escritura no
+    # avanzaría la versión de su colección (ETag) ni el índice de búsqueda de usuarios
+    from .services import busqueda_service, version_service  # noqa: F401
+    return app
+
+
+def _seleccionar_blueprints(valor):
+    if isinstance(valor, str):
+        valor = [nombre.strip() for nombre in valor.split(',') if nombre.strip()]
+    if not valor or list(valor) == ['todos']:
+        return list(BLUEPRINTS)
+    if list(valor) == ['ninguno']:
+        return []
+    desconocidos = sorted(set(valor) - set(BLUEPRINTS))
+    if desconocidos:
+        raise ValueError(f'SYNAPSE_BLUEPRINTS: blueprints desconocidos {desconocidos}; '
+                         f'disponibles: {", ".join(BLUEPRINTS)}, o todos / ninguno')
+    # En el orden de BLUEPRINTS: así se registran siempre igual
+    return [nombre for nombre in BLUEPRINTS if nombre in valor]
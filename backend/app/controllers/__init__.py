@@ -1,5 +1,6 @@
 # controllers/__init__.py
-from .pomodoro_controller import pomodoro_controller
-from .meditacion_controller import meditacion_controller
-from .todo_controller import todo_controller
-from .recompensa_controller import recompensa_controller
+# create_app importa cada controlador solo si su blueprint está en SYNAPSE_BLUEPRINTS
+#from .pomodoro_controller import pomodoro_controller
+#from .meditacion_controller import meditacion_controller
+#from .todo_controller import todo_controller
+#from .recompensa_controller import recompensa_controller
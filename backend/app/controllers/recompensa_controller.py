@@ -1,7 +1,10 @@
 # controllers/recompensa_controller.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models import EventoRecompensa
+from app.services.evento_service import EventoService
 from app.services.recompensa_service import RecompensaService
+from app.utils.pagination import PaginacionError, parametros_pagina, paginar, respuesta_paginada
 
 recompensa_controller = Blueprint('recompensa_controller', __name__)
 
@@ -13,4 +16,35 @@ def verificar_recompensas_automaticas():
         resultado = RecompensaService.verificar_todas_recompensas_usuario(usuario_id)
         return jsonify(resultado), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@recompensa_controller.route('/eventos', methods=['GET'])
+@jwt_required()
+def listar_eventos():
+    """Eventos recientes del usuario con las recompensas que otorgaron (polling)"""
+    try:
+        usuario_id = get_jwt_identity()
+        limite, cursor = parametros_pagina()
+        query = EventoRecompensa.query.filter_by(usuario_id=usuario_id)
+        estado = request.args.get('estado')
+        if estado:
+            query = query.filter_by(estado=estado)
+
+        eventos, siguiente = paginar(query, EventoRecompensa.creado, EventoRecompensa.id_evento, limite, cursor)
+        return respuesta_paginada([evento.to_dict() for evento in eventos], siguiente, limite)
+    except PaginacionError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@recompensa_controller.route('/eventos/<string:evento_id>', methods=['GET'])
+@jwt_required()
+def obtener_evento(evento_id):
+    """Estado de un evento devuelto por finalizar/completar; sondear hasta que sea Procesado"""
+    try:
+        evento = EventoService.obtener_evento(get_jwt_identity(), evento_id)
+        if not evento:
+            return jsonify({'error': 'Evento no encontrado'}), 404
+        return jsonify(evento.to_dict()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
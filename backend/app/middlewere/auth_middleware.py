@@ -1,15 +1,70 @@
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from flask import jsonify
-from app.models import Usuario, Rol
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
+from flask import current_app, g, jsonify
+from app.models import db, Usuario, Rol
+from app.utils.cache import CacheLocal
+
+def obtener_principal():
+    """(activo, rol) del usuario del JWT actual, resuelto una vez por petición.
+
+    Con AUTH_PRINCIPAL_MODO='claims' se confía en los claims firmados del token (sin consultar
+    la base); si el token no los trae, o en modo 'cache', se usa una caché corta por proceso.
+    Devuelve None si el usuario no existe.
+    """
+    if 'principal' in g:
+        return g.principal
+
+    usuario_id = get_jwt_identity()
+    claims = get_jwt()
+    if current_app.config.get('AUTH_PRINCIPAL_MODO') == 'claims' and 'rol' in claims and 'activo' in claims:
+        principal = {'id_usuario': usuario_id, 'activo': claims['activo'], 'rol': claims['rol']}
+    else:
+        cache = _cache_principales()
+        principal = cache.get(usuario_id)
+        if principal is None:
+            fila = db.session.query(Usuario.activo, Rol.nombre).outerjoin(
+                Rol, Usuario.rol_id == Rol.id
+            ).filter(Usuario.id_usuario == usuario_id).first()
+            if fila:
+                principal = {'id_usuario': usuario_id, 'activo': fila[0], 'rol': fila[1]}
+                cache.set(usuario_id, principal)
+
+    g.principal = principal
+    return principal
+
+def claims_principal(usuario):
+    """Claims adicionales del token para el modo 'claims'"""
+    return {'activo': usuario.activo, 'rol': usuario.rol_usuario.nombre if usuario.rol_usuario else None}
+
+def invalidar_principal(usuario_id):
+    """Descartar el principal en caché; llamar tras cambiar activo, rol o contraseña.
+
+    Solo afecta al proceso actual: en los demás workers expira con AUTH_PRINCIPAL_TTL_SEGUNDOS.
+    """
+    _cache_principales().delete(usuario_id)
+
+def _cache_principales():
+    cache = current_app.extensions.get('synapse_principales')
+    if cache is None:
+        cache = current_app.extensions.setdefault('synapse_principales', CacheLocal(
+            current_app.config.get('CACHE_MAX_ENTRADAS', 1024),
+            ttl=current_app.config.get('AUTH_PRINCIPAL_TTL_SEGUNDOS', 30)
+        ))
+    return cache
+
+def puede_ver_privado(usuario_id):
+    """Datos privados de usuario_id (vista full, tareas): el propio usuario o un administrador activo"""
+    if usuario_id == get_jwt_identity():
+        return True
+    principal = obtener_principal()
+    return bool(principal and principal['activo'] and principal['rol'] == 'admin')
 
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         verify_jwt_in_request()
-        usuario_id = get_jwt_identity()
-        usuario = Usuario.query.get(usuario_id)
-        if not usuario or not usuario.rol or usuario.rol.nombre != 'admin':
+        principal = obtener_principal()
+        if not principal or not principal['activo'] or principal['rol'] != 'admin':
             return jsonify({'error': 'Acceso denegado. Se requieren permisos de administrador.'}), 403
         return f(*args, **kwargs)
     return decorated_function
@@ -18,9 +73,8 @@ def active_user_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         verify_jwt_in_request()
-        usuario_id = get_jwt_identity()
-        usuario = Usuario.query.get(usuario_id)
-        if not usuario or not usuario.activo:
+        principal = obtener_principal()
+        if not principal or not principal['activo']:
             return jsonify({'error': 'Usuario inactivo o no encontrado.'}), 401
         return f(*args, **kwargs)
     return decorated_function
@@ -14,5 +14,9 @@ from .sala_sesion import SalaSesion
 from .recompensa import Recompensa
 from .recompensa_usuario import RecompensaUsuario
 from .progreso import Progreso
+from .sistema_meta import SistemaMeta
+from .evento_recompensa import EventoRecompensa
+from .usuario_ngrama import UsuarioNgrama
+from .coleccion_version import ColeccionVersion
 
-__all__ = ['db', 'Rol', 'Usuario', 'UsuarioSala','Tecnica','Tarea','SesionTecnicaParam','Sesion','Sala','SalaSesion','Recompensa','RecompensaUsuario','Progreso'] 
\ No newline at end of file
+__all__ = ['db', 'Rol', 'Usuario', 'UsuarioSala','Tecnica','Tarea','SesionTecnicaParam','Sesion','Sala','SalaSesion','Recompensa','RecompensaUsuario','Progreso','SistemaMeta','EventoRecompensa','UsuarioNgrama','ColeccionVersion'] 
\ No newline at end of file
@@ -0,0 +1,20 @@
+from datetime import datetime
+from . import db
+
+# Modelo ColeccionVersion: contador de cambios por (usuario, colección) para los ETag de las
+# rutas GET. Las colecciones globales (catálogos) usan usuario_id = ''.
+class ColeccionVersion(db.Model):
+    __tablename__ = 'coleccion_version'
+
+    usuario_id = db.Column(db.String(36), primary_key=True)
+    coleccion = db.Column(db.String(30), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    actualizado = db.Column(db.DateTime(6), default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'usuario_id': self.usuario_id,
+            'coleccion': self.coleccion,
+            'version': self.version,
+            'actualizado': self.actualizado.isoformat() if self.actualizado else None
+        }
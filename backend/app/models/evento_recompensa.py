@@ -0,0 +1,37 @@
+from datetime import datetime
+from . import db
+from ..utils import generate_uuid
+
+# Modelo EventoRecompensa: bandeja de salida de eventos de dominio que evalúan recompensas
+class EventoRecompensa(db.Model):
+    __tablename__ = 'evento_recompensa'
+    __table_args__ = (
+        # El worker reclama los eventos pendientes más antiguos
+        db.Index('ix_evento_recompensa_estado_creado', 'estado', 'creado'),
+        # Consulta de notificaciones del usuario (polling)
+        db.Index('ix_evento_recompensa_usuario_creado', 'usuario_id', 'creado', 'id_evento'),
+    )
+
+    id_evento = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    usuario_id = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario'), nullable=False)
+    tipo = db.Column(db.String(50), nullable=False)
+    referencia_id = db.Column(db.String(36), nullable=True)
+    estado = db.Column(db.String(20), default='Pendiente', nullable=False)  # Pendiente, EnProceso, Procesado, Error
+    intentos = db.Column(db.Integer, default=0, nullable=False)
+    lote = db.Column(db.String(36), nullable=True)
+    reclamado = db.Column(db.DateTime(6), nullable=True)
+    reintentar_desde = db.Column(db.DateTime(6), nullable=True)  # tras un fallo, no se reclama antes
+    resultado = db.Column(db.JSON, nullable=True)
+    creado = db.Column(db.DateTime(6), default=datetime.utcnow, nullable=False)
+    procesado = db.Column(db.DateTime(6), nullable=True)
+
+    def to_dict(self):
+        return {
+            'id_evento': self.id_evento,
+            'tipo': self.tipo,
+            'referencia_id': self.referencia_id,
+            'estado': self.estado,
+            'recompensas_otorgadas': (self.resultado or {}).get('recompensas_otorgadas', []),
+            'creado': self.creado.isoformat() if self.creado else None,
+            'procesado': self.procesado.isoformat() if self.procesado else None
+        }
@@ -4,6 +4,10 @@ from ..utils import generate_uuid
 # Modelo Progreso
 class Progreso(db.Model):
     __tablename__ = 'progreso'
+    __table_args__ = (
+        # Un único registro de rollup por usuario y día
+        db.UniqueConstraint('usuario_id', 'fecha', name='uq_progreso_usuario_fecha'),
+    )
 
     id_progreso = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     usuario_id = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario'), nullable=False)
@@ -4,6 +4,9 @@ from ..utils import generate_uuid
 # Modelo Recompensa
 class Recompensa(db.Model):
     __tablename__ = 'recompensa'
+    __table_args__ = (
+        db.Index('ix_recompensa_nombre', 'nombre'),
+    )
 
     id_recompensa = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     nombre = db.Column(db.String(100), nullable=False)
@@ -4,6 +4,10 @@ from . import db
 # Modelo RecompensaUsuario
 class RecompensaUsuario(db.Model):
     __tablename__ = 'recompensausuario'
+    __table_args__ = (
+        # La PK empieza por id_usuario; este índice cubre la FK a recompensa
+        db.Index('ix_recompensausuario_recompensa', 'id_recompensa'),
+    )
 
     id_usuario = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario'), primary_key=True)
     id_recompensa = db.Column(db.String(36), db.ForeignKey('recompensa.id_recompensa'), primary_key=True)
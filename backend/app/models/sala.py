@@ -6,6 +6,9 @@ from ..utils import generate_uuid
 # Modelo Sala
 class Sala(db.Model):
     __tablename__ = 'sala'
+    __table_args__ = (
+        db.Index('ix_sala_privada_fecha_creacion', 'es_privada', 'fecha_creacion'),
+    )
 
     id_sala = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     nombre = db.Column(db.String(100), nullable=False)
@@ -3,6 +3,9 @@ from . import db
 # Modelo SalaSesion
 class SalaSesion(db.Model):
     __tablename__ = 'salasesion'
+    __table_args__ = (
+        db.Index('ix_salasesion_sesion', 'id_sesion'),
+    )
 
     id_sala = db.Column(db.String(36), db.ForeignKey('sala.id_sala'), primary_key=True)
     id_sesion = db.Column(db.String(36), db.ForeignKey('sesion.id_sesion'), primary_key=True)
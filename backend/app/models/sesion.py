@@ -7,6 +7,15 @@ from ..utils import generate_uuid
 # Modelo Sesion
 class Sesion(db.Model):
     __tablename__ = 'sesion'
+    __table_args__ = (
+        # Historial y estadísticas por usuario
+        db.Index('ix_sesion_usuario_fecha_inicio', 'usuario_id', 'fecha_inicio', 'id_sesion'),
+        db.Index('ix_sesion_usuario_estado', 'usuario_id', 'estado'),
+        # Técnicas populares / técnica en uso
+        db.Index('ix_sesion_tecnica', 'tecnica_id'),
+        # Reconstrucción del rollup de progreso
+        db.Index('ix_sesion_fecha_inicio', 'fecha_inicio'),
+    )
 
     id_sesion = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     usuario_id = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario'), nullable=False)
@@ -18,6 +27,10 @@ class Sesion(db.Model):
     estado = db.Column(db.String(20), nullable=False)
     es_grupal = db.Column(db.Boolean, default=False)
 
+    # Relaciones (en listados cargar parámetros con ParametroService.con_parametros)
+    parametros = db.relationship('SesionTecnicaParam', backref='sesion_param', lazy=True)
+    salas_sesion = db.relationship('SalaSesion', backref='sesion_sala', lazy=True)
+
     def to_dict(self):
         return {
             'id_sesion': self.id_sesion,
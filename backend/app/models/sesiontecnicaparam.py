@@ -4,6 +4,9 @@ from ..utils import generate_uuid
 # Modelo SesionTecnicaParam
 class SesionTecnicaParam(db.Model):
     __tablename__ = 'sesiontecnicaparam'
+    __table_args__ = (
+        db.Index('ix_sesiontecnicaparam_sesion', 'id_sesion'),
+    )
 
     id_param = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     id_sesion = db.Column(db.String(36), db.ForeignKey('sesion.id_sesion'), nullable=False)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from . import db
+
+# Modelo SistemaMeta: marcadores clave/valor del sistema (p. ej. versión del catálogo sembrado)
+class SistemaMeta(db.Model):
+    __tablename__ = 'sistema_meta'
+
+    clave = db.Column(db.String(100), primary_key=True)
+    valor = db.Column(db.String(255), nullable=False)
+    actualizado = db.Column(db.DateTime(6), default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'clave': self.clave,
+            'valor': self.valor,
+            'actualizado': self.actualizado.isoformat() if self.actualizado else None
+        }
@@ -7,6 +7,15 @@ from ..utils import generate_uuid
 # Modelo Tarea
 class Tarea(db.Model):
     __tablename__ = 'tarea'
+    __table_args__ = (
+        # Listados y estadísticas por usuario
+        db.Index('ix_tarea_usuario_estado', 'usuario_id', 'estado'),
+        db.Index('ix_tarea_usuario_fecha_creacion', 'usuario_id', 'fecha_creacion', 'id_tarea'),
+        # Tareas de una sala ordenadas por fecha
+        db.Index('ix_tarea_sala_fecha_creacion', 'sala_id', 'fecha_creacion'),
+        # Reconstrucción del rollup de progreso
+        db.Index('ix_tarea_fecha_completada', 'fecha_completada'),
+    )
 
     id_tarea = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     usuario_id = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario'), nullable=False)
@@ -17,6 +26,7 @@ class Tarea(db.Model):
     completada = db.Column(db.Boolean, default=False)
     estado = db.Column(db.String(20), nullable=False)
     fecha_vencimiento = db.Column(db.Date, nullable=True)
+    fecha_completada = db.Column(db.DateTime(6), nullable=True)
     prioridad = db.Column(db.String(20), default='baja', nullable=False)
     comentario = db.Column(db.Text, nullable=True)
 
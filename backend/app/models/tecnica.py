@@ -4,6 +4,10 @@ from ..utils import generate_uuid
 # Modelo Tecnica
 class Tecnica(db.Model):
     __tablename__ = 'tecnica'
+    __table_args__ = (
+        db.Index('ix_tecnica_nombre', 'nombre'),
+        db.Index('ix_tecnica_categoria', 'categoria'),
+    )
 
     id_tecnica = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     nombre = db.Column(db.String(100), nullable=False)
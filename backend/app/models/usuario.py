@@ -11,6 +11,10 @@ def generate_uuid():
 # Modelo Usuario
 class Usuario(db.Model):
     __tablename__ = 'usuario'
+    __table_args__ = (
+        # Listado paginado de usuarios (más recientes primero)
+        db.Index('ix_usuario_fecha_registro', 'fecha_registro', 'id_usuario'),
+    )
 
     id_usuario = db.Column(db.String(36), primary_key=True, default=generate_uuid)
     username = db.Column(db.String(100), unique=True, nullable=False)
@@ -31,14 +35,37 @@ class Usuario(db.Model):
     progreso = db.relationship('Progreso', backref='usuario_progreso', lazy=True)
 
 
-    def to_dict(self):
-            return {
+    def to_dict(self, vista='profile'):
+            """Serializa el usuario según la vista: summary, profile (por defecto) o full.
+
+            Nunca incluye las tareas; para embeberlas usar UsuarioService.serializar.
+            """
+            datos = {
                 'id_usuario': self.id_usuario,
                 'username': self.username,
+                'activo': self.activo
+            }
+            if vista == 'summary':
+                datos['avatar_url'] = self.avatar_url
+                return datos
+
+            datos.update({
                 'correo': self.correo,
                 'fecha_registro': self.fecha_registro.isoformat() if self.fecha_registro else None,
                 'ultimo_acceso': self.ultimo_acceso.isoformat() if self.ultimo_acceso else None,
-                'rol_id': self.rol_id,
-                'activo': self.activo,
-                'tareas': [tarea.to_dict() for tarea in self.tareas]
-            }
+                'rol_id': self.rol_id
+            })
+            if vista == 'full':
+                datos['celular'] = self.celular
+                datos['avatar_url'] = self.avatar_url
+            return datos
+
+
+def _sin_intercalacion_ci(ddl, target, bind, dialect=None, **kw):
+    return dialect.name not in ('mysql', 'mariadb')
+
+
+# Búsqueda por prefijo sin distinguir mayúsculas (services/busqueda_service.py). En MySQL/MariaDB
+# no hacen falta: la intercalación _ci ya compara así sobre los índices únicos.
+db.Index('ix_usuario_username_lower', db.func.lower(Usuario.username)).ddl_if(callable_=_sin_intercalacion_ci)
+db.Index('ix_usuario_correo_lower', db.func.lower(Usuario.correo)).ddl_if(callable_=_sin_intercalacion_ci)
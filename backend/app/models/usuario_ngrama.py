@@ -0,0 +1,12 @@
+from . import db
+
+# Modelo UsuarioNgrama: índice de trigramas para la búsqueda portable de usuarios
+class UsuarioNgrama(db.Model):
+    __tablename__ = 'usuario_ngrama'
+    __table_args__ = (
+        # Reindexar o borrar un usuario sin recorrer la tabla
+        db.Index('ix_usuario_ngrama_usuario', 'id_usuario'),
+    )
+
+    ngrama = db.Column(db.String(3), primary_key=True)
+    id_usuario = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario', ondelete='CASCADE'), primary_key=True)
@@ -6,6 +6,10 @@ from app.models.sala import Sala
 # Modelo UsuarioSala
 class UsuarioSala(db.Model):
     __tablename__ = 'usuariosala'
+    __table_args__ = (
+        # Participantes activos de una sala (la PK empieza por id_usuario)
+        db.Index('ix_usuariosala_sala_activo', 'id_sala', 'activo'),
+    )
 
     id_usuario = db.Column(db.String(36), db.ForeignKey('usuario.id_usuario'), primary_key=True)
     id_sala = db.Column(db.String(36), db.ForeignKey('sala.id_sala'), primary_key=True)
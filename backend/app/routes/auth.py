@@ -1,6 +1,5 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
 from ..models import db, Usuario, Rol
 from ..models.tarea import Tarea
 from ..models.sesion import Sesion
@@ -8,6 +7,10 @@ from ..models.usuario_sala import UsuarioSala
 from ..models.recompensa_usuario import RecompensaUsuario
 from ..models.progreso import Progreso
 from ..utils.validators import validate_email, validate_password
+from ..services.acceso_service import AccesoService
+from ..services.password_service import PasswordService, HashOcupadoError
+from ..services.usuario_service import UsuarioService
+from ..middlewere.auth_middleware import claims_principal, invalidar_principal, puede_ver_privado
 from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__)
@@ -78,7 +81,7 @@ def register():
         nuevo_usuario = Usuario(
             username=data['username'],
             correo=data['correo'],
-            password=generate_password_hash(data['password']),
+            password=PasswordService.generar(data['password']),
             rol_id=rol_usuario.id
         )
 
@@ -90,6 +93,9 @@ def register():
             'usuario': nuevo_usuario.to_dict()
         }), 201
 
+    except HashOcupadoError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '2'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -115,22 +121,33 @@ def login():
             return jsonify({'error': 'sta Cuenta no existe, registrate'}), 404
 
         # Verificamos la contraseña
-        if not check_password_hash(usuario.password, data['password']):
+        if not PasswordService.verificar(usuario.password, data['password']):
             return jsonify({'error': 'Credenciales inválidas'}), 401
         
-        # Actualizar último acceso
-        usuario.ultimo_acceso = datetime.utcnow()
-        db.session.commit()
+        # Regenerar el hash si cambió el algoritmo o el coste configurado
+        if PasswordService.necesita_rehash(usuario.password):
+            usuario.password = PasswordService.generar(data['password'])
+            db.session.commit()
+        
+        # El último acceso se vuelca en bloque periódicamente, no en cada login
+        ahora = datetime.utcnow()
+        AccesoService.registrar(usuario.id_usuario, ahora)
+        datos_usuario = usuario.to_dict()
+        datos_usuario['ultimo_acceso'] = ahora.isoformat()
         
         # Crear token JWT
-        access_token = create_access_token(identity=usuario.id_usuario)
+        access_token = create_access_token(identity=usuario.id_usuario, additional_claims=claims_principal(usuario))
         
         return jsonify({
             'access_token': access_token,
-            'usuario': usuario.to_dict()
+            'usuario': datos_usuario
         }), 200
         
+    except HashOcupadoError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '2'}
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/me', methods=['GET'])
@@ -143,8 +160,11 @@ def get_current_user():
         if not usuario:
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
-        return jsonify(usuario.to_dict()), 200
+        opciones = UsuarioService.opciones(request.args)
+        return jsonify(UsuarioService.serializar_uno(usuario, privado=puede_ver_privado, **opciones)), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -163,15 +183,19 @@ def change_password():
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
         # Verificar contraseña actual
-        if not check_password_hash(usuario.password, data['current_password']):
+        if not PasswordService.verificar(usuario.password, data['current_password']):
             return jsonify({'error': 'Contraseña actual incorrecta'}), 400
         
         # Actualizar contraseña
-        usuario.password = generate_password_hash(data['new_password'])
+        usuario.password = PasswordService.generar(data['new_password'])
         db.session.commit()
+        invalidar_principal(usuario_id)
         
         return jsonify({'message': 'Contraseña actualizada exitosamente'}), 200
         
+    except HashOcupadoError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '2'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,30 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.dashboard_service import DashboardService
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('', methods=['GET'])
+@jwt_required()
+def get_dashboard():
+    """Secciones de la página de Concentración en una sola respuesta.
+
+    ?secciones=estadisticas_sesiones,sesiones,semana,mes,tecnicas_populares,estadisticas_generales
+    (todas si se omite). año/mes aplican a la sección mes; sesiones_limit y cursor a sesiones.
+    """
+    try:
+        crudo = request.args.get('secciones')
+        secciones = [s.strip() for s in crudo.split(',') if s.strip()] if crudo else None
+        dashboard = DashboardService.construir(
+            get_jwt_identity(),
+            secciones,
+            año=request.args.get('año'),
+            mes=request.args.get('mes'),
+            sesiones_limite=request.args.get('sesiones_limit'),
+            cursor=request.args.get('cursor')
+        )
+        return jsonify(dashboard), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import db, Progreso, Sesion, Tarea
+from app.models import db, Progreso, Sesion, Tarea, Tecnica
+from app.services.progreso_service import ProgresoService
+from app.utils.pagination import (
+    PaginacionError, parametros_pagina, paginar, campos_solicitados, proyectar, serializar, respuesta_paginada
+)
+from app.utils.http_cache import condicional
 from datetime import datetime, date, timedelta
 from sqlalchemy import func
 
@@ -8,6 +13,7 @@ progreso_bp = Blueprint('progreso', __name__)
 
 @progreso_bp.route('', methods=['GET'])
 @jwt_required()
+@condicional('progreso')
 def get_progreso():
     try:
         usuario_id = get_jwt_identity()
@@ -32,10 +38,15 @@ def get_progreso():
             except ValueError:
                 return jsonify({'error': 'Formato de fecha_fin inválido (YYYY-MM-DD)'}), 400
         
-        progreso = query.order_by(Progreso.fecha.desc()).all()
+        limite, cursor = parametros_pagina()
+        campos = campos_solicitados(Progreso)
+        query = proyectar(query, Progreso, campos, requeridos=(Progreso.fecha, Progreso.id_progreso))
+        progreso, siguiente = paginar(query, Progreso.fecha, Progreso.id_progreso, limite, cursor)
         
-        return jsonify([p.to_dict() for p in progreso]), 200
+        return respuesta_paginada([serializar(p, campos) for p in progreso], siguiente, limite)
         
+    except PaginacionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -74,48 +85,25 @@ def actualizar_progreso():
         usuario_id = get_jwt_identity()
         hoy = date.today()
         
-        # Calcular estadísticas del día actual
-        minutos_estudio = db.session.query(
-            func.sum(Sesion.duracion_real)
-        ).filter(
-            Sesion.usuario_id == usuario_id,
-            func.date(Sesion.fecha_inicio) == hoy,  # Cambié 'inicio' por 'fecha_inicio'
-            Sesion.estado == 'Completado'
-        ).scalar() or 0
-        
-        tareas_completadas = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            func.date(Tarea.fecha_creacion) == hoy,
-            Tarea.estado == 'Completado'
-        ).count()
-        
-        sesiones_realizadas = Sesion.query.filter(
-            Sesion.usuario_id == usuario_id,
-            func.date(Sesion.fecha_inicio) == hoy,  # Cambié 'inicio' por 'fecha_inicio'
-            Sesion.estado == 'Completado'
-        ).count()
-        
-        # Buscar o crear registro de progreso
+        # El rollup se mantiene en cada escritura; aquí solo se repara el día
+        # actual recalculándolo en bloque desde Sesion y Tarea
+        ProgresoService.reconstruir(hoy, hoy, usuario_id=usuario_id)
+        db.session.commit()
+        
         progreso = Progreso.query.filter_by(
             usuario_id=usuario_id,
             fecha=hoy
         ).first()
-        
-        if progreso:
-            progreso.minutos_estudio = minutos_estudio
-            progreso.tareas_completadas = tareas_completadas
-            progreso.sesiones_realizadas = sesiones_realizadas
-        else:
+        if not progreso:
             progreso = Progreso(
                 usuario_id=usuario_id,
                 fecha=hoy,
-                minutos_estudio=minutos_estudio,
-                tareas_completadas=tareas_completadas,
-                sesiones_realizadas=sesiones_realizadas
+                minutos_estudio=0,
+                tareas_completadas=0,
+                sesiones_realizadas=0
             )
             db.session.add(progreso)
-        
-        db.session.commit()
+            db.session.commit()
         
         return jsonify({
             'message': 'Progreso actualizado exitosamente',
@@ -129,6 +117,7 @@ def actualizar_progreso():
 
 @progreso_bp.route('/semana', methods=['GET'])
 @jwt_required()
+@condicional('progreso')
 def get_progreso_semana():
     try:
         usuario_id = get_jwt_identity()
@@ -183,6 +172,7 @@ def get_progreso_semana():
 
 @progreso_bp.route('/mes', methods=['GET'])
 @jwt_required()
+@condicional('progreso')
 def get_progreso_mes():
     try:
         usuario_id = get_jwt_identity()
@@ -229,7 +219,7 @@ def get_progreso_mes():
                 'dias_activos': dias_activos,
                 'dias_en_mes': dias_en_mes,
                 'promedio_minutos_dia': round(promedio_minutos, 2),
-                'racha_dias': calcular_racha_dias(progreso_mes)
+                'racha_dias': ProgresoService.racha_maxima(progreso_mes)
             }
         }), 200
         
@@ -238,52 +228,44 @@ def get_progreso_mes():
 
 @progreso_bp.route('/estadisticas-generales', methods=['GET'])
 @jwt_required()
+@condicional('progreso', 'tareas', 'sesiones', 'tecnicas')
 def get_estadisticas_generales():
     try:
         usuario_id = get_jwt_identity()
         
-        # Estadísticas de todas las sesiones
-        total_sesiones = Sesion.query.filter_by(
-            usuario_id=usuario_id, 
-            estado='Completado'
-        ).count()
+        # Totales de sesiones y tareas completadas desde el rollup diario
+        totales = db.session.query(
+            func.coalesce(func.sum(Progreso.sesiones_realizadas), 0),
+            func.coalesce(func.sum(Progreso.minutos_estudio), 0),
+            func.coalesce(func.sum(Progreso.tareas_completadas), 0),
+            func.count(Progreso.id_progreso)
+        ).filter(Progreso.usuario_id == usuario_id).one()
+        total_sesiones, tiempo_total, tareas_completadas, total_dias = (int(v) for v in totales)
         
-        tiempo_total = db.session.query(
-            func.sum(Sesion.duracion_real)
-        ).filter_by(usuario_id=usuario_id, estado='Completado').scalar() or 0
-        
-        # Estadísticas de tareas
+        # Total de tareas creadas (no forma parte del rollup)
         total_tareas = Tarea.query.filter_by(usuario_id=usuario_id).count()
-        tareas_completadas = Tarea.query.filter_by(
-            usuario_id=usuario_id, 
-            estado='Completado'
-        ).count()
         
         # Racha actual de días estudiando
         progreso_reciente = Progreso.query.filter_by(
             usuario_id=usuario_id
         ).order_by(Progreso.fecha.desc()).limit(30).all()
         
-        racha_actual = calcular_racha_actual(progreso_reciente)
+        racha_actual = ProgresoService.racha_actual(progreso_reciente)
         
         # Día con más minutos de estudio
         mejor_dia = Progreso.query.filter_by(
             usuario_id=usuario_id
         ).order_by(Progreso.minutos_estudio.desc()).first()
         
-        # Técnica más utilizada
+        # Técnica más utilizada (nombre resuelto en la misma consulta)
         tecnica_favorita = db.session.query(
-            func.count(Sesion.id_sesion).label('total'),
-            Sesion.tecnica_id
-        ).filter_by(usuario_id=usuario_id).group_by(
-            Sesion.tecnica_id
-        ).order_by(db.desc('total')).first()
-        
-        tecnica_nombre = None
-        if tecnica_favorita:
-            from app.models import Tecnica
-            tecnica = Tecnica.query.get(tecnica_favorita.tecnica_id)
-            tecnica_nombre = tecnica.nombre if tecnica else None
+            Tecnica.nombre,
+            func.count(Sesion.id_sesion).label('total')
+        ).join(Sesion, Sesion.tecnica_id == Tecnica.id_tecnica).filter(
+            Sesion.usuario_id == usuario_id
+        ).group_by(Tecnica.id_tecnica, Tecnica.nombre).order_by(db.desc('total')).first()
+        
+        tecnica_nombre = tecnica_favorita.nombre if tecnica_favorita else None
         
         return jsonify({
             'sesiones': {
@@ -303,45 +285,8 @@ def get_estadisticas_generales():
                 'minutos': mejor_dia.minutos_estudio if mejor_dia else 0
             },
             'tecnica_favorita': tecnica_nombre,
-            'total_dias_registrados': Progreso.query.filter_by(usuario_id=usuario_id).count()
+            'total_dias_registrados': total_dias
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-
-def calcular_racha_dias(progreso_mes):
-    """Calcula la racha de días consecutivos con actividad"""
-    if not progreso_mes:
-        return 0
-    
-    racha_maxima = 0
-    racha_actual = 0
-    
-    for p in progreso_mes:
-        if p.minutos_estudio > 0 or p.sesiones_realizadas > 0:
-            racha_actual += 1
-            racha_maxima = max(racha_maxima, racha_actual)
-        else:
-            racha_actual = 0
-    
-    return racha_maxima
-
-def calcular_racha_actual(progreso_reciente):
-    """Calcula la racha actual de días consecutivos"""
-    if not progreso_reciente:
-        return 0
-    
-    # Ordenar por fecha descendente
-    progreso_ordenado = sorted(progreso_reciente, key=lambda x: x.fecha, reverse=True)
-    
-    racha = 0
-    fecha_esperada = date.today()
-    
-    for p in progreso_ordenado:
-        if p.fecha == fecha_esperada and (p.minutos_estudio > 0 or p.sesiones_realizadas > 0):
-            racha += 1
-            fecha_esperada = fecha_esperada - timedelta(days=1)
-        else:
-            break
-    
-    return racha
\ No newline at end of file
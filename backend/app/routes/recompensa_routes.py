@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, Recompensa, RecompensaUsuario, Usuario
+from app.services.recompensa_service import RecompensaService
+from app.utils.http_cache import condicional
 import json
 
 recompensa_bp = Blueprint('recompensa', __name__)
@@ -59,6 +61,7 @@ def create_recompensa():
         
         db.session.add(nueva_recompensa)
         db.session.commit()
+        RecompensaService.invalidar_reglas()
         
         return jsonify(nueva_recompensa.to_dict()), 201
         
@@ -94,6 +97,7 @@ def update_recompensa(recompensa_id):
                 return jsonify({'error': 'Requisitos debe ser un objeto JSON válido'}), 400
         
         db.session.commit()
+        RecompensaService.invalidar_reglas()
         
         return jsonify(recompensa.to_dict()), 200
         
@@ -112,6 +116,7 @@ def delete_recompensa(recompensa_id):
         
         db.session.delete(recompensa)
         db.session.commit()
+        RecompensaService.invalidar_reglas()
         
         return jsonify({'message': 'Recompensa eliminada exitosamente'}), 200
         
@@ -122,6 +127,7 @@ def delete_recompensa(recompensa_id):
 
 @recompensa_bp.route('/mis-recompensas', methods=['GET'])
 @jwt_required()
+@condicional('recompensas', 'catalogo_recompensas')
 def get_mis_recompensas():
     try:
         id_usuario = get_jwt_identity()
@@ -209,9 +215,9 @@ def get_recompensas_disponibles():
         dias_consecutivos = Progreso.query.filter_by(usuario_id=id_usuario).count()
         
         # Recompensas ya obtenidas
-        recompensas_obtenidas = db.session.query(RecompensaUsuario.id_recompensa).filter_by(
+        recompensas_obtenidas = db.select(RecompensaUsuario.id_recompensa).filter_by(
             id_usuario=id_usuario
-        ).subquery()
+        )
         
         # Recompensas disponibles (no obtenidas)
         recompensas_disponibles = Recompensa.query.filter(
@@ -279,7 +285,7 @@ def consumir_recompensa_patch(recompensa_id_usuario):
         id_usuario = get_jwt_identity()
         
         recompensa_usuario = RecompensaUsuario.query.filter_by(
-            id=recompensa_id_usuario,  # Usando el nombre correcto para el parámetro
+            id_recompensa=recompensa_id_usuario,  # La PK es (id_usuario, id_recompensa)
             id_usuario=id_usuario
         ).first()
         
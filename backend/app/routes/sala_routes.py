@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import db, Sala, UsuarioSala, Usuario
+from app.models import db, Sala, SalaSesion, Tarea, UsuarioSala, Usuario
+from app.utils.pagination import (
+    PaginacionError, parametros_pagina, paginar, campos_solicitados, proyectar, serializar, respuesta_paginada
+)
 import secrets
 import string
 
@@ -32,8 +35,15 @@ def get_salas():
 @jwt_required()
 def get_salas_publicas():
     try:
-        salas = Sala.query.filter_by(es_privada=False).all()
-        return jsonify([sala.to_dict() for sala in salas]), 200
+        limite, cursor = parametros_pagina()
+        campos = campos_solicitados(Sala)
+
+        query = proyectar(Sala.query.filter_by(es_privada=False), Sala, campos,
+                          requeridos=(Sala.fecha_creacion, Sala.id_sala))
+        salas, siguiente = paginar(query, Sala.fecha_creacion, Sala.id_sala, limite, cursor)
+        return respuesta_paginada([serializar(sala, campos) for sala in salas], siguiente, limite)
+    except PaginacionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -66,7 +76,7 @@ def get_sala(sala_id):
             UsuarioSala.activo == True
         ).all()
 
-        sala_dict['participantes'] = [p.to_dict() for p in participantes]
+        sala_dict['participantes'] = [p.to_dict('summary') for p in participantes]
         sala_dict['total_participantes'] = len(participantes)
 
         return jsonify(sala_dict), 200
@@ -176,8 +186,11 @@ def delete_sala(sala_id):
         if not sala:
             return jsonify({'error': 'Sala no encontrada'}), 404
 
-        # Desactivar todos los usuarios de la sala
-        UsuarioSala.query.filter_by(sala_id=sala_id).update({'activo': False})
+        # Las membresías y los vínculos con sesiones son parte de la PK: se borran en bloque.
+        # Las tareas de la sala se conservan como tareas personales.
+        UsuarioSala.query.filter_by(id_sala=sala_id).delete(synchronize_session=False)
+        SalaSesion.query.filter_by(id_sala=sala_id).delete(synchronize_session=False)
+        Tarea.query.filter_by(sala_id=sala_id).update({'sala_id': None}, synchronize_session=False)
         
         # Eliminar la sala
         db.session.delete(sala)
@@ -1,12 +1,22 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, Sesion, SalaSesion, SesionTecnicaParam, Tecnica, Sala, UsuarioSala
+from app.services.evento_service import EventoService
+from app.services.progreso_service import ProgresoService
+from app.services.parametro_service import ParametroService
+from app.services.tecnica_service import TecnicaService
+from app.utils.pagination import (
+    PaginacionError, parametros_pagina, paginar, campos_solicitados, proyectar, serializar, respuesta_paginada
+)
+from app.utils.http_cache import condicional
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timedelta
 
 sesion_bp = Blueprint('sesion', __name__)
 
 @sesion_bp.route('', methods=['GET'])
 @jwt_required()
+@condicional('sesiones', 'tecnicas')
 def get_sesiones():
     try:
         usuario_id = get_jwt_identity()
@@ -32,19 +42,29 @@ def get_sesiones():
         if fecha_inicio:
             try:
                 fecha_inicio_dt = datetime.strptime(fecha_inicio, '%Y-%m-%d')
-                query = query.filter(Sesion.inicio >= fecha_inicio_dt)
+                query = query.filter(Sesion.fecha_inicio >= fecha_inicio_dt)
             except ValueError:
                 return jsonify({'error': 'Formato de fecha_inicio inválido (YYYY-MM-DD)'}), 400
         
         if fecha_fin:
             try:
                 fecha_fin_dt = datetime.strptime(fecha_fin, '%Y-%m-%d') + timedelta(days=1)
-                query = query.filter(Sesion.inicio < fecha_fin_dt)
+                query = query.filter(Sesion.fecha_inicio < fecha_fin_dt)
             except ValueError:
                 return jsonify({'error': 'Formato de fecha_fin inválido (YYYY-MM-DD)'}), 400
         
-        # Ordenar por fecha de inicio (más recientes primero)
-        sesiones = query.order_by(Sesion.inicio.desc()).all()
+        limite, cursor = parametros_pagina()
+        campos = campos_solicitados(Sesion)
+        if campos:
+            # Proyección: solo las columnas pedidas, sin técnica ni parámetros
+            query = proyectar(query, Sesion, campos, requeridos=(Sesion.fecha_inicio, Sesion.id_sesion))
+            sesiones, siguiente = paginar(query, Sesion.fecha_inicio, Sesion.id_sesion, limite, cursor)
+            return respuesta_paginada([serializar(sesion, campos) for sesion in sesiones], siguiente, limite)
+
+        # Página por fecha de inicio (más recientes primero). La técnica viene en el
+        # mismo SELECT y los parámetros de todas las sesiones en una sola consulta extra.
+        query = ParametroService.con_parametros(query.options(joinedload(Sesion.tecnica_sesion)))
+        sesiones, siguiente = paginar(query, Sesion.fecha_inicio, Sesion.id_sesion, limite, cursor)
         
         # Incluir información adicional
         sesiones_completas = []
@@ -60,7 +80,9 @@ def get_sesiones():
             
             sesiones_completas.append(sesion_dict)
         
-        return jsonify(sesiones_completas), 200
+        return respuesta_paginada(sesiones_completas, siguiente, limite)
+    except PaginacionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -70,8 +92,12 @@ def get_sesion(sesion_id):
     try:
         usuario_id = get_jwt_identity()
         
-        # Buscar la sesión con el id proporcionado y el usuario autenticado
-        sesion = Sesion.query.filter_by(id_sesion=sesion_id, usuario_id=usuario_id).first()
+        # Buscar la sesión con el id proporcionado y el usuario autenticado; técnica y salas
+        # se cargan con la sesión en vez de una consulta por sala
+        sesion = Sesion.query.options(
+            joinedload(Sesion.tecnica_sesion),
+            selectinload(Sesion.salas_sesion).joinedload(SalaSesion.sala_sesion_rel)
+        ).filter_by(id_sesion=sesion_id, usuario_id=usuario_id).first()
         
         if not sesion:
             return jsonify({'error': 'Sesión no encontrada'}), 404
@@ -110,11 +136,11 @@ def create_sesion():
         print(f"Tecnica ID recibido: {data['tecnica_id']}")
         
         # Consultar la técnica en la base de datos
-        tecnica = Tecnica.query.filter_by(id_tecnica=data['tecnica_id']).first()
+        tecnica = TecnicaService.por_id(data['tecnica_id'])
         if not tecnica:
             return jsonify({'error': f'Técnica con id {data["tecnica_id"]} no encontrada'}), 404
         
-        print(f"Técnica encontrada: {tecnica.nombre}")
+        print(f"Técnica encontrada: {tecnica['nombre']}")
         
         # Parsear fechas
         inicio = datetime.utcnow()
@@ -186,14 +212,21 @@ def update_sesion(sesion_id):
     try:
         usuario_id = get_jwt_identity()
         
-        # Buscar la sesión con el id proporcionado y el usuario autenticado
-        sesion = Sesion.query.filter_by(id_sesion=sesion_id, usuario_id=usuario_id).first()
+        # Buscar la sesión con el id proporcionado y el usuario autenticado; técnica y salas
+        # se cargan con la sesión en vez de una consulta por sala
+        sesion = Sesion.query.options(
+            joinedload(Sesion.tecnica_sesion),
+            selectinload(Sesion.salas_sesion).joinedload(SalaSesion.sala_sesion_rel)
+        ).filter_by(id_sesion=sesion_id, usuario_id=usuario_id).first()
         if not sesion:
             return jsonify({'error': 'Sesión no encontrada'}), 404
         
         # Obtener los datos de la solicitud
         data = request.get_json()
 
+        # Retirar la sesión del rollup; se vuelve a sumar con los valores nuevos
+        ProgresoService.registrar_sesion(sesion, -1)
+
         # Actualizar campos permitidos
         if 'estado' in data and data['estado'] in ['EnEjecucion', 'Completado', 'Cancelado', 'EnPausa']:
             sesion.estado = data['estado']
@@ -228,6 +261,8 @@ def update_sesion(sesion_id):
                     )
                     db.session.add(sesion_param)
         
+        ProgresoService.registrar_sesion(sesion)
+
         # Confirmar cambios en la base de datos
         db.session.commit()
 
@@ -254,6 +289,9 @@ def delete_sesion(id_sesion):
         # Eliminar asociaciones con salas
         SalaSesion.query.filter_by(id_sesion=id_sesion).delete()
 
+        # Retirar la sesión del rollup de progreso
+        ProgresoService.registrar_sesion(sesion, -1)
+
         # Eliminar la sesión
         db.session.delete(sesion)
         db.session.commit()
@@ -288,9 +326,10 @@ def iniciar_sesion():
         nueva_sesion = Sesion(
             usuario_id=usuario_id,
             tecnica_id=data['tecnica_id'],
-            inicio=datetime.utcnow(),
+            fecha_inicio=datetime.utcnow(),
             es_grupal=data.get('es_grupal', False),
-            estado='EnEjecucion'
+            estado='EnEjecucion',
+            duracion_real=0
         )
         
         db.session.add(nueva_sesion)
@@ -301,9 +340,9 @@ def iniciar_sesion():
         for param in parametros:
             if param.get('codigo') and param.get('cantidad'):
                 sesion_param = SesionTecnicaParam(
-                    sesion_id=nueva_sesion.sesion_id,
-                    codigo=param['codigo'],
-                    cantidad=str(param['cantidad'])
+                    id_sesion=nueva_sesion.id_sesion,
+                    parametro=param['codigo'],
+                    valor=str(param['cantidad'])
                 )
                 db.session.add(sesion_param)
         
@@ -341,13 +380,20 @@ def finalizar_sesion(id_sesion):
         sesion.duracion_real = int((ahora - sesion.fecha_inicio).total_seconds() / 60)  # Duración en minutos
         sesion.estado = 'Completado'  # Actualizar el estado de la sesión
         
+        # Sumar la sesión al rollup diario en la misma transacción
+        ProgresoService.registrar_sesion(sesion)
+        
+        # Las recompensas se evalúan fuera de la petición; el cliente consulta el evento
+        evento_id = EventoService.emitir(usuario_id, 'sesion_finalizada', sesion.id_sesion)
+        
         # Guardar los cambios en la base de datos
         db.session.commit()
         
         # Respuesta de éxito con los datos de la sesión
         return jsonify({
             'message': 'Sesión finalizada exitosamente',
-            'sesion': sesion.to_dict()
+            'sesion': sesion.to_dict(),
+            'evento_id': evento_id
         }), 200
         
     except Exception as e:
@@ -357,6 +403,7 @@ def finalizar_sesion(id_sesion):
 
 @sesion_bp.route('/estadisticas', methods=['GET'])
 @jwt_required()
+@condicional('sesiones', 'tecnicas')
 def get_estadisticas_sesiones():
     try:
         usuario_id = get_jwt_identity()
@@ -0,0 +1,37 @@
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+
+from app.models import db
+from app.utils.database import estadisticas_pool
+
+sistema_bp = Blueprint('sistema', __name__)
+
+@sistema_bp.route('/', methods=['GET'])
+def index():
+    return jsonify({
+        'message': 'Synapse API está funcionando correctamente',
+        'version': '1.0.0',
+        'endpoints': {
+            'auth': '/api/auth',
+            'usuarios': '/api/usuarios',
+            'salas': '/api/salas',
+            'tareas': '/api/tareas',
+            'sesiones': '/api/sesiones',
+            'tecnicas': '/api/tecnicas',
+            'recompensas': '/api/recompensas',
+            'progreso': '/api/progreso'
+        }
+    })
+
+@sistema_bp.route('/health', methods=['GET'])
+def health_check():
+    try:
+        # Verificar conexión a la base de datos. Use text() to satisfy SQLAlchemy 1.4+.
+        db.session.execute(text('SELECT 1'))
+        estado = {'status': 'healthy', 'database': 'connected'}
+        # Ruta pública: el estado del pool solo con HEALTH_POOL (apagado en producción)
+        if current_app.config.get('HEALTH_POOL', False):
+            estado['pool'] = estadisticas_pool(db.engine)
+        return jsonify(estado), 200
+    except Exception as e:
+        return jsonify({'status': 'unhealthy', 'database': 'disconnected', 'error': str(e)}), 500
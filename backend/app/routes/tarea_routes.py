@@ -1,13 +1,21 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import db, Tarea, Usuario, Sala, UsuarioSala
-from datetime import date, datetime, timedelta
-from calendar import monthrange
+from app.models import db, Tarea, UsuarioSala
+from app.services.estadisticas_service import EstadisticasTareasService
+from app.services.evento_service import EventoService
+from app.services.progreso_service import ProgresoService
+from app.utils.pagination import (
+    PaginacionError, parametros_pagina, paginar, campos_solicitados, proyectar, serializar, respuesta_paginada
+)
+from app.utils.http_cache import condicional
+from sqlalchemy.orm import joinedload
+from datetime import datetime
 
 tarea_bp = Blueprint('tarea', __name__)
 
 @tarea_bp.route('', methods=['GET'])
 @jwt_required()
+@condicional('tareas')
 def get_tareas():
     try:
         usuario_id = get_jwt_identity()
@@ -28,15 +36,21 @@ def get_tareas():
         if prioridad:
             query = query.filter_by(prioridad=prioridad)
         
-        # Ordenar por fecha de creación (más recientes primero)
-        tareas = query.order_by(Tarea.fecha_creacion.desc()).all()
+        # Página por fecha de creación (más recientes primero)
+        limite, cursor = parametros_pagina()
+        campos = campos_solicitados(Tarea)
+        query = proyectar(query, Tarea, campos, requeridos=(Tarea.fecha_creacion, Tarea.id_tarea))
+        tareas, siguiente = paginar(query, Tarea.fecha_creacion, Tarea.id_tarea, limite, cursor)
         
-        return jsonify([tarea.to_dict() for tarea in tareas]), 200
+        return respuesta_paginada([serializar(tarea, campos) for tarea in tareas], siguiente, limite)
+    except PaginacionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @tarea_bp.route('/<string:id_tarea>', methods=['GET'])
 @jwt_required()
+@condicional('tareas')
 def get_tarea(id_tarea):
     try:
         usuario_id = get_jwt_identity()
@@ -135,7 +149,14 @@ def update_tarea(id_tarea):
         if 'prioridad' in data and data['prioridad'] in ['baja', 'media', 'alta']:
             tarea.prioridad = data['prioridad']
         if 'estado' in data and data['estado'] in ['Pendiente', 'EnProgreso', 'EnEspera', 'Completado']:
-            tarea.estado = data['estado']
+            if data['estado'] != tarea.estado:
+                # Mantener el rollup de progreso en la misma transacción
+                ProgresoService.registrar_tarea(tarea, -1)
+                tarea.estado = data['estado']
+                tarea.fecha_completada = datetime.utcnow() if tarea.estado == 'Completado' else None
+                ProgresoService.registrar_tarea(tarea, 1)
+                if tarea.estado == 'Completado':
+                    EventoService.emitir(usuario_id, 'tarea_completada', tarea.id_tarea)
         if 'comentario' in data:
             tarea.comentario = data['comentario']
 
@@ -181,6 +202,7 @@ def delete_tarea(id_tarea):
         if not tarea:
             return jsonify({'error': 'Tarea no encontrada'}), 404
 
+        ProgresoService.registrar_tarea(tarea, -1)
         db.session.delete(tarea)
         db.session.commit()
 
@@ -194,145 +216,15 @@ def delete_tarea(id_tarea):
 
 @tarea_bp.route('/estadisticas', methods=['GET'])
 @jwt_required()
+@condicional('tareas')
 def get_estadisticas_tareas():
     try:
         usuario_id = get_jwt_identity()
 
+        # Todos los contadores salen de una sola consulta agregada
+        estadisticas = EstadisticasTareasService.obtener_estadisticas(usuario_id)
 
-        
-        # Contar tareas por estado
-        stats = {
-            'total': Tarea.query.filter_by(usuario_id=usuario_id).count(),
-            'pendientes': Tarea.query.filter_by(usuario_id=usuario_id, estado='Pendiente').count(),
-            'en_progreso': Tarea.query.filter_by(usuario_id=usuario_id, estado='EnProgreso').count(),
-            'en_espera': Tarea.query.filter_by(usuario_id=usuario_id, estado='EnEspera').count(),
-            'completadas': Tarea.query.filter_by(usuario_id=usuario_id, estado='Completado').count()
-        }
-        
-        # Tareas por prioridad
-        stats['por_prioridad'] = {
-
-        print(f"[GET ESTAD TAREAS] llamada para usuario={usuario_id}")
-
-        main
-        hoy = date.today()
-        primer_dia_mes = hoy.replace(day=1)
-        if hoy.month == 12:
-            ultimo_dia_mes = hoy.replace(year=hoy.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            ultimo_dia_mes = hoy.replace(month=hoy.month + 1, day=1) - timedelta(days=1)
-
-        # Conteo básico por estado
-        total = Tarea.query.filter_by(usuario_id=usuario_id).count()
-        pendientes = Tarea.query.filter_by(usuario_id=usuario_id, estado='Pendiente').count()
-        en_progreso = Tarea.query.filter_by(usuario_id=usuario_id, estado='EnProgreso').count()
-        en_espera = Tarea.query.filter_by(usuario_id=usuario_id, estado='EnEspera').count()
-        completadas = Tarea.query.filter_by(usuario_id=usuario_id, estado='Completado').count()
-
-        # Por prioridad
-        por_prioridad = {
-
-
-
-
-            'alta': Tarea.query.filter_by(usuario_id=usuario_id, prioridad='alta').count(),
-            'media': Tarea.query.filter_by(usuario_id=usuario_id, prioridad='media').count(),
-            'baja': Tarea.query.filter_by(usuario_id=usuario_id, prioridad='baja').count()
-        }
-
-        # Tareas vencidas (no completadas y fecha_vencimiento < hoy)
-        vencidas = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.estado != 'Completado',
-            Tarea.fecha_vencimiento < hoy
-        ).count()
-
-        # Tareas con vencimiento hoy
-        hoy_count = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.fecha_vencimiento == hoy
-        ).count()
-
-
-        
-        return jsonify(stats), 200
-        
-
-
-
-
-        # Tareas recientes (últimos 5 días, ordenadas por fecha_creacion DESC)
-        hace_5_dias = hoy - timedelta(days=5)
-        recientes = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.fecha_creacion >= datetime.combine(hace_5_dias, datetime.min.time())
-        ).order_by(Tarea.fecha_creacion.desc()).limit(5).all()
-
-        # Actividad mensual (últimos 3 meses)
-        monthly = []
-        for i in range(3):
-            # Mes a analizar
-            if hoy.month - i <= 0:
-                mes = 12 + (hoy.month - i)
-                año = hoy.year - 1
-            else:
-                mes = hoy.month - i
-                año = hoy.year
-
-            # Primer y último día del mes
-            primer_dia = date(año, mes, 1)
-            if mes == 12:
-                ultimo_dia = date(año + 1, 1, 1) - timedelta(days=1)
-            else:
-                ultimo_dia = date(año, mes + 1, 1) - timedelta(days=1)
-
-            # Contar tareas creadas en ese mes
-            creadas = Tarea.query.filter(
-                Tarea.usuario_id == usuario_id,
-                Tarea.fecha_creacion >= datetime.combine(primer_dia, datetime.min.time()),
-                Tarea.fecha_creacion <= datetime.combine(ultimo_dia, datetime.max.time())
-            ).count()
-
-            # Contar tareas completadas en ese mes
-            completadas_mes = Tarea.query.filter(
-                Tarea.usuario_id == usuario_id,
-                Tarea.estado == 'Completado',
-                Tarea.fecha_creacion >= datetime.combine(primer_dia, datetime.min.time()),
-                Tarea.fecha_creacion <= datetime.combine(ultimo_dia, datetime.max.time())
-            ).count()
-
-            monthly.append({
-                'year': año,
-                'month': mes,
-                'creadas': creadas,
-                'completadas': completadas_mes
-            })
-
-        # Serializar recientes
-        recientes_data = [t.to_dict() for t in recientes]
-
-
-        # Debug log: mostrar conteos
-        try:
-            print(f"[ESTADISTICAS VALORES] total={total} pendientes={pendientes} en_progreso={en_progreso} en_espera={en_espera} completadas={completadas}")
-        except Exception:
-            pass
-
-
-        return jsonify({
-            'total': total,
-            'pendientes': pendientes,
-            'en_progreso': en_progreso,
-            'en_espera': en_espera,
-            'completadas': completadas,
-            'por_prioridad': por_prioridad,
-            'vencidas': vencidas,
-            'hoy': hoy_count,
-            'recientes': recientes_data,
-            'monthly': monthly
-        }), 200
-
-
+        return jsonify(estadisticas), 200
 
     except Exception as e:
         print(f"[ERROR ESTADISTICAS TAREAS] {str(e)}")
@@ -355,16 +247,19 @@ def get_tareas_sala(sala_id):
             return jsonify({'error': 'No tienes acceso a esta sala'}), 403
 
         # Obtener tareas de la sala (de todos los usuarios)
-        tareas = Tarea.query.filter_by(sala_id=sala_id).order_by(Tarea.fecha_creacion.desc()).all()
+        # El autor de cada tarea viene en el mismo SELECT
+        tareas = Tarea.query.options(joinedload(Tarea.usuario_tarea)).filter_by(
+            sala_id=sala_id
+        ).order_by(Tarea.fecha_creacion.desc()).all()
 
         # Incluir información del usuario para cada tarea
         tareas_con_usuario = []
         for tarea in tareas:
             tarea_dict = tarea.to_dict()
-            usuario = Usuario.query.get(tarea.usuario_id)
+            usuario = tarea.usuario_tarea
             tarea_dict['usuario'] = {
                 'id_usuario': usuario.id_usuario,
-                'Username': usuario.Username,
+                'Username': usuario.username,
                 'correo': usuario.correo
             } if usuario else None
             tareas_con_usuario.append(tarea_dict)
@@ -388,29 +283,18 @@ def debug_tareas():
         ultimas = Tarea.query.filter_by(usuario_id=usuario_id).order_by(Tarea.fecha_creacion.desc()).limit(10).all()
         ultimas_data = [t.to_dict() for t in ultimas]
 
-        # Reusar la lógica de estadísticas existente (llamando internamente)
-        # Conteo básico por estado
-        total = Tarea.query.filter_by(usuario_id=usuario_id).count()
-        pendientes = Tarea.query.filter_by(usuario_id=usuario_id, estado='Pendiente').count()
-        en_progreso = Tarea.query.filter_by(usuario_id=usuario_id, estado='EnProgreso').count()
-        en_espera = Tarea.query.filter_by(usuario_id=usuario_id, estado='EnEspera').count()
-        completadas = Tarea.query.filter_by(usuario_id=usuario_id, estado='Completado').count()
-
-        por_prioridad = {
-            'alta': Tarea.query.filter_by(usuario_id=usuario_id, prioridad='alta').count(),
-            'media': Tarea.query.filter_by(usuario_id=usuario_id, prioridad='media').count(),
-            'baja': Tarea.query.filter_by(usuario_id=usuario_id, prioridad='baja').count()
-        }
+        # Reusar la lógica de estadísticas existente
+        contadores = EstadisticasTareasService.contadores(usuario_id)
 
         return jsonify({
             'ultimas': ultimas_data,
             'estadisticas': {
-                'total': total,
-                'pendientes': pendientes,
-                'en_progreso': en_progreso,
-                'en_espera': en_espera,
-                'completadas': completadas,
-                'por_prioridad': por_prioridad
+                'total': contadores['total'],
+                'pendientes': contadores['pendientes'],
+                'en_progreso': contadores['en_progreso'],
+                'en_espera': contadores['en_espera'],
+                'completadas': contadores['completadas'],
+                'por_prioridad': contadores['por_prioridad']
             }
         }), 200
     except Exception as e:
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.models import db, Tecnica
+from app.services.tecnica_service import TecnicaService
 
 tecnica_bp = Blueprint('tecnica', __name__)
 
@@ -10,12 +11,7 @@ def get_tecnicas():
     try:
         categoria = request.args.get('categoria')
         
-        if categoria:
-            tecnicas = Tecnica.query.filter_by(categoria=categoria).all()
-        else:
-            tecnicas = Tecnica.query.all()
-        
-        return jsonify([tecnica.to_dict() for tecnica in tecnicas]), 200
+        return jsonify(TecnicaService.listar(categoria)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 @tecnica_bp.route('/populares', methods=['GET'])
@@ -51,11 +47,11 @@ def get_tecnicas_populares():
 @jwt_required()
 def get_tecnica(tecnica_id):
     try:
-        tecnica = Tecnica.query.get(tecnica_id)
+        tecnica = TecnicaService.por_id(tecnica_id)
         if not tecnica:
             return jsonify({'error': 'Técnica no encontrada'}), 404
         
-        return jsonify(tecnica.to_dict()), 200
+        return jsonify(tecnica), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -81,6 +77,7 @@ def create_tecnica():
         
         db.session.add(nueva_tecnica)
         db.session.commit()
+        TecnicaService.invalidar()
         
         return jsonify(nueva_tecnica.to_dict()), 201
         
@@ -108,6 +105,7 @@ def update_tecnica(tecnica_id):
             tecnica.categoria = data['categoria']
         
         db.session.commit()
+        TecnicaService.invalidar()
         
         return jsonify(tecnica.to_dict()), 200
         
@@ -129,6 +127,7 @@ def delete_tecnica(tecnica_id):
         
         db.session.delete(tecnica)
         db.session.commit()
+        TecnicaService.invalidar()
         
         return jsonify({'message': 'Técnica eliminada exitosamente'}), 200
         
@@ -140,14 +139,7 @@ def delete_tecnica(tecnica_id):
 @jwt_required()
 def get_categorias():
     try:
-        # Obtener todas las categorías únicas
-        categorias = db.session.query(Tecnica.categoria).distinct().filter(
-            Tecnica.categoria.isnot(None)
-        ).all()
-        
-        # Convertir a lista simple
-        categorias_list = [cat[0] for cat in categorias if cat[0]]
-        
-        return jsonify(categorias_list), 200
+        # Categorías únicas del catálogo en caché
+        return jsonify(TecnicaService.categorias()), 200
     except Exception as e:
-        return jsonify({'error': str(e)}),
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
\ No newline at end of file
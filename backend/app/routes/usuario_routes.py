@@ -1,7 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import db, Usuario, Rol
-from werkzeug.security import generate_password_hash
+from app.models import db, Usuario, Rol, Tarea
+from app.middlewere.auth_middleware import invalidar_principal, puede_ver_privado
+from app.services.busqueda_service import BusquedaUsuariosService
+from app.services.password_service import PasswordService
+from app.services.usuario_service import UsuarioService
+from app.utils.pagination import (
+    PaginacionError, parametros_pagina, paginar, campos_solicitados, proyectar, serializar, respuesta_paginada
+)
 
 usuario_bp = Blueprint('usuario', __name__)
 
@@ -9,8 +15,20 @@ usuario_bp = Blueprint('usuario', __name__)
 @jwt_required()
 def get_usuarios():
     try:
-        usuarios = Usuario.query.all()
-        return jsonify([usuario.to_dict() for usuario in usuarios]), 200
+        limite, cursor = parametros_pagina()
+        campos = campos_solicitados(Usuario, excluidos=('password',))
+        opciones = UsuarioService.opciones(request.args)
+
+        query = proyectar(Usuario.query, Usuario, campos, requeridos=(Usuario.fecha_registro, Usuario.id_usuario))
+        usuarios, siguiente = paginar(query, Usuario.fecha_registro, Usuario.id_usuario, limite, cursor)
+
+        if campos:
+            items = [serializar(usuario, campos) for usuario in usuarios]
+        else:
+            items = UsuarioService.serializar(usuarios, privado=puede_ver_privado, **opciones)
+        return respuesta_paginada(items, siguiente, limite)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -18,11 +36,35 @@ def get_usuarios():
 @jwt_required()
 def get_usuario(usuario_id):
     try:
+        opciones = UsuarioService.opciones(request.args)
+        if opciones['vista'] == 'full' and not puede_ver_privado(usuario_id):
+            return jsonify({'error': 'La vista full solo está disponible para el propio usuario'}), 403
         usuario = Usuario.query.get(usuario_id)
         if not usuario:
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
-        return jsonify(usuario.to_dict()), 200
+        return jsonify(UsuarioService.serializar_uno(usuario, privado=puede_ver_privado, **opciones)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@usuario_bp.route('/<string:usuario_id>/tareas', methods=['GET'])
+@jwt_required()
+def get_tareas_usuario(usuario_id):
+    """Continúa el listado embebido con include=tareas (usar tareas_siguiente_cursor)"""
+    try:
+        if not puede_ver_privado(usuario_id):
+            return jsonify({'error': 'Solo puedes ver tus propias tareas'}), 403
+        if not Usuario.query.get(usuario_id):
+            return jsonify({'error': 'Usuario no encontrado'}), 404
+
+        limite, cursor = parametros_pagina()
+        query = Tarea.query.filter_by(usuario_id=usuario_id)
+        tareas, siguiente = paginar(query, Tarea.fecha_creacion, Tarea.id_tarea, limite, cursor)
+        return respuesta_paginada([tarea.to_dict() for tarea in tareas], siguiente, limite)
+    except PaginacionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -33,8 +75,8 @@ def create_usuario():
         data = request.get_json()
         
         # Validar datos requeridos
-        if not data.get('correo') or not data.get('password'):
-            return jsonify({'error': 'Email y contraseña son requeridos'}), 400
+        if not data.get('username') or not data.get('correo') or not data.get('password'):
+            return jsonify({'error': 'Username, email y contraseña son requeridos'}), 400
         
         # Verificar si el usuario ya existe
         if Usuario.query.filter_by(correo=data['correo']).first():
@@ -47,9 +89,9 @@ def create_usuario():
         
         # Crear nuevo usuario
         nuevo_usuario = Usuario(
-            Username=data.get('Username'),
+            username=data['username'],
             correo=data['correo'],
-            password=generate_password_hash(data['password']),
+            password=PasswordService.generar(data['password']),
             rol_id=rol_id,
             activo=data.get('activo', True)
         )
@@ -93,9 +135,10 @@ def update_usuario(usuario_id):
             usuario.activo = data['activo']
         
         if 'password' in data and data['password']:
-            usuario.password = generate_password_hash(data['password'])
+            usuario.password = PasswordService.generar(data['password'])
         
         db.session.commit()
+        invalidar_principal(usuario_id)
         
         return jsonify(usuario.to_dict()), 200
         
@@ -114,6 +157,7 @@ def delete_usuario(usuario_id):
         # Desactivar en lugar de eliminar (soft delete)
         usuario.activo = False
         db.session.commit()
+        invalidar_principal(usuario_id)
         
         return jsonify({'message': 'Usuario desactivado exitosamente'}), 200
         
@@ -128,15 +172,20 @@ def search_usuarios():
         query = request.args.get('q', '').strip()
         if not query:
             return jsonify([]), 200
+        # Vista summary por defecto: la búsqueda alimenta autocompletados
+        opciones = UsuarioService.opciones(request.args, vista='summary')
+        try:
+            limite = int(request.args.get('limit', 0)) or None
+        except ValueError:
+            raise ValueError('limit debe ser un número entero')
+        
+        usuarios = BusquedaUsuariosService.buscar(
+            query, limite, resumen=opciones['vista'] == 'summary' and not opciones['incluir_tareas']
+        )
         
-        usuarios = Usuario.query.filter(
-            db.or_(
-                Usuario.username.like(f'%{query}%'),
-                Usuario.correo.like(f'%{query}%')
-            )
-        ).all()
-        
-        return jsonify([usuario.to_dict() for usuario in usuarios]), 200
+        return jsonify(UsuarioService.serializar(usuarios, privado=puede_ver_privado, **opciones)), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""Arranque en frío: cuánto tarda un intérprete nuevo en tener lista la app y qué lo domina.
+
+Cada objetivo se ejecuta en un proceso nuevo con python -X importtime, --repeticiones veces
+(más una previa sin medir que deja compilado el bytecode); se informa la mediana del tiempo
+de pared, arranque del intérprete incluido.
+
+Objetivos:
+  modelos        import app.models                       (lo que paga cualquier script)
+  app_modelos    create_models_app('testing')            (scripts y CLI)
+  app_auth       create_app('testing'), SYNAPSE_BLUEPRINTS=auth
+  app_completa   create_app('testing')                   (workers de la API)
+
+Con --comparar-con REF mide además los mismos objetivos sobre el árbol de ese commit
+(git archive), p. ej. el anterior a un cambio; los que no existen allí salen como n/d.
+--detalle OBJETIVO lista las importaciones directas más caras de ese objetivo.
+
+Uso:
+    python -m app.scripts.bench_arranque
+    python -m app.scripts.bench_arranque --comparar-con HEAD~1
+    python -m app.scripts.bench_arranque --detalle app_completa --top 15
+"""
+import sys
+import os
+import argparse
+import shutil
+import statistics
+import subprocess
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# nombre -> (código, variables de entorno)
+OBJETIVOS = {
+    'modelos': ('import app.models', {}),
+    'app_modelos': ("from app import create_models_app; create_models_app('testing')", {}),
+    'app_auth': ("from app import create_app; create_app('testing')", {'SYNAPSE_BLUEPRINTS': 'auth'}),
+    'app_completa': ("from app import create_app; create_app('testing')", {}),
+}
+
+
+def ejecutar(directorio, codigo, variables):
+    """Ejecuta el objetivo en un intérprete nuevo; devuelve (ms, salida de -X importtime) o None"""
+    entorno = {k: v for k, v in os.environ.items() if k not in ('FLASK_RUN_FROM_CLI', 'SYNAPSE_BLUEPRINTS')}
+    entorno.update(variables, PYTHONPATH=directorio)
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=directorio, env=entorno,
+                             capture_output=True, text=True)
+    ms = (time.perf_counter() - inicio) * 1000
+    if proceso.returncode != 0:
+        return None
+    return ms, proceso.stderr
+
+
+def medir(directorio, repeticiones):
+    resultados = {}
+    for nombre, (codigo, variables) in OBJETIVOS.items():
+        if ejecutar(directorio, codigo, variables) is None:
+            resultados[nombre] = None
+            continue
+        tiempos, salida = [], ''
+        for _ in range(repeticiones):
+            ms, salida = ejecutar(directorio, codigo, variables)
+            tiempos.append(ms)
+        resultados[nombre] = (statistics.median(tiempos), salida)
+    return resultados
+
+
+def importaciones_directas(salida, top):
+    """Módulos importados por el programa o por el paquete app (dos primeros niveles) por
+    tiempo acumulado, en ms"""
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        profundidad = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+        if profundidad <= 1:
+            filas.append((int(acumulado) / 1000, profundidad, nombre.strip()))
+    return sorted(filas, reverse=True)[:top]
+
+
+def exportar(ref):
+    """Árbol de backend/ en ref, en un directorio temporal; devuelve (temporal, backend)"""
+    temporal = tempfile.mkdtemp(prefix='synapse-arranque-')
+    raiz = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=BACKEND, capture_output=True,
+                          text=True, check=True).stdout.strip()
+    prefijo = os.path.relpath(BACKEND, raiz)
+    archivo = os.path.join(temporal, 'arbol.tar')
+    subprocess.run(['git', 'archive', '-o', archivo, ref, prefijo], cwd=raiz, check=True)
+    with tarfile.open(archivo) as tar:
+        tar.extractall(temporal, filter='data')
+    return temporal, os.path.join(temporal, prefijo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de arranque en frío de la app y los scripts')
+    parser.add_argument('--repeticiones', type=int, default=7)
+    parser.add_argument('--comparar-con', metavar='REF', help='commit con el que comparar (p. ej. HEAD~1)')
+    parser.add_argument('--detalle', choices=OBJETIVOS, help='listar las importaciones más caras de un objetivo')
+    parser.add_argument('--top', type=int, default=12)
+    args = parser.parse_args()
+
+    actual = medir(BACKEND, args.repeticiones)
+    anterior, temporal = None, None
+    if args.comparar_con:
+        temporal, arbol = exportar(args.comparar_con)
+        try:
+            anterior = medir(arbol, args.repeticiones)
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+    formato = lambda r: f'{r[0]:>10.0f}' if r else f"{'n/d':>10}"
+    print(f'\nMediana de {args.repeticiones} arranques en frío (ms, intérprete incluido):')
+    if anterior is None:
+        print(f"  {'objetivo':<16}{'ms':>10}")
+        for nombre, resultado in actual.items():
+            print(f'  {nombre:<16}{formato(resultado)}')
+    else:
+        print(f"  {'objetivo':<16}{args.comparar_con:>10}{'actual':>10}{'cambio':>9}")
+        for nombre, resultado in actual.items():
+            antes = anterior[nombre]
+            cambio = f'{(resultado[0] / antes[0] - 1) * 100:>+8.0f}%' if antes and resultado else f"{'':>9}"
+            print(f'  {nombre:<16}{formato(antes)}{formato(resultado)}{cambio}')
+
+    if args.detalle:
+        resultado = actual[args.detalle]
+        if resultado is None:
+            raise SystemExit(f'✗ {args.detalle} no se pudo ejecutar')
+        print(f'\nImportaciones más caras de {args.detalle} (ms acumulados):')
+        for ms, profundidad, nombre in importaciones_directas(resultado[1], args.top):
+            print(f"  {ms:>8.1f}  {'  ' * profundidad}{nombre}")
+
+
+if __name__ == '__main__':
+    main()
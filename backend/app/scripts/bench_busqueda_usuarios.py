@@ -0,0 +1,118 @@
+"""Benchmark de /api/usuarios/search: latencia por backend con muchos usuarios.
+
+Crea una base SQLite aparte con --usuarios usuarios sintéticos (semilla fija), construye
+FTS5 y la tabla de trigramas y compara contra el LIKE '%q%' anterior.
+
+Uso:
+    python -m app.scripts.bench_busqueda_usuarios
+    python -m app.scripts.bench_busqueda_usuarios --usuarios 100000 --repeticiones 50
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+NOMBRES = ['ana', 'luis', 'maria', 'jose', 'carla', 'diego', 'sofia', 'mateo', 'valentina', 'juan',
+           'camila', 'pedro', 'lucia', 'andres', 'paula', 'jorge', 'daniela', 'felipe', 'laura', 'tomas']
+APELLIDOS = ['garcia', 'rodriguez', 'lopez', 'martinez', 'gonzalez', 'perez', 'sanchez', 'ramirez',
+             'torres', 'flores', 'rivera', 'gomez', 'diaz', 'vargas', 'castro', 'romero', 'herrera']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'synapse.edu', 'outlook.com']
+TERMINOS = ['an', 'mar', 'garc', 'valentina', 'zzq', 'tomas.herrera', 'lopez42']
+
+
+def poblar(db, total, lote=5000):
+    from app.models import Rol, Usuario
+    from sqlalchemy import insert
+
+    azar = random.Random(42)
+    rol = Rol(nombre='usuario')
+    db.session.add(rol)
+    db.session.commit()
+
+    tabla = Usuario.__table__
+    filas = []
+    for i in range(total):
+        base = f'{azar.choice(NOMBRES)}.{azar.choice(APELLIDOS)}{i}'
+        filas.append({
+            'id_usuario': f'{i:08d}-bench', 'username': base, 'correo': f'{base}@{azar.choice(DOMINIOS)}',
+            'password': 'x', 'rol_id': rol.id, 'activo': True, 'fecha_registro': datetime(2025, 1, 1)
+        })
+        if len(filas) == lote:
+            db.session.execute(insert(tabla), filas)
+            filas = []
+    if filas:
+        db.session.execute(insert(tabla), filas)
+    db.session.commit()
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia de la búsqueda de usuarios por backend')
+    parser.add_argument('--usuarios', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--ruta', default='/tmp/synapse_bench_busqueda.db', help='archivo SQLite a crear')
+    args = parser.parse_args()
+
+    if os.path.exists(args.ruta):
+        os.remove(args.ruta)
+
+    from app.config import DevelopmentConfig
+    DevelopmentConfig.SQLALCHEMY_DATABASE_URI = f'sqlite:///{args.ruta}'
+
+    from app import create_app
+    from app.models import db, Usuario
+    from app.services.busqueda_service import BusquedaUsuariosService
+
+    app = create_app('development')
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conexion:
+            if BusquedaUsuariosService.crear_estructuras(conexion) != 'fts5':
+                print('⚠ Este SQLite no soporta FTS5 con trigram; solo se mide ngram')
+
+        inicio = time.perf_counter()
+        app.config['BUSQUEDA_USUARIOS_BACKEND'] = 'fts5'  # los triggers FTS5 indexan al insertar
+        poblar(db, args.usuarios)
+        print(f'{args.usuarios} usuarios insertados en {time.perf_counter() - inicio:.1f}s')
+
+        inicio = time.perf_counter()
+        with db.engine.begin() as conexion:
+            BusquedaUsuariosService.reconstruir(conexion, 'ngram')
+        print(f'Índice de trigramas construido en {time.perf_counter() - inicio:.1f}s')
+
+        def like(termino):
+            return lambda: Usuario.query.filter(db.or_(
+                Usuario.username.like(f'%{termino}%'), Usuario.correo.like(f'%{termino}%')
+            )).all()
+
+        def backend(nombre, termino):
+            return lambda: BusquedaUsuariosService.buscar(termino, backend=nombre)
+
+        print(f"\n{'término':<16}{'backend':<10}{'resultados':>11}{'p50 ms':>10}{'p95 ms':>10}")
+        for termino in TERMINOS:
+            filas = [('like', like(termino))] + [(b, backend(b, termino)) for b in ('ngram', 'fts5')]
+            for nombre, funcion in filas:
+                resultados = len(funcion())
+                p50, p95 = medir(funcion, args.repeticiones)
+                db.session.remove()
+                print(f'{termino:<16}{nombre:<10}{resultados:>11}{p50:>10.2f}{p95:>10.2f}')
+
+    os.remove(args.ruta)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Compara los perfiles de gunicorn.conf.py con la misma prueba de carga.
+
+Para cada variante arranca gunicorn (wsgi:app, FLASK_ENV=production) sobre una copia de un
+SQLite migrado y mide:
+  - arranque: segundos desde el lanzamiento hasta que /health responde 200
+  - memoria: PSS de maestro y workers sumados (la memoria compartida por preload_app cuenta
+    una sola vez) y número de workers, tomados al terminar la carga
+  - carga: los escenarios de bench_carga (colección Bruno): rps, p50/p95/p99 y errores
+
+Una variante es un perfil (sync, gthread, gevent) con ':sin-preload' opcional. Las cifras
+dependen de la máquina y de la base: SQLite serializa las escrituras entre procesos, así que
+sirven para comparar perfiles entre sí, no como capacidad de producción.
+
+Uso:
+    python -m app.scripts.bench_gunicorn
+    python -m app.scripts.bench_gunicorn --variantes sync,gthread --usuarios 16 --duracion 30
+    python -m app.scripts.bench_gunicorn --workers 4 --guardar perfiles.json
+"""
+import sys
+import os
+import argparse
+import json
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.scripts.bench_carga import (
+    COLECCION, ESCENARIOS, ejecutar_carga, leer_coleccion, preparar_base, resumir, validar_escenarios
+)
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+VARIANTES = 'sync,gthread,gevent,gthread:sin-preload'
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _esperar_salud(url, proceso, limite):
+    inicio = time.monotonic()
+    while time.monotonic() - inicio < limite:
+        if proceso.poll() is not None:
+            raise SystemExit(f'✗ gunicorn terminó con código {proceso.returncode}')
+        try:
+            with urllib.request.urlopen(f'{url}/health', timeout=1) as respuesta:
+                if respuesta.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f'✗ {url}/health no respondió en {limite} s')
+
+
+def _hijos(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _pss_mb(pid):
+    """PSS del proceso en MB (Linux); 0 si /proc no lo ofrece"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for linea in f:
+                if linea.startswith('Pss:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def medir_variante(variante, base, args, coleccion, escenarios):
+    perfil, _, opcion = variante.partition(':')
+    directorio = tempfile.mkdtemp(prefix=f'synapse-gunicorn-{perfil}-')
+    archivo = os.path.join(directorio, 'carga.db')
+    shutil.copy(base, archivo)
+    os.makedirs(os.path.join(directorio, 'prometheus'))
+
+    puerto = _puerto_libre()
+    entorno = dict(
+        os.environ, FLASK_ENV='production', DATABASE_URL=f'sqlite:///{archivo}',
+        GUNICORN_PERFIL=perfil, GUNICORN_BIND=f'127.0.0.1:{puerto}',
+        GUNICORN_PRELOAD='false' if opcion == 'sin-preload' else 'true',
+        PROMETHEUS_MULTIPROC_DIR=os.path.join(directorio, 'prometheus'),
+    )
+    if args.workers:
+        entorno['WEB_CONCURRENCY'] = str(args.workers)
+    args.url = f'http://127.0.0.1:{puerto}'
+
+    inicio = time.monotonic()
+    registro = open(os.path.join(directorio, 'gunicorn.log'), 'w')
+    proceso = subprocess.Popen([sys.executable, '-m', 'gunicorn'], cwd=BACKEND, env=entorno,
+                               stdout=registro, stderr=subprocess.STDOUT)
+    try:
+        _esperar_salud(args.url, proceso, args.limite_arranque)
+        arranque = time.monotonic() - inicio
+        print(f'\n[{variante}] listo en {arranque:.2f} s')
+        resultados, segundos = ejecutar_carga(args, coleccion, escenarios)
+        workers = _hijos(proceso.pid)
+        memoria = _pss_mb(proceso.pid) + sum(_pss_mb(pid) for pid in workers)
+    finally:
+        proceso.send_signal(signal.SIGTERM)
+        try:
+            proceso.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+        registro.close()
+        if args.conservar:
+            print(f'  log y base en {directorio}')
+        else:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    total = resumir(resultados, segundos)['total']
+    return {'variante': variante, 'workers': len(workers), 'arranque_s': arranque, 'pss_mb': memoria, **total}
+
+
+def imprimir(filas):
+    print("\n| variante | workers | arranque (s) | PSS (MB) | rps | p50 (ms) | p95 (ms) | p99 (ms) | errores |")
+    print('|---|---:|---:|---:|---:|---:|---:|---:|---:|')
+    for f in filas:
+        print(f"| {f['variante']} | {f['workers']} | {f['arranque_s']:.2f} | {f['pss_mb']:.0f} | {f['rps']:.1f} "
+              f"| {f['p50']:.1f} | {f['p95']:.1f} | {f['p99']:.1f} | {f['errores_pct']:.1f}% |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arranque, memoria y carga de cada perfil de gunicorn')
+    parser.add_argument('--variantes', default=VARIANTES, help=f'separadas por comas (por defecto {VARIANTES})')
+    parser.add_argument('--workers', type=int, help='WEB_CONCURRENCY para todas las variantes')
+    parser.add_argument('--usuarios', type=int, default=8, help='usuarios virtuales concurrentes')
+    parser.add_argument('--duracion', type=float, default=20, help='segundos de prueba por variante')
+    parser.add_argument('--calentamiento', type=float, default=2, help='segundos iniciales que no se miden')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--limite-arranque', type=float, default=60, help='segundos máximos hasta /health')
+    parser.add_argument('--conservar', action='store_true', help='no borrar el log ni la base de cada variante')
+    parser.add_argument('--guardar', help='archivo JSON donde guardar los resultados')
+    args = parser.parse_args()
+
+    variantes = [v.strip() for v in args.variantes.split(',') if v.strip()]
+    for variante in variantes:
+        if variante.partition(':')[0] not in ('sync', 'gthread', 'gevent') or \
+                variante.partition(':')[2] not in ('', 'sin-preload'):
+            parser.error(f'variante desconocida: {variante}')
+
+    coleccion = leer_coleccion(COLECCION)
+    escenarios = {n: (peso, pasos) for n, (peso, pasos) in ESCENARIOS.items()}
+    validar_escenarios(coleccion, escenarios)
+
+    # Una base migrada y sembrada; cada variante trabaja sobre su copia
+    temporal = tempfile.mkdtemp(prefix='synapse-gunicorn-')
+    base = os.path.join(temporal, 'base.db')
+    try:
+        app = preparar_base(f'sqlite:///{base}')
+        with app.app_context():
+            from app.models import db
+            # Al cerrar la última conexión SQLite vuelca el WAL: basta con copiar el archivo
+            db.engine.dispose()
+
+        filas = [medir_variante(v, base, args, coleccion, escenarios) for v in variantes]
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    imprimir(filas)
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as f:
+            json.dump({'fecha': datetime.now().isoformat(timespec='seconds'), 'cpus': os.cpu_count(),
+                       'usuarios': args.usuarios, 'duracion': args.duracion, 'variantes': filas},
+                      f, ensure_ascii=False, indent=2)
+        print(f'Resultados guardados en {args.guardar}')
+
+
+if __name__ == '__main__':
+    main()
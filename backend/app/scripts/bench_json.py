@@ -0,0 +1,123 @@
+"""Benchmark de serialización y compresión en los listados.
+
+Siembra --filas tareas y sesiones de un usuario sobre SQLite en memoria, pide cada listado
+con limit=--filas y compara:
+  - tiempo de codificar la misma respuesta con el json estándar y con orjson,
+  - bytes sin comprimir y con gzip a distintos niveles (y lo que cuesta comprimir),
+  - latencia extremo a extremo de la petición con cada proveedor, con y sin gzip.
+
+Uso:
+    python -m app.scripts.bench_json
+    python -m app.scripts.bench_json --filas 200 --repeticiones 100
+"""
+import sys
+import os
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+LISTADOS = ['/api/tareas', '/api/sesiones']
+NIVELES_GZIP = [1, 6, 9]
+
+
+def poblar(db, filas):
+    from app.models import Rol, Usuario, Tecnica, Tarea, Sesion
+    from sqlalchemy import insert
+
+    azar = random.Random(42)
+    rol = Rol(nombre='usuario')
+    db.session.add(rol)
+    db.session.flush()
+    usuario = Usuario(username='bench', correo='bench@synapse.com', password='x', rol_id=rol.id)
+    tecnicas = [Tecnica(nombre=f'Técnica {i}', categoria='productividad') for i in range(5)]
+    db.session.add_all([usuario, *tecnicas])
+    db.session.flush()
+
+    inicio = datetime(2025, 1, 1)
+    db.session.execute(insert(Tarea.__table__), [{
+        'id_tarea': f'{i:08d}-tarea', 'usuario_id': usuario.id_usuario,
+        'titulo': f'Repasar capítulo {i} de cálculo', 'descripcion': 'Ejercicios impares y resumen del tema',
+        'fecha_creacion': inicio + timedelta(minutes=i), 'estado': azar.choice(['Pendiente', 'Completado']),
+        'prioridad': azar.choice(['alta', 'media', 'baja']), 'completada': False
+    } for i in range(filas)])
+    db.session.execute(insert(Sesion.__table__), [{
+        'id_sesion': f'{i:08d}-sesion', 'usuario_id': usuario.id_usuario,
+        'tecnica_id': azar.choice(tecnicas).id_tecnica, 'fecha_inicio': inicio + timedelta(hours=i),
+        'fecha_fin': inicio + timedelta(hours=i, minutes=25), 'duracion_real': 25,
+        'estado': 'Completado', 'completada': True, 'es_grupal': False
+    } for i in range(filas)])
+    db.session.commit()
+    return usuario.id_usuario
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Codificación JSON y gzip en los listados')
+    parser.add_argument('--filas', type=int, default=500, help='tareas y sesiones sembradas (y limit)')
+    parser.add_argument('--repeticiones', type=int, default=30)
+    args = parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.models import db
+    from app.utils.json_provider import JSONProviderEstandar, JSONProviderOrjson, orjson
+
+    app = create_app('testing')
+    app.config.update(PAGINACION_LIMITE_MAXIMO=args.filas, AUTH_PRINCIPAL_MODO='claims')
+    proveedores = {'estandar': JSONProviderEstandar(app)}
+    if orjson is not None:
+        proveedores['orjson'] = JSONProviderOrjson(app)
+    else:
+        print('⚠ orjson no está instalado; solo se mide el json estándar')
+
+    with app.app_context():
+        db.create_all()
+        usuario_id = poblar(db, args.filas)
+        token = create_access_token(identity=usuario_id)
+    cliente = app.test_client()
+    cabeceras = {'Authorization': f'Bearer {token}'}
+
+    for ruta in LISTADOS:
+        url = f'{ruta}?limit={args.filas}'
+        datos = cliente.get(url, headers=cabeceras).get_json()
+        print(f'\n{url}  ({len(datos)} elementos)')
+
+        print(f"  {'proveedor':<12}{'codificar ms':>14}{'bytes':>10}")
+        cuerpo = None
+        with app.app_context():
+            for nombre, proveedor in proveedores.items():
+                ms = medir(lambda: proveedor.response(datos), args.repeticiones)
+                cuerpo = proveedor.response(datos).get_data()
+                print(f'  {nombre:<12}{ms:>14.3f}{len(cuerpo):>10}')
+
+        print(f"  {'gzip':<12}{'comprimir ms':>14}{'bytes':>10}{'ratio':>8}")
+        for nivel in NIVELES_GZIP:
+            ms = medir(lambda: gzip.compress(cuerpo, compresslevel=nivel), args.repeticiones)
+            comprimido = len(gzip.compress(cuerpo, compresslevel=nivel))
+            print(f'  {f"nivel {nivel}":<12}{ms:>14.3f}{comprimido:>10}{comprimido / len(cuerpo):>8.2f}')
+
+        print(f"  {'petición':<22}{'p50 ms':>10}{'bytes':>10}")
+        for nombre, proveedor in proveedores.items():
+            app.json = proveedor
+            for codificacion in ('identity', 'gzip'):
+                extra = dict(cabeceras, **{'Accept-Encoding': codificacion})
+                ms = medir(lambda: cliente.get(url, headers=extra), args.repeticiones)
+                tamaño = len(cliente.get(url, headers=extra).get_data())
+                print(f'  {f"{nombre} + {codificacion}":<22}{ms:>10.2f}{tamaño:>10}')
+
+
+if __name__ == '__main__':
+    main()
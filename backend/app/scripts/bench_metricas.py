@@ -0,0 +1,156 @@
+"""Benchmark del coste de las métricas Prometheus.
+
+Siembra un usuario con --filas tareas sobre SQLite en memoria y mide:
+  - el coste por petición de registrar latencia y estado (sin Flask de por medio),
+  - la latencia extremo a extremo de rutas calientes con METRICAS_ACTIVAS en falso y en verdadero,
+  - lo que tarda en generarse la respuesta de /metrics.
+
+Con --multiproceso repite la medición en un proceso hijo con PROMETHEUS_MULTIPROC_DIR apuntando
+a un directorio temporal (archivos mmap, como con varios workers de gunicorn).
+
+Uso:
+    python -m app.scripts.bench_metricas
+    python -m app.scripts.bench_metricas --repeticiones 2000 --multiproceso
+"""
+import sys
+import os
+import argparse
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+RUTAS = ['/api/tecnicas', '/api/tareas?limit=20', '/api/progreso/semana']
+
+
+def poblar(db, filas):
+    from app.models import Rol, Usuario, Tecnica, Tarea
+    from sqlalchemy import insert
+
+    azar = random.Random(42)
+    rol = Rol(nombre='usuario')
+    db.session.add(rol)
+    db.session.flush()
+    usuario = Usuario(username='bench', correo='bench@synapse.com', password='x', rol_id=rol.id)
+    db.session.add_all([usuario, *[Tecnica(nombre=f'Técnica {i}', categoria='productividad') for i in range(5)]])
+    db.session.flush()
+
+    inicio = datetime(2025, 1, 1)
+    db.session.execute(insert(Tarea.__table__), [{
+        'id_tarea': f'{i:08d}-tarea', 'usuario_id': usuario.id_usuario, 'titulo': f'Tarea {i}',
+        'fecha_creacion': inicio + timedelta(minutes=i), 'estado': azar.choice(['Pendiente', 'Completado']),
+        'prioridad': azar.choice(['alta', 'media', 'baja']), 'completada': False
+    } for i in range(filas)])
+    db.session.commit()
+    return usuario.id_usuario
+
+
+def percentiles(tiempos):
+    tiempos = sorted(tiempos)
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def cliente_con_metricas(activas, filas):
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.models import db
+
+    from app.config import TestingConfig
+
+    # create_app solo recibe el nombre de la configuración: se cambia la clave el tiempo justo
+    original = TestingConfig.METRICAS_ACTIVAS
+    TestingConfig.METRICAS_ACTIVAS = activas
+    try:
+        app = create_app('testing')
+    finally:
+        TestingConfig.METRICAS_ACTIVAS = original
+    app.config.update(AUTH_PRINCIPAL_MODO='claims')
+    with app.app_context():
+        db.create_all()
+        token = create_access_token(identity=poblar(db, filas))
+    return app.test_client(), {'Authorization': f'Bearer {token}'}
+
+
+def medir_observacion(repeticiones):
+    """Microsegundos por petición que añaden las métricas: hijos etiquetados, observe e inc"""
+    from app.utils.metrics import _obtener_metricas
+
+    metricas = _obtener_metricas()
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        duracion, peticiones = metricas.hijos('tarea', 'tarea.get_tareas', 'GET', '200')
+        metricas.en_curso.inc()
+        duracion.observe(0.012)
+        peticiones.inc()
+        metricas.en_curso.dec()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def medir(args):
+    from app.utils.metrics import modo_multiproceso
+
+    modo = 'multiproceso (mmap)' if modo_multiproceso() else 'un proceso (memoria)'
+    print(f'\n== Modo {modo}')
+    print(f'  registro por petición: {medir_observacion(args.repeticiones * 10):.2f} µs')
+
+    clientes = {
+        'sin métricas': cliente_con_metricas(False, args.filas),
+        'con métricas': cliente_con_metricas(True, args.filas),
+    }
+    print(f"  {'ruta':<26}{'variante':<16}{'p50 ms':>10}{'p95 ms':>10}")
+    for ruta in RUTAS:
+        tiempos = {nombre: [] for nombre in clientes}
+        for _ in range(20):
+            for cliente, cabeceras in clientes.values():
+                cliente.get(ruta, headers=cabeceras)
+        # Variantes intercaladas para que el ruido de la máquina afecte a las dos por igual
+        for _ in range(args.repeticiones):
+            for nombre, (cliente, cabeceras) in clientes.items():
+                inicio = time.perf_counter()
+                cliente.get(ruta, headers=cabeceras)
+                tiempos[nombre].append((time.perf_counter() - inicio) * 1000)
+        medianas = {}
+        for nombre, muestras in tiempos.items():
+            p50, p95 = percentiles(muestras)
+            medianas[nombre] = p50
+            print(f'  {ruta:<26}{nombre:<16}{p50:>10.3f}{p95:>10.3f}')
+        extra = (medianas['con métricas'] - medianas['sin métricas']) * 1000
+        print(f"  {'':<26}{'sobrecoste':<16}{extra:>9.1f}µs")
+
+    cliente, _ = clientes['con métricas']
+    tiempos = []
+    for _ in range(50):
+        inicio = time.perf_counter()
+        respuesta = cliente.get('/metrics')
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    print(f'  /metrics: {statistics.median(tiempos):.2f} ms, {len(respuesta.get_data())} bytes')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coste de las métricas Prometheus por petición')
+    parser.add_argument('--filas', type=int, default=200, help='tareas sembradas')
+    parser.add_argument('--repeticiones', type=int, default=500)
+    parser.add_argument('--multiproceso', action='store_true',
+                        help='medir también con PROMETHEUS_MULTIPROC_DIR en un proceso hijo')
+    parser.add_argument('--hijo', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    medir(args)
+    if args.multiproceso and not args.hijo:
+        directorio = tempfile.mkdtemp(prefix='synapse-metricas-')
+        try:
+            entorno = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directorio)
+            subprocess.run([sys.executable, '-m', 'app.scripts.bench_metricas', '--hijo',
+                            '--filas', str(args.filas), '--repeticiones', str(args.repeticiones)],
+                           env=entorno, check=True, cwd=sys.path[0])
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
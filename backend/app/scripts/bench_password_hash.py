@@ -0,0 +1,73 @@
+"""Micro-benchmark de verificación de contraseñas: logins/s por algoritmo y coste.
+
+Cada configuración verifica la misma contraseña durante --segundos con un pool de
+--workers hilos, como hace PasswordService en /login. Sirve para elegir
+PASSWORD_ALGORITMO / PASSWORD_COSTE / PASSWORD_HASH_WORKERS en cada máquina.
+
+Uso:
+    python -m app.scripts.bench_password_hash
+    python -m app.scripts.bench_password_hash --workers 1 4 --segundos 3
+    python -m app.scripts.bench_password_hash --config bcrypt:12 scrypt:16384
+"""
+import sys
+import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.password_service import calcular_hash, comprobar_hash
+
+CONFIGURACIONES = [
+    'bcrypt:10', 'bcrypt:12',
+    'scrypt:16384', 'scrypt:32768',
+    'pbkdf2:260000', 'pbkdf2:1000000',
+]
+
+
+def medir(algoritmo, coste, workers, segundos, password='Synapse#2025'):
+    """Devuelve (ms por verificación, verificaciones por segundo con el pool)"""
+    hash_guardado = calcular_hash(password, algoritmo, coste)
+
+    inicio = time.perf_counter()
+    comprobar_hash(hash_guardado, password)
+    ms = (time.perf_counter() - inicio) * 1000
+
+    def bucle(limite):
+        hechas = 0
+        while time.perf_counter() < limite:
+            comprobar_hash(hash_guardado, password)
+            hechas += 1
+        return hechas
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        inicio = time.perf_counter()
+        limite = inicio + segundos
+        total = sum(pool.map(bucle, [limite] * workers))
+        transcurrido = time.perf_counter() - inicio
+    return ms, total / transcurrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Logins/s por configuración de hashing')
+    parser.add_argument('--config', nargs='+', default=CONFIGURACIONES, help='algoritmo:coste')
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 4], help='tamaños de pool a medir')
+    parser.add_argument('--segundos', type=float, default=2.0, help='duración de cada medición')
+    args = parser.parse_args()
+
+    print(f'CPUs: {os.cpu_count()}')
+    print(f"{'configuración':<18}{'ms/hash':>10}" + ''.join(f'{f"logins/s w={w}":>16}' for w in args.workers))
+    for configuracion in args.config:
+        algoritmo, coste = configuracion.split(':')
+        fila = f'{configuracion:<18}'
+        for i, workers in enumerate(args.workers):
+            ms, por_segundo = medir(algoritmo, int(coste), workers, args.segundos)
+            if i == 0:
+                fila += f'{ms:>10.1f}'
+            fila += f'{por_segundo:>16.1f}'
+        print(fila)
+
+
+if __name__ == '__main__':
+    main()
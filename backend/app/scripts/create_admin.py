@@ -2,11 +2,11 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import create_app
+from app import create_models_app
 from app.models import db, Usuario, Rol
 
 def create_admin():
-    app = create_app()
+    app = create_models_app()
     with app.app_context():
         # Verificar si ya existe un admin
         admin = Usuario.query.filter_by(rol_id=1).first()
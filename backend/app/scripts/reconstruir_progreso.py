@@ -0,0 +1,54 @@
+"""Reconstruye el rollup diario de Progreso para un rango de fechas.
+
+Uso:
+    python -m app.scripts.reconstruir_progreso --desde 2025-01-01 --hasta 2025-12-31
+    python -m app.scripts.reconstruir_progreso --dias 7 --usuario <id_usuario>
+"""
+import sys
+import os
+import argparse
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_models_app
+from app.models import db
+from app.services.progreso_service import ProgresoService
+
+
+def _fecha(valor):
+    return datetime.strptime(valor, '%Y-%m-%d').date()
+
+
+def reconstruir_progreso(desde, hasta, usuario_id=None, dias_por_lote=31):
+    """Recalcula el rango por lotes de días, confirmando cada lote por separado"""
+    app = create_models_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        total = 0
+        inicio_lote = desde
+        while inicio_lote <= hasta:
+            fin_lote = min(inicio_lote + timedelta(days=dias_por_lote - 1), hasta)
+            escritos = ProgresoService.reconstruir(inicio_lote, fin_lote, usuario_id=usuario_id)
+            db.session.commit()
+            total += escritos
+            print(f"✓ {inicio_lote.isoformat()} → {fin_lote.isoformat()}: {escritos} días con actividad")
+            inicio_lote = fin_lote + timedelta(days=1)
+        print(f"Progreso reconstruido: {total} registros (usuario, día)")
+        return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reconstruye el rollup de progreso diario')
+    parser.add_argument('--desde', type=_fecha, help='Fecha inicial (YYYY-MM-DD)')
+    parser.add_argument('--hasta', type=_fecha, default=date.today(), help='Fecha final (YYYY-MM-DD), por defecto hoy')
+    parser.add_argument('--dias', type=int, default=None, help='Alternativa a --desde: últimos N días')
+    parser.add_argument('--usuario', default=None, help='Limitar a un usuario (id_usuario)')
+    parser.add_argument('--lote', type=int, default=31, help='Días por transacción')
+    args = parser.parse_args()
+
+    if args.desde is None:
+        args.desde = args.hasta - timedelta(days=(args.dias or 1) - 1)
+    if args.desde > args.hasta:
+        parser.error('--desde debe ser anterior o igual a --hasta')
+
+    reconstruir_progreso(args.desde, args.hasta, usuario_id=args.usuario, dias_por_lote=args.lote)
@@ -0,0 +1,35 @@
+"""Reconstruye el índice de búsqueda de usuarios.
+
+Necesario al cambiar BUSQUEDA_USUARIOS_BACKEND a 'ngram' sobre una base con usuarios,
+o tras cargar usuarios sin pasar por el ORM en una base sin FTS5/FULLTEXT.
+
+Uso:
+    python -m app.scripts.reindexar_usuarios
+    python -m app.scripts.reindexar_usuarios --backend ngram
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_models_app
+from app.models import db
+from app.services.busqueda_service import BusquedaUsuariosService
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reconstruye el índice de búsqueda de usuarios')
+    parser.add_argument('--backend', choices=BusquedaUsuariosService.BACKENDS, help='por defecto, el configurado')
+    args = parser.parse_args()
+
+    app = create_models_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        backend = args.backend or BusquedaUsuariosService.backend()
+        with db.engine.begin() as conexion:
+            total = BusquedaUsuariosService.reconstruir(conexion, backend)
+        print(f'✓ Índice {backend}: {total} usuarios indexados')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,14 @@ import os
 # Agrega la raíz del proyecto al path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from app import create_app
+from app import create_models_app
 from app.models import db
 from app.models.rol import Rol
 from app.models.tecnica import Tecnica
 from app.models.recompensa import Recompensa
 import json
 
-app = create_app()
+app = create_models_app()
 
 def insertar_datos_iniciales():
     with app.app_context():
@@ -3,10 +3,10 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from app import create_app
+from app import create_models_app
 from app.models import db, Rol
 
-app = create_app()
+app = create_models_app()
 app.app_context().push()
 
 roles_requeridos = ["admin", "usuario"]
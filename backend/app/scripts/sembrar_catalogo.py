@@ -0,0 +1,27 @@
+"""Siembra (o actualiza) el catálogo de recompensas del sistema.
+
+La migración 0005 ya lo siembra; este script sirve para volver a aplicarlo tras
+cambiar RecompensaService.CATALOGO_SISTEMA sin crear una migración nueva.
+
+Uso:
+    python -m app.scripts.sembrar_catalogo
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_models_app
+from app.services.recompensa_service import RecompensaService
+
+
+def main():
+    app = create_models_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        insertadas, actualizadas = RecompensaService.inicializar_recompensas_sistema()
+        print(f'✓ Catálogo v{RecompensaService.VERSION_CATALOGO}: '
+              f'{insertadas} recompensas nuevas, {actualizadas} actualizadas')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Verifica que las consultas de las rutas no hagan recorridos completos de tabla.
+
+Levanta la app sobre SQLite en memoria, siembra un conjunto mínimo de datos, llama a
+cada ruta de lectura capturando el SQL que realmente emite y ejecuta
+EXPLAIN QUERY PLAN sobre cada sentencia. Termina con código 1 si algún plan
+contiene un SCAN de una tabla que no sea de catálogo. Solo pasan las búsquedas (SEARCH)
+y los recorridos de los índices de INDICES_ORDENADOS.
+
+Uso:
+    python -m app.scripts.verificar_planes
+"""
+import sys
+import os
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import event
+
+# Tablas de catálogo (pocas filas, se leen completas a propósito)
+TABLAS_CATALOGO = {'rol', 'tecnica', 'recompensa'}
+
+# Recorridos por índice que se aceptan, como (tabla, índice): listados paginados por cursor
+# que leen en el orden del índice y paran en LIMIT. Cualquier otro SCAN ... USING INDEX o
+# USING COVERING INDEX recorre el índice entero y cuenta como recorrido completo.
+INDICES_ORDENADOS = {('usuario', 'ix_usuario_fecha_registro')}
+
+# Rutas de lectura a verificar. Los marcadores {…} se rellenan con los datos sembrados.
+# El segundo elemento son tablas cuyo recorrido completo se acepta en esa ruta.
+RUTAS = [
+    ('/api/auth/me', set()),
+    ('/api/tareas', set()),
+    ('/api/tareas?estado=Pendiente', set()),
+    ('/api/tareas/{tarea}', set()),
+    ('/api/tareas/estadisticas', set()),
+    ('/api/tareas/sala/{sala}', set()),
+    ('/api/tareas/debug', set()),
+    ('/api/sesiones', set()),
+    ('/api/sesiones/{sesion}', set()),
+    ('/api/sesiones/estadisticas', set()),
+    ('/api/progreso', set()),
+    ('/api/progreso/hoy', set()),
+    ('/api/progreso/semana', set()),
+    ('/api/progreso/mes', set()),
+    ('/api/progreso/estadisticas-generales', set()),
+    ('/api/dashboard', set()),
+    ('/api/salas', set()),
+    ('/api/salas/publicas', set()),
+    ('/api/salas/{sala}', set()),
+    ('/api/tecnicas', set()),
+    ('/api/tecnicas/populares', set()),
+    ('/api/tecnicas/categorias', set()),
+    ('/api/recompensas', set()),
+    ('/api/recompensas/mis-recompensas', set()),
+    ('/api/recompensas/disponibles', set()),
+    ('/api/usuarios', set()),
+    ('/api/usuarios?limit=1&fields=id_usuario,username', set()),
+    ('/api/tareas?limit=1&fields=id_tarea,titulo', set()),
+    ('/api/progreso?limit=1', set()),
+    ('/api/usuarios/{usuario}', set()),
+    ('/api/usuarios?include=tareas', set()),
+    ('/api/usuarios/{usuario}/tareas', set()),
+    ('/api/gamificacion/eventos', set()),
+    ('/api/usuarios/search?q=plan', set()),
+    ('/api/usuarios/search?q=pl', set()),
+]
+
+
+def sembrar_datos_minimos(db):
+    """Crea un usuario con una tarea, una sesión, una sala y un día de progreso"""
+    from app.models import Rol, Usuario, Tecnica, Tarea, Sesion, SesionTecnicaParam, Sala, UsuarioSala, Progreso
+
+    rol = Rol(nombre='usuario')
+    db.session.add(rol)
+    db.session.flush()
+    usuario = Usuario(username='plan', correo='plan@synapse.com', password='x', rol_id=rol.id)
+    tecnica = Tecnica(nombre='Pomodoro', categoria='productividad')
+    db.session.add_all([usuario, tecnica])
+    db.session.flush()
+
+    sala = Sala(nombre='Sala plan', creador_id=usuario.id_usuario)
+    db.session.add(sala)
+    db.session.flush()
+    db.session.add(UsuarioSala(id_usuario=usuario.id_usuario, id_sala=sala.id_sala, rol_en_sala='lider'))
+
+    tarea = Tarea(usuario_id=usuario.id_usuario, sala_id=sala.id_sala, titulo='Tarea plan',
+                  estado='Pendiente', fecha_vencimiento=date.today() + timedelta(days=3))
+    sesion = Sesion(usuario_id=usuario.id_usuario, tecnica_id=tecnica.id_tecnica,
+                    fecha_inicio=datetime.utcnow() - timedelta(minutes=25), fecha_fin=datetime.utcnow(),
+                    duracion_real=25, estado='Completado')
+    db.session.add_all([tarea, sesion])
+    db.session.flush()
+    db.session.add(SesionTecnicaParam(id_sesion=sesion.id_sesion, parametro='ciclos_objetivo', valor='4'))
+    db.session.add(Progreso(usuario_id=usuario.id_usuario, fecha=date.today(), minutos_estudio=25, sesiones_realizadas=1))
+    db.session.commit()
+
+    return {
+        'usuario': usuario.id_usuario,
+        'tarea': tarea.id_tarea,
+        'sesion': sesion.id_sesion,
+        'sala': sala.id_sala,
+    }
+
+
+def tablas_recorridas(conexion, sentencia, parametros):
+    """Devuelve las tablas que SQLite recorre completas al ejecutar la sentencia"""
+    cursor = conexion.cursor()
+    try:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sentencia, parametros)
+        filas = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    tablas = set()
+    for fila in filas:
+        detalle = fila[-1]
+        if not detalle.startswith('SCAN '):
+            continue
+        partes = detalle.split()
+        # SQLite < 3.36 escribe "SCAN TABLE tarea"
+        nombre = partes[2] if len(partes) > 2 and partes[1] == 'TABLE' else partes[1]
+        if nombre == 'CONSTANT' or nombre.startswith('('):
+            continue
+        # "SCAN tarea USING [COVERING] INDEX ix_..."
+        indice = partes[-1] if 'INDEX' in partes[:-1] else None
+        if (nombre, indice) in INDICES_ORDENADOS:
+            continue
+        tablas.add(nombre)
+    return tablas
+
+
+def verificar_rutas(app, cliente, headers, ids, rutas=RUTAS):
+    """Llama a cada ruta y devuelve (problemas, rutas que fallaron antes de poder verificarse)"""
+    from app.models import db
+
+    problemas = []
+    fallidas = []
+    with app.app_context():
+        engine = db.engine
+        capturadas = []
+
+        def capturar(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                capturadas.append((statement, parameters))
+
+        event.listen(engine, 'before_cursor_execute', capturar)
+        try:
+            for plantilla, permitidas in rutas:
+                ruta = plantilla.format(**ids)
+                capturadas.clear()
+                respuesta = cliente.get(ruta, headers=headers)
+                if respuesta.status_code >= 500:
+                    fallidas.append(f'{ruta}: respondió {respuesta.status_code}')
+
+                sentencias = list(capturadas)
+                with engine.connect() as conn:
+                    conexion = conn.connection.dbapi_connection
+                    for sentencia, parametros in sentencias:
+                        recorridas = tablas_recorridas(conexion, sentencia, parametros)
+                        # Solo cuentan las tablas reales, no las subconsultas materializadas
+                        recorridas &= set(db.metadata.tables)
+                        recorridas -= TABLAS_CATALOGO | permitidas
+                        if recorridas:
+                            problemas.append(
+                                f"{ruta}: recorrido completo de {', '.join(sorted(recorridas))} en: "
+                                f"{' '.join(sentencia.split())[:160]}"
+                            )
+        finally:
+            event.remove(engine, 'before_cursor_execute', capturar)
+    return problemas, fallidas
+
+
+def main():
+    from app import create_app
+    from app.models import db
+    from flask_jwt_extended import create_access_token
+
+    # TestingConfig: SQLite en memoria (EXPLAIN QUERY PLAN es propio de SQLite)
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        ids = sembrar_datos_minimos(db)
+        headers = {'Authorization': 'Bearer ' + create_access_token(identity=ids['usuario'])}
+
+    problemas, fallidas = verificar_rutas(app, app.test_client(), headers, ids)
+    for fallida in fallidas:
+        print('⚠ Ruta no verificada por completo - ' + fallida)
+    if problemas:
+        print('✗ Planes de consulta con recorridos completos:')
+        for problema in problemas:
+            print('  - ' + problema)
+        return 1
+    print(f'✓ {len(RUTAS)} rutas verificadas sin recorridos completos de tabla')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
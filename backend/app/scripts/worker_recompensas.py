@@ -0,0 +1,60 @@
+"""Worker que evalúa las recompensas de la bandeja de eventos (RECOMPENSAS_EVENTOS_MODO=redis).
+
+Espera avisos en la cola de Redis y, aunque no lleguen, barre la tabla cada --intervalo
+segundos para recoger eventos que no se pudieron encolar o quedaron a medias.
+
+Uso:
+    python -m app.scripts.worker_recompensas
+    python -m app.scripts.worker_recompensas --una-vez      # vaciar la bandeja y salir (cron)
+    python -m app.scripts.worker_recompensas --sin-redis    # solo barrido periódico de la tabla
+"""
+import sys
+import os
+import argparse
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_models_app
+from app.services.evento_service import EventoService
+
+
+def ejecutar(intervalo, una_vez=False, sin_redis=False):
+    app = create_models_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        cliente = None
+        if not sin_redis and not una_vez:
+            try:
+                cliente = EventoService._cliente_redis()
+                cliente.ping()
+            except Exception as e:
+                print(f'⚠ Redis no disponible ({e}); se barre la tabla cada {intervalo}s')
+                cliente = None
+
+        while True:
+            total = EventoService.procesar_todo()
+            if total:
+                print(f'✓ {total} eventos procesados')
+            if una_vez:
+                return total
+
+            if cliente is not None:
+                # Los ids de la cola solo despiertan al worker: el lote se reclama desde la tabla
+                if cliente.blpop(EventoService.COLA_REDIS, timeout=intervalo):
+                    while cliente.lpop(EventoService.COLA_REDIS):
+                        pass
+            else:
+                time.sleep(intervalo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--intervalo', type=int, default=5, help='segundos entre barridos de la tabla')
+    parser.add_argument('--una-vez', action='store_true', help='procesar lo pendiente y salir')
+    parser.add_argument('--sin-redis', action='store_true', help='no escuchar la cola de Redis')
+    args = parser.parse_args()
+    ejecutar(args.intervalo, una_vez=args.una_vez, sin_redis=args.sin_redis)
+
+
+if __name__ == '__main__':
+    main()
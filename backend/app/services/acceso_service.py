@@ -0,0 +1,154 @@
+# services/acceso_service.py
+import atexit
+import threading
+from datetime import datetime
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import and_, bindparam, or_, update
+
+from app.models import db, Usuario
+from app.utils import generate_uuid
+
+
+class AccesoService:
+    """Último acceso de los usuarios sin escribir la fila en cada petición.
+
+    Los accesos se acumulan en memoria (o en un hash de Redis compartido entre workers si
+    ULTIMO_ACCESO_BACKEND='redis') y se vuelcan con un UPDATE en bloque cada
+    ULTIMO_ACCESO_INTERVALO_SEGUNDOS: ultimo_acceso se retrasa como mucho ese intervalo
+    (en memoria, se pierde lo pendiente si el proceso muere sin salir limpiamente).
+    """
+
+    CLAVE_REDIS = 'synapse:ultimo_acceso'
+
+    @classmethod
+    def registrar(cls, usuario_id, momento=None):
+        """Anota un acceso; se persiste en el siguiente volcado"""
+        _RegistroAccesos.de(current_app._get_current_object()).anotar(usuario_id, momento or datetime.utcnow())
+
+    @classmethod
+    def volcar(cls):
+        """Escribe ya los accesos pendientes; devuelve cuántos usuarios se actualizaron"""
+        return _RegistroAccesos.de(current_app._get_current_object()).volcar()
+
+    @classmethod
+    def init_app(cls, app):
+        """Con ULTIMO_ACCESO_EN_PETICIONES anota el acceso en cada petición autenticada"""
+        if not app.config.get('ULTIMO_ACCESO_EN_PETICIONES'):
+            return
+
+        @app.after_request
+        def _anotar_acceso(respuesta):
+            try:
+                if verify_jwt_in_request(optional=True) and get_jwt_identity():
+                    cls.registrar(get_jwt_identity())
+            except Exception:
+                # Token inválido o caducado: la propia ruta ya respondió con el error
+                pass
+            return respuesta
+
+
+class _RegistroAccesos:
+    """Pendientes del proceso y hilo que los vuelca periódicamente"""
+
+    def __init__(self, app):
+        self.app = app
+        self.intervalo = app.config.get('ULTIMO_ACCESO_INTERVALO_SEGUNDOS', 60)
+        self.redis = None
+        if app.config.get('ULTIMO_ACCESO_BACKEND', 'memoria') == 'redis':
+            import redis
+            self.redis = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+        self._pendientes = {}
+        self._lock = threading.Lock()
+        self._hilo = None
+        self._parar = threading.Event()
+
+    @classmethod
+    def de(cls, app):
+        registro = app.extensions.get('synapse_accesos')
+        if registro is None:
+            registro = app.extensions.setdefault('synapse_accesos', cls(app))
+        return registro
+
+    def anotar(self, usuario_id, momento):
+        try:
+            if self.redis is not None:
+                self.redis.hset(AccesoService.CLAVE_REDIS, usuario_id, momento.isoformat())
+                return self._arrancar()
+        except Exception:
+            # Sin Redis se guarda en memoria: no debe fallar el login por esto
+            self.app.logger.warning('Redis no disponible para ultimo_acceso', exc_info=True)
+        with self._lock:
+            anterior = self._pendientes.get(usuario_id)
+            if anterior is None or anterior < momento:
+                self._pendientes[usuario_id] = momento
+        self._arrancar()
+
+    def volcar(self):
+        pendientes = self._tomar_pendientes()
+        if not pendientes:
+            return 0
+
+        tabla = Usuario.__table__
+        # Nunca retroceder: otro proceso pudo volcar un acceso más reciente
+        sentencia = update(tabla).where(and_(
+            tabla.c.id_usuario == bindparam('b_id'),
+            or_(tabla.c.ultimo_acceso.is_(None), tabla.c.ultimo_acceso < bindparam('b_momento'))
+        )).values(ultimo_acceso=bindparam('b_momento'))
+        filas = [{'b_id': usuario_id, 'b_momento': momento} for usuario_id, momento in pendientes.items()]
+
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as conexion:
+                    conexion.execute(sentencia, filas)
+        except Exception:
+            # Se reintentan en el siguiente volcado
+            for usuario_id, momento in pendientes.items():
+                self.anotar(usuario_id, momento)
+            raise
+        return len(filas)
+
+    def _tomar_pendientes(self):
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, {}
+        if self.redis is None:
+            return pendientes
+
+        # RENAME es atómico: los accesos que lleguen mientras tanto van al hash nuevo
+        temporal = f'{AccesoService.CLAVE_REDIS}:volcando:{generate_uuid()}'
+        try:
+            self.redis.rename(AccesoService.CLAVE_REDIS, temporal)
+        except Exception:
+            return pendientes  # no había pendientes en Redis (o no está disponible)
+        crudos = self.redis.hgetall(temporal)
+        self.redis.delete(temporal)
+        for clave, valor in crudos.items():
+            usuario_id, momento = clave.decode(), datetime.fromisoformat(valor.decode())
+            if usuario_id not in pendientes or pendientes[usuario_id] < momento:
+                pendientes[usuario_id] = momento
+        return pendientes
+
+    def _arrancar(self):
+        if self._hilo is not None:
+            return
+        with self._lock:
+            if self._hilo is not None:
+                return
+            self._hilo = threading.Thread(target=self._bucle, name='volcado-ultimo-acceso', daemon=True)
+            self._hilo.start()
+        atexit.register(self._al_salir)
+
+    def _bucle(self):
+        while not self._parar.wait(self.intervalo):
+            self._volcar_seguro()
+
+    def _al_salir(self):
+        self._parar.set()
+        self._volcar_seguro()
+
+    def _volcar_seguro(self):
+        try:
+            self.volcar()
+        except Exception:
+            self.app.logger.exception('Error volcando ultimo_acceso')
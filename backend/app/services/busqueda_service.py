@@ -0,0 +1,258 @@
+# services/busqueda_service.py
+from flask import current_app, has_app_context
+from sqlalchemy import and_, case, delete, event, func, inspect, insert, or_, select, text
+from sqlalchemy.orm import load_only
+
+from app.models import db, Usuario, UsuarioNgrama
+
+
+class BusquedaUsuariosService:
+    """Búsqueda de usuarios por subcadena sobre un índice, sin recorrer la tabla usuario.
+
+    Backends (BUSQUEDA_USUARIOS_BACKEND, 'auto' elige según la base):
+      - 'fts5': tabla virtual FTS5 con tokenizador trigram (SQLite), mantenida por triggers
+      - 'fulltext': índice FULLTEXT sobre username y correo (MariaDB/MySQL), por palabras
+      - 'ngram': tabla usuario_ngrama mantenida desde el ORM; funciona en cualquier base
+    Se indexan el username y la parte local del correo. Los términos de menos de 3
+    caracteres se resuelven por prefijo con los índices únicos de username y correo.
+    """
+
+    BACKENDS = ('fts5', 'fulltext', 'ngram')
+    TABLA_FTS = 'usuario_fts'
+    INDICE_FULLTEXT = 'ft_usuario_busqueda'
+    LONGITUD_MINIMA = 3
+
+    @classmethod
+    def buscar(cls, termino, limite=None, resumen=True, backend=None):
+        """Usuarios que contienen termino, ordenados por relevancia y limitados.
+
+        Con resumen=True solo se cargan las columnas de la vista summary.
+        """
+        maximo = current_app.config.get('BUSQUEDA_USUARIOS_LIMITE', 20)
+        limite = max(1, min(limite or maximo, maximo))
+        termino = termino.strip().lower()
+        if not termino:
+            return []
+
+        ids = []
+        if '@' in termino:
+            # Correo completo: coincidencia exacta primero y después por la parte local
+            ids = list(db.session.scalars(select(Usuario.id_usuario).where(Usuario.correo == termino)))
+            termino = termino.split('@', 1)[0]
+
+        if len(termino) >= cls.LONGITUD_MINIMA:
+            buscar = getattr(cls, f'_buscar_{backend or cls.backend()}')
+            ids += [i for i in buscar(termino, limite) if i not in ids]
+        elif termino:
+            ids += [i for i in cls._buscar_prefijo(termino, limite) if i not in ids]
+        return cls._cargar(ids[:limite], resumen)
+
+    @classmethod
+    def backend(cls, conexion=None):
+        """Backend configurado o, con 'auto', el disponible en la base actual"""
+        configurado = current_app.config.get('BUSQUEDA_USUARIOS_BACKEND', 'auto')
+        if configurado != 'auto':
+            return configurado
+        elegido = current_app.extensions.get('synapse_busqueda_backend')
+        if elegido is None:
+            # Con la conexión en curso: abrir otra podría deshacer la transacción (SQLite en memoria)
+            conexion = conexion if conexion is not None else db.session.connection()
+            elegido = current_app.extensions.setdefault('synapse_busqueda_backend', cls.resolver_backend(conexion))
+        return elegido
+
+    @classmethod
+    def resolver_backend(cls, conexion):
+        """'fts5' o 'fulltext' si sus estructuras existen en esta base; si no, 'ngram'"""
+        inspector = inspect(conexion)
+        dialecto = conexion.dialect.name
+        if dialecto == 'sqlite' and inspector.has_table(cls.TABLA_FTS):
+            return 'fts5'
+        if dialecto in ('mysql', 'mariadb') and any(
+            indice['name'] == cls.INDICE_FULLTEXT for indice in inspector.get_indexes('usuario')
+        ):
+            return 'fulltext'
+        return 'ngram'
+
+    @classmethod
+    def crear_estructuras(cls, conexion):
+        """Crea el índice nativo de la base (FTS5 + triggers en SQLite, FULLTEXT en MySQL).
+
+        Devuelve el backend resultante; si la base no soporta ninguno queda 'ngram'.
+        """
+        dialecto = conexion.dialect.name
+        if dialecto == 'sqlite':
+            try:
+                conexion.execute(text(
+                    f"CREATE VIRTUAL TABLE {cls.TABLA_FTS} USING fts5("
+                    f"id_usuario UNINDEXED, username, correo, tokenize='trigram')"
+                ))
+            except Exception:
+                # SQLite sin FTS5 o anterior a 3.34 (sin tokenizador trigram)
+                return 'ngram'
+            local = "substr({0}.correo, 1, instr({0}.correo || '@', '@') - 1)"
+            insertar = (
+                f"INSERT INTO {cls.TABLA_FTS}(id_usuario, username, correo) "
+                f"VALUES (new.id_usuario, new.username, {local.format('new')});"
+            )
+            borrar = f"DELETE FROM {cls.TABLA_FTS} WHERE id_usuario = old.id_usuario;"
+            conexion.execute(text(f"CREATE TRIGGER {cls.TABLA_FTS}_ai AFTER INSERT ON usuario BEGIN {insertar} END"))
+            conexion.execute(text(f"CREATE TRIGGER {cls.TABLA_FTS}_ad AFTER DELETE ON usuario BEGIN {borrar} END"))
+            conexion.execute(text(
+                f"CREATE TRIGGER {cls.TABLA_FTS}_au AFTER UPDATE OF username, correo ON usuario "
+                f"BEGIN {borrar} {insertar} END"
+            ))
+            return 'fts5'
+        if dialecto in ('mysql', 'mariadb'):
+            conexion.execute(text(f'CREATE FULLTEXT INDEX {cls.INDICE_FULLTEXT} ON usuario (username, correo)'))
+            return 'fulltext'
+        return 'ngram'
+
+    @classmethod
+    def reconstruir(cls, conexion, backend, lote=5000):
+        """Regenera el índice del backend desde la tabla usuario; devuelve los usuarios indexados"""
+        if backend == 'fts5':
+            conexion.execute(text(f'DELETE FROM {cls.TABLA_FTS}'))
+            return conexion.execute(text(
+                f"INSERT INTO {cls.TABLA_FTS}(id_usuario, username, correo) "
+                f"SELECT id_usuario, username, substr(correo, 1, instr(correo || '@', '@') - 1) FROM usuario"
+            )).rowcount
+        if backend != 'ngram':
+            return 0  # FULLTEXT lo mantiene la propia base
+
+        conexion.execute(delete(UsuarioNgrama.__table__))
+        total = 0
+        ultimo = ''
+        while True:
+            usuarios = conexion.execute(
+                select(Usuario.id_usuario, Usuario.username, Usuario.correo)
+                .where(Usuario.id_usuario > ultimo).order_by(Usuario.id_usuario).limit(lote)
+            ).all()
+            if not usuarios:
+                return total
+            filas = [
+                {'ngrama': ngrama, 'id_usuario': u.id_usuario}
+                for u in usuarios for ngrama in cls.ngramas_usuario(u.username, u.correo)
+            ]
+            if filas:
+                conexion.execute(insert(UsuarioNgrama.__table__), filas)
+            total += len(usuarios)
+            ultimo = usuarios[-1].id_usuario
+
+    @classmethod
+    def ngramas_usuario(cls, username, correo):
+        return trigramas(username or '') | trigramas((correo or '').split('@', 1)[0])
+
+    @classmethod
+    def _buscar_prefijo(cls, termino, limite):
+        # Rango en lugar de LIKE para usar índices en cualquier base. En minúsculas, como el
+        # término, sobre los índices lower(); en MySQL/MariaDB la intercalación _ci ya ignora
+        # las mayúsculas y se usan los índices únicos
+        username, correo = Usuario.username, Usuario.correo
+        if db.session.get_bind().dialect.name not in ('mysql', 'mariadb'):
+            username, correo = func.lower(username), func.lower(correo)
+        fin = termino + '\uffff'
+        return list(db.session.scalars(
+            select(Usuario.id_usuario).where(or_(
+                and_(username >= termino, username < fin),
+                and_(correo >= termino, correo < fin)
+            )).order_by(Usuario.username).limit(limite)
+        ))
+
+    @classmethod
+    def _buscar_fts5(cls, termino, limite):
+        frase = '"' + termino.replace('"', '""') + '"'
+        return list(db.session.scalars(text(
+            f"SELECT id_usuario FROM {cls.TABLA_FTS} WHERE {cls.TABLA_FTS} MATCH :frase "
+            f"ORDER BY CASE WHEN lower(username) = :termino THEN 0 "
+            f"WHEN lower(username) LIKE :prefijo ESCAPE '\\' THEN 1 ELSE 2 END, "
+            f"bm25({cls.TABLA_FTS}, 0, 10.0, 1.0) LIMIT :limite"
+        ), {'frase': frase, 'termino': termino, 'prefijo': _escapar_like(termino) + '%', 'limite': limite}))
+
+    @classmethod
+    def _buscar_fulltext(cls, termino, limite):
+        # Modo booleano con prefijo por palabra; se quitan los operadores del término
+        palabras = [p for p in ''.join(c if c.isalnum() else ' ' for c in termino).split() if p]
+        if not palabras:
+            return []
+        consulta = ' '.join(f'+{p}*' for p in palabras)
+        return list(db.session.scalars(text(
+            f"SELECT id_usuario FROM usuario "
+            f"WHERE MATCH(username, correo) AGAINST (:consulta IN BOOLEAN MODE) "
+            f"ORDER BY (username = :termino) DESC, MATCH(username, correo) AGAINST (:consulta IN BOOLEAN MODE) DESC "
+            f"LIMIT :limite"
+        ), {'consulta': consulta, 'termino': termino, 'limite': limite}))
+
+    @classmethod
+    def _buscar_ngram(cls, termino, limite):
+        gramas = trigramas(termino)
+        candidatos = select(UsuarioNgrama.id_usuario).where(
+            UsuarioNgrama.ngrama.in_(gramas)
+        ).group_by(UsuarioNgrama.id_usuario).having(func.count() == len(gramas)).subquery()
+
+        username = func.lower(Usuario.username)
+        relevancia = case(
+            (username == termino, 0),
+            (username.startswith(termino, autoescape=True), 1),
+            (func.lower(Usuario.correo).startswith(termino, autoescape=True), 2),
+            else_=3
+        )
+        return list(db.session.scalars(
+            select(Usuario.id_usuario)
+            .join(candidatos, candidatos.c.id_usuario == Usuario.id_usuario)
+            # Los trigramas pueden coincidir sin formar la subcadena: se confirma sobre los candidatos
+            .where(or_(username.contains(termino, autoescape=True),
+                       func.lower(Usuario.correo).contains(termino, autoescape=True)))
+            .order_by(relevancia, func.length(Usuario.username), Usuario.username)
+            .limit(limite)
+        ))
+
+    @classmethod
+    def _cargar(cls, ids, resumen):
+        if not ids:
+            return []
+        query = Usuario.query.filter(Usuario.id_usuario.in_(ids))
+        if resumen:
+            query = query.options(load_only(Usuario.id_usuario, Usuario.username, Usuario.activo, Usuario.avatar_url))
+        por_id = {usuario.id_usuario: usuario for usuario in query}
+        return [por_id[i] for i in ids if i in por_id]
+
+    @classmethod
+    def _indexar(cls, conexion, id_usuario, username, correo):
+        conexion.execute(delete(UsuarioNgrama.__table__).where(UsuarioNgrama.id_usuario == id_usuario))
+        filas = [{'ngrama': n, 'id_usuario': id_usuario} for n in cls.ngramas_usuario(username, correo)]
+        if filas:
+            conexion.execute(insert(UsuarioNgrama.__table__), filas)
+
+    @classmethod
+    def _usa_ngram(cls, conexion):
+        return has_app_context() and cls.backend(conexion) == 'ngram'
+
+
+def trigramas(texto):
+    texto = texto.lower()
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _escapar_like(valor):
+    return valor.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+# El índice portable se mantiene en la misma transacción que el cambio del usuario
+@event.listens_for(Usuario, 'after_insert')
+def _indexar_usuario_nuevo(mapper, conexion, usuario):
+    if BusquedaUsuariosService._usa_ngram(conexion):
+        BusquedaUsuariosService._indexar(conexion, usuario.id_usuario, usuario.username, usuario.correo)
+
+
+@event.listens_for(Usuario, 'after_update')
+def _reindexar_usuario(mapper, conexion, usuario):
+    estado = inspect(usuario)
+    if (estado.attrs.username.history.has_changes() or estado.attrs.correo.history.has_changes()) \
+            and BusquedaUsuariosService._usa_ngram(conexion):
+        BusquedaUsuariosService._indexar(conexion, usuario.id_usuario, usuario.username, usuario.correo)
+
+
+@event.listens_for(Usuario, 'before_delete')
+def _desindexar_usuario(mapper, conexion, usuario):
+    if BusquedaUsuariosService._usa_ngram(conexion):
+        conexion.execute(delete(UsuarioNgrama.__table__).where(UsuarioNgrama.id_usuario == usuario.id_usuario))
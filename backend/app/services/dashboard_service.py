@@ -0,0 +1,359 @@
+# services/dashboard_service.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from flask import current_app
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import joinedload
+
+from app.models import db, Progreso, Sesion, Tarea, Tecnica
+from app.services.parametro_service import ParametroService
+from app.services.progreso_service import ProgresoService
+from app.services.tecnica_service import TecnicaService
+from app.services.version_service import VersionService
+from app.utils.cache import obtener_cache
+from app.utils.pagination import decodificar_cursor, paginar
+
+
+class DashboardService:
+    """Datos de la página de Concentración en una sola petición.
+
+    Cada sección se deriva de unos pocos conjuntos intermedios compartidos (agregados de
+    sesiones, días de progreso, totales, página de sesiones y técnicas populares) que solo
+    se consultan si alguna sección pedida los necesita. Con DASHBOARD_PARALELO las consultas
+    de esos conjuntos se lanzan a la vez, cada una con su propia conexión.
+
+    El resultado se guarda por usuario durante DASHBOARD_TTL_SEGUNDOS bajo las versiones de
+    sus colecciones (VersionService): cualquier escritura confirmada sobre sus sesiones,
+    tareas o progreso cambia la clave y la copia anterior deja de usarse.
+    """
+
+    # Sección -> conjuntos intermedios que necesita
+    SECCIONES = {
+        'estadisticas_sesiones': ('agregados_sesiones',),
+        'sesiones': ('sesiones_recientes',),
+        'semana': ('dias_progreso',),
+        'mes': ('dias_progreso',),
+        'tecnicas_populares': ('tecnicas_populares',),
+        'estadisticas_generales': ('agregados_sesiones', 'dias_progreso', 'totales_progreso'),
+    }
+    DIAS_RACHA = 30
+    TECNICAS_POPULARES = 10
+    CLAVE_POPULARES = 'dashboard:tecnicas_populares'
+    COLECCIONES = ('sesiones', 'tareas', 'progreso', 'tecnicas')
+
+    @classmethod
+    def construir(cls, usuario_id, secciones=None, año=None, mes=None, sesiones_limite=None, cursor=None):
+        """Devuelve {sección: datos} para las secciones pedidas (todas por defecto).
+
+        Lanza ValueError si alguna sección o parámetro no es válido.
+        """
+        secciones = cls._validar_secciones(secciones)
+        hoy = date.today()
+        año = int(año or hoy.year)
+        mes = int(mes or hoy.month)
+        if not 1 <= mes <= 12:
+            raise ValueError('mes debe estar entre 1 y 12')
+        maximo = current_app.config.get('PAGINACION_LIMITE_MAXIMO', 200)
+        sesiones_limite = int(sesiones_limite or current_app.config.get('DASHBOARD_SESIONES_LIMITE', 10))
+        if sesiones_limite < 1:
+            raise ValueError('sesiones_limit debe ser mayor que 0')
+        sesiones_limite = min(sesiones_limite, maximo)
+        cursor = decodificar_cursor(cursor)
+
+        cache = obtener_cache()
+        clave = ':'.join(str(parte) for parte in (
+            'dashboard', usuario_id, cls._version(usuario_id), ','.join(secciones),
+            hoy.isoformat(), año, mes, sesiones_limite, cursor
+        ))
+        resultado = cache.get(clave)
+        if resultado is not None:
+            return resultado
+
+        rangos = cls._rangos(hoy, año, mes)
+        cargadores = {
+            'agregados_sesiones': lambda: cls._agregados_sesiones(usuario_id),
+            'dias_progreso': lambda: cls._dias_progreso(usuario_id, rangos),
+            'totales_progreso': lambda: cls._totales_progreso(usuario_id),
+            'sesiones_recientes': lambda: cls._sesiones_recientes(usuario_id, sesiones_limite, cursor),
+            'tecnicas_populares': cls._tecnicas_populares,
+        }
+        necesarios = list(dict.fromkeys(c for s in secciones for c in cls.SECCIONES[s]))
+        datos = cls._cargar({nombre: cargadores[nombre] for nombre in necesarios})
+
+        constructores = {
+            'estadisticas_sesiones': lambda: cls._estadisticas_sesiones(datos),
+            'sesiones': lambda: datos['sesiones_recientes'],
+            'semana': lambda: cls._semana(usuario_id, datos, rangos),
+            'mes': lambda: cls._mes(datos, año, mes, rangos),
+            'tecnicas_populares': lambda: datos['tecnicas_populares'],
+            'estadisticas_generales': lambda: cls._estadisticas_generales(datos, hoy),
+        }
+        resultado = {seccion: constructores[seccion]() for seccion in secciones}
+        cache.set(clave, resultado, ttl=current_app.config.get('DASHBOARD_TTL_SEGUNDOS', 30))
+        return resultado
+
+    @classmethod
+    def _validar_secciones(cls, secciones):
+        if not secciones:
+            return list(cls.SECCIONES)
+        desconocidas = [s for s in secciones if s not in cls.SECCIONES]
+        if desconocidas:
+            raise ValueError(
+                f"Secciones no válidas: {', '.join(desconocidas)}. "
+                f"Disponibles: {', '.join(cls.SECCIONES)}"
+            )
+        return list(dict.fromkeys(secciones))
+
+    @classmethod
+    def _version(cls, usuario_id):
+        versiones, _ = VersionService.versiones(usuario_id, cls.COLECCIONES)
+        return '.'.join(str(versiones[c]) for c in cls.COLECCIONES)
+
+    @classmethod
+    def _cargar(cls, cargadores):
+        """Ejecuta los cargadores en serie o, con DASHBOARD_PARALELO, en el pool del proceso"""
+        if len(cargadores) < 2 or not current_app.config.get('DASHBOARD_PARALELO'):
+            return {nombre: cargar() for nombre, cargar in cargadores.items()}
+
+        app = current_app._get_current_object()
+        pool = app.extensions.get('synapse_dashboard_pool')
+        if pool is None:
+            pool = app.extensions.setdefault('synapse_dashboard_pool', ThreadPoolExecutor(
+                max_workers=app.config.get('DASHBOARD_WORKERS', 4), thread_name_prefix='dashboard'
+            ))
+
+        def en_contexto(cargar):
+            # Contexto propio: sesión y conexión propias, liberadas al salir
+            with app.app_context():
+                return cargar()
+
+        futuros = {nombre: pool.submit(en_contexto, cargar) for nombre, cargar in cargadores.items()}
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+    # Conjuntos intermedios (devuelven datos planos, sin objetos ligados a la sesión)
+
+    @classmethod
+    def _agregados_sesiones(cls, usuario_id):
+        """Sesiones del usuario agrupadas por (técnica, estado) en una consulta"""
+        filas = db.session.query(
+            Sesion.tecnica_id, Sesion.estado,
+            func.count(Sesion.id_sesion),
+            func.coalesce(func.sum(Sesion.duracion_real), 0),
+            func.count(Sesion.duracion_real)
+        ).filter(Sesion.usuario_id == usuario_id).group_by(Sesion.tecnica_id, Sesion.estado).all()
+        return [
+            {'tecnica_id': t, 'estado': e, 'total': int(n), 'minutos': int(m), 'con_duracion': int(d)}
+            for t, e, n, m, d in filas
+        ]
+
+    @classmethod
+    def _dias_progreso(cls, usuario_id, rangos):
+        """Días de progreso de la semana, el mes pedido y los últimos días de la racha"""
+        filas = Progreso.query.filter(
+            Progreso.usuario_id == usuario_id,
+            or_(*[Progreso.fecha.between(desde, hasta) for desde, hasta in rangos.values()])
+        ).order_by(Progreso.fecha).all()
+        return [p.to_dict() for p in filas]
+
+    @classmethod
+    def _totales_progreso(cls, usuario_id):
+        """Totales del rollup, tareas creadas y mejor día"""
+        total_tareas = select(func.count(Tarea.id_tarea)).where(Tarea.usuario_id == usuario_id).scalar_subquery()
+        fila = db.session.query(
+            func.coalesce(func.sum(Progreso.sesiones_realizadas), 0),
+            func.coalesce(func.sum(Progreso.minutos_estudio), 0),
+            func.coalesce(func.sum(Progreso.tareas_completadas), 0),
+            func.count(Progreso.id_progreso),
+            total_tareas
+        ).filter(Progreso.usuario_id == usuario_id).one()
+        mejor_dia = db.session.query(Progreso.fecha, Progreso.minutos_estudio).filter(
+            Progreso.usuario_id == usuario_id
+        ).order_by(Progreso.minutos_estudio.desc()).first()
+
+        sesiones, minutos, tareas_completadas, dias, tareas = (int(v or 0) for v in fila)
+        return {
+            'sesiones': sesiones, 'minutos': minutos, 'tareas_completadas': tareas_completadas,
+            'dias': dias, 'tareas': tareas,
+            'mejor_dia': {
+                'fecha': mejor_dia.fecha.isoformat() if mejor_dia else None,
+                'minutos': mejor_dia.minutos_estudio if mejor_dia else 0
+            }
+        }
+
+    @classmethod
+    def _sesiones_recientes(cls, usuario_id, limite, cursor):
+        """Primera página de /sesiones (o la del cursor) con técnica y parámetros"""
+        query = ParametroService.con_parametros(
+            Sesion.query.filter_by(usuario_id=usuario_id).options(joinedload(Sesion.tecnica_sesion))
+        )
+        sesiones, siguiente = paginar(query, Sesion.fecha_inicio, Sesion.id_sesion, limite, cursor)
+
+        items = []
+        for sesion in sesiones:
+            sesion_dict = sesion.to_dict()
+            if sesion.tecnica_sesion:
+                sesion_dict['tecnica'] = sesion.tecnica_sesion.to_dict()
+            sesion_dict['parametros'] = [param.to_dict() for param in sesion.parametros]
+            items.append(sesion_dict)
+        return {'items': items, 'siguiente_cursor': siguiente}
+
+    @classmethod
+    def _tecnicas_populares(cls):
+        """Ranking global de técnicas: igual para todos los usuarios, se cachea aparte"""
+        cache = obtener_cache()
+        populares = cache.get(cls.CLAVE_POPULARES)
+        if populares is None:
+            filas = db.session.query(
+                Tecnica, func.count(Sesion.id_sesion).label('total_sesiones')
+            ).outerjoin(Sesion).group_by(Tecnica.id_tecnica).order_by(
+                db.desc('total_sesiones')
+            ).limit(cls.TECNICAS_POPULARES).all()
+            populares = [dict(tecnica.to_dict(), total_sesiones=total) for tecnica, total in filas]
+            cache.set(cls.CLAVE_POPULARES, populares, ttl=current_app.config.get('DASHBOARD_TTL_SEGUNDOS', 30))
+        return populares
+
+    # Secciones
+
+    @classmethod
+    def _estadisticas_sesiones(cls, datos):
+        """Mismo formato que /sesiones/estadisticas"""
+        agregados = datos['agregados_sesiones']
+        completadas = [a for a in agregados if a['estado'] == 'Completado']
+        tiempo_total = sum(a['minutos'] for a in completadas)
+        con_duracion = sum(a['con_duracion'] for a in completadas)
+
+        por_tecnica = {}
+        for a in agregados:
+            tecnica = TecnicaService.por_id(a['tecnica_id'])
+            if not tecnica:
+                continue
+            fila = por_tecnica.setdefault(a['tecnica_id'], {
+                'tecnica': tecnica['nombre'], 'total_sesiones': 0, 'tiempo_total_minutos': 0
+            })
+            fila['total_sesiones'] += a['total']
+            fila['tiempo_total_minutos'] += a['minutos']
+
+        return {
+            'total_sesiones': sum(a['total'] for a in agregados),
+            'sesiones_completadas': sum(a['total'] for a in completadas),
+            'tiempo_total_minutos': tiempo_total,
+            'tiempo_total_horas': round(tiempo_total / 60, 2),
+            'promedio_duracion_minutos': round(tiempo_total / con_duracion, 2) if con_duracion else 0,
+            'sesiones_por_tecnica': list(por_tecnica.values())
+        }
+
+    @classmethod
+    def _semana(cls, usuario_id, datos, rangos):
+        """Mismo formato que /progreso/semana"""
+        inicio_semana, fin_semana = rangos['semana']
+        por_fecha = {d['fecha']: d for d in datos['dias_progreso']}
+        dias = []
+        for i in range(7):
+            fecha = (inicio_semana + timedelta(days=i)).isoformat()
+            dias.append(por_fecha.get(fecha) or {
+                'progreso_id': None,
+                'usuario_id': usuario_id,
+                'fecha': fecha,
+                'minutos_estudio': 0,
+                'tareas_completadas': 0,
+                'sesiones_realizadas': 0
+            })
+
+        total_minutos = sum(d['minutos_estudio'] for d in dias)
+        return {
+            'inicio_semana': inicio_semana.isoformat(),
+            'fin_semana': fin_semana.isoformat(),
+            'dias': dias,
+            'totales': {
+                'minutos_estudio': total_minutos,
+                'horas_estudio': round(total_minutos / 60, 2),
+                'tareas_completadas': sum(d['tareas_completadas'] for d in dias),
+                'sesiones_realizadas': sum(d['sesiones_realizadas'] for d in dias)
+            }
+        }
+
+    @classmethod
+    def _mes(cls, datos, año, mes, rangos):
+        """Mismo formato que /progreso/mes"""
+        primer_dia, ultimo_dia = rangos['mes']
+        desde, hasta = primer_dia.isoformat(), ultimo_dia.isoformat()
+        dias = [d for d in datos['dias_progreso'] if desde <= d['fecha'] <= hasta]
+
+        total_minutos = sum(d['minutos_estudio'] for d in dias)
+        dias_en_mes = (ultimo_dia - primer_dia).days + 1
+        return {
+            'año': año,
+            'mes': mes,
+            'primer_dia': desde,
+            'ultimo_dia': hasta,
+            'progreso_diario': dias,
+            'estadisticas': {
+                'total_minutos': total_minutos,
+                'total_horas': round(total_minutos / 60, 2),
+                'total_tareas': sum(d['tareas_completadas'] for d in dias),
+                'total_sesiones': sum(d['sesiones_realizadas'] for d in dias),
+                'dias_activos': len([d for d in dias if d['minutos_estudio'] > 0 or d['sesiones_realizadas'] > 0]),
+                'dias_en_mes': dias_en_mes,
+                'promedio_minutos_dia': round(total_minutos / dias_en_mes, 2),
+                'racha_dias': ProgresoService.racha_maxima(_Dia.lista(dias))
+            }
+        }
+
+    @classmethod
+    def _estadisticas_generales(cls, datos, hoy):
+        """Mismo formato que /progreso/estadisticas-generales"""
+        totales = datos['totales_progreso']
+        recientes = _Dia.lista(d for d in datos['dias_progreso'] if d['fecha'] <= hoy.isoformat())
+
+        # Técnica más usada a partir de los mismos agregados de sesiones
+        por_tecnica = {}
+        for a in datos['agregados_sesiones']:
+            if a['tecnica_id']:
+                por_tecnica[a['tecnica_id']] = por_tecnica.get(a['tecnica_id'], 0) + a['total']
+        favorita = TecnicaService.por_id(max(por_tecnica, key=por_tecnica.get)) if por_tecnica else None
+
+        sesiones, minutos, tareas = totales['sesiones'], totales['minutos'], totales['tareas']
+        return {
+            'sesiones': {
+                'total': sesiones,
+                'tiempo_total_minutos': minutos,
+                'tiempo_total_horas': round(minutos / 60, 2),
+                'promedio_duracion': round(minutos / sesiones, 2) if sesiones > 0 else 0
+            },
+            'tareas': {
+                'total': tareas,
+                'completadas': totales['tareas_completadas'],
+                'porcentaje_completadas': round((totales['tareas_completadas'] / tareas) * 100, 2) if tareas > 0 else 0
+            },
+            'racha_dias_actual': ProgresoService.racha_actual(recientes, hoy),
+            'mejor_dia': totales['mejor_dia'],
+            'tecnica_favorita': favorita['nombre'] if favorita else None,
+            'total_dias_registrados': totales['dias']
+        }
+
+    @classmethod
+    def _rangos(cls, hoy, año, mes):
+        inicio_semana = hoy - timedelta(days=hoy.weekday())
+        primer_dia = date(año, mes, 1)
+        ultimo_dia = (date(año + 1, 1, 1) if mes == 12 else date(año, mes + 1, 1)) - timedelta(days=1)
+        return {
+            'semana': (inicio_semana, inicio_semana + timedelta(days=6)),
+            'mes': (primer_dia, ultimo_dia),
+            'racha': (hoy - timedelta(days=cls.DIAS_RACHA - 1), hoy),
+        }
+
+
+class _Dia:
+    """Vista mínima de un día serializado para las funciones de racha de ProgresoService"""
+
+    __slots__ = ('fecha', 'minutos_estudio', 'sesiones_realizadas')
+
+    def __init__(self, dia):
+        self.fecha = date.fromisoformat(dia['fecha'])
+        self.minutos_estudio = dia['minutos_estudio']
+        self.sesiones_realizadas = dia['sesiones_realizadas']
+
+    @classmethod
+    def lista(cls, dias):
+        return [cls(d) for d in dias]
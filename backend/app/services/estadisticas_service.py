@@ -0,0 +1,133 @@
+# services/estadisticas_service.py
+from app.models import db, Tarea
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, func
+
+class EstadisticasTareasService:
+
+    # Claves de la respuesta -> valor de Tarea.estado
+    ESTADOS = {
+        'pendientes': 'Pendiente',
+        'en_progreso': 'EnProgreso',
+        'en_espera': 'EnEspera',
+        'completadas': 'Completado'
+    }
+    PRIORIDADES = ['alta', 'media', 'baja']
+    MESES_ACTIVIDAD = 3
+    MARCA_ANTICIPADA = '%días antes de tiempo%'
+
+    @classmethod
+    def contadores(cls, usuario_id, hoy=None):
+        """Calcula todos los contadores de tareas del usuario en una sola consulta"""
+
+        hoy = hoy or date.today()
+        completada = Tarea.estado == 'Completado'
+
+        columnas = [func.count(Tarea.id_tarea).label('total')]
+        for clave, estado in cls.ESTADOS.items():
+            columnas.append(cls._contar(Tarea.estado == estado, clave))
+        for prioridad in cls.PRIORIDADES:
+            columnas.append(cls._contar(Tarea.prioridad == prioridad, f'prioridad_{prioridad}'))
+
+        columnas.append(cls._contar(~completada & (Tarea.fecha_vencimiento < hoy), 'vencidas'))
+        columnas.append(cls._contar(Tarea.fecha_vencimiento == hoy, 'hoy'))
+        columnas.append(cls._contar(completada & Tarea.comentario.like(cls.MARCA_ANTICIPADA), 'anticipadas'))
+
+        # Semana actual (lunes a domingo)
+        inicio_semana = hoy - timedelta(days=hoy.weekday())
+        en_semana = cls._entre(inicio_semana, inicio_semana + timedelta(days=7))
+        columnas.append(cls._contar(en_semana, 'semana_creadas'))
+        columnas.append(cls._contar(en_semana & completada, 'semana_completadas'))
+
+        # Actividad de los últimos meses (creadas / completadas por mes)
+        meses = cls._ultimos_meses(hoy, cls.MESES_ACTIVIDAD)
+        for i, (año, mes) in enumerate(meses):
+            en_mes = cls._entre(*cls._rango_mes(año, mes))
+            columnas.append(cls._contar(en_mes, f'mes_{i}_creadas'))
+            columnas.append(cls._contar(en_mes & completada, f'mes_{i}_completadas'))
+
+        fila = db.session.query(*columnas).filter(Tarea.usuario_id == usuario_id).one()
+        valores = {clave: int(valor or 0) for clave, valor in fila._mapping.items()}
+
+        resultado = {'total': valores['total']}
+        for clave in cls.ESTADOS:
+            resultado[clave] = valores[clave]
+        resultado['por_prioridad'] = {p: valores[f'prioridad_{p}'] for p in cls.PRIORIDADES}
+        resultado['vencidas'] = valores['vencidas']
+        resultado['hoy'] = valores['hoy']
+        resultado['anticipadas'] = valores['anticipadas']
+        resultado['semana'] = {
+            'creadas': valores['semana_creadas'],
+            'completadas': valores['semana_completadas']
+        }
+        resultado['monthly'] = [
+            {
+                'year': año,
+                'month': mes,
+                'creadas': valores[f'mes_{i}_creadas'],
+                'completadas': valores[f'mes_{i}_completadas']
+            }
+            for i, (año, mes) in enumerate(meses)
+        ]
+        return resultado
+
+    @classmethod
+    def obtener_estadisticas(cls, usuario_id, hoy=None):
+        """Estadísticas completas para GET /api/tareas/estadisticas"""
+
+        hoy = hoy or date.today()
+        contadores = cls.contadores(usuario_id, hoy)
+
+        # Tareas recientes (últimos 5 días, ordenadas por fecha_creacion DESC)
+        hace_5_dias = datetime.combine(hoy - timedelta(days=5), datetime.min.time())
+        recientes = Tarea.query.filter(
+            Tarea.usuario_id == usuario_id,
+            Tarea.fecha_creacion >= hace_5_dias
+        ).order_by(Tarea.fecha_creacion.desc()).limit(5).all()
+
+        return {
+            'total': contadores['total'],
+            'pendientes': contadores['pendientes'],
+            'en_progreso': contadores['en_progreso'],
+            'en_espera': contadores['en_espera'],
+            'completadas': contadores['completadas'],
+            'por_prioridad': contadores['por_prioridad'],
+            'vencidas': contadores['vencidas'],
+            'hoy': contadores['hoy'],
+            'recientes': [t.to_dict() for t in recientes],
+            'monthly': contadores['monthly']
+        }
+
+    @staticmethod
+    def _contar(condicion, nombre):
+        """SUM(CASE WHEN condicion THEN 1 ELSE 0 END) etiquetado"""
+        return func.sum(case((condicion, 1), else_=0)).label(nombre)
+
+    @staticmethod
+    def _entre(desde, hasta):
+        """Condición de rango semiabierto [desde, hasta) sobre fecha_creacion"""
+        return (
+            (Tarea.fecha_creacion >= datetime.combine(desde, datetime.min.time())) &
+            (Tarea.fecha_creacion < datetime.combine(hasta, datetime.min.time()))
+        )
+
+    @staticmethod
+    def _rango_mes(año, mes):
+        """Primer día del mes y primer día del mes siguiente"""
+        primer_dia = date(año, mes, 1)
+        if mes == 12:
+            return primer_dia, date(año + 1, 1, 1)
+        return primer_dia, date(año, mes + 1, 1)
+
+    @staticmethod
+    def _ultimos_meses(hoy, cantidad):
+        """Lista de (año, mes) desde el mes actual hacia atrás"""
+        meses = []
+        año, mes = hoy.year, hoy.month
+        for _ in range(cantidad):
+            meses.append((año, mes))
+            mes -= 1
+            if mes == 0:
+                mes = 12
+                año -= 1
+        return meses
@@ -0,0 +1,264 @@
+# services/evento_service.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app, g, has_request_context
+from sqlalchemy import and_, event, or_
+
+from app.models import db, EventoRecompensa
+from app.services.recompensa_service import RecompensaService
+from app.utils import generate_uuid
+
+
+class EventoService:
+    """Bandeja de salida de eventos de dominio que disparan la evaluación de recompensas.
+
+    Los servicios registran el evento en la misma transacción que el cambio que lo origina
+    y, tras el commit, se despacha según RECOMPENSAS_EVENTOS_MODO:
+      - 'thread': pool de hilos del propio proceso (por defecto)
+      - 'redis': cola en Redis consumida por app/scripts/worker_recompensas.py
+      - 'sync': al final de la misma petición (desarrollo y pruebas)
+    La tabla es la fuente de verdad: un evento que no llegó a despacharse sigue Pendiente y
+    lo recoge el siguiente lote. Reprocesar es seguro porque la evaluación parte del estado
+    actual del usuario y RecompensaUsuario no admite duplicados.
+    """
+
+    TIPOS = ('sesion_finalizada', 'pomodoro_ciclo', 'pomodoro_finalizado', 'meditacion_finalizada', 'tarea_completada')
+    COLA_REDIS = 'synapse:eventos_recompensa'
+    CLAVE_SESION = 'eventos_recompensa'
+    CLAVE_ESCUCHA = 'eventos_recompensa_escucha'
+
+    @classmethod
+    def emitir(cls, usuario_id, tipo, referencia_id=None):
+        """Registra el evento en la transacción actual; no hace commit. Devuelve su id"""
+        if tipo not in cls.TIPOS:
+            raise ValueError(f'Tipo de evento no válido: {tipo}')
+
+        evento = EventoRecompensa(
+            id_evento=generate_uuid(),
+            usuario_id=usuario_id,
+            tipo=tipo,
+            referencia_id=referencia_id,
+            estado='Pendiente',
+            intentos=0,
+            creado=datetime.utcnow()
+        )
+        db.session.add(evento)
+
+        sesion = db.session()
+        if not sesion.info.get(cls.CLAVE_ESCUCHA):
+            # Una vez por sesión; after_commit solo llega con la transacción externa
+            sesion.info[cls.CLAVE_ESCUCHA] = True
+            event.listen(sesion, 'after_commit', cls._tras_commit)
+            event.listen(sesion, 'after_soft_rollback', cls._tras_rollback)
+        sesion.info.setdefault(cls.CLAVE_SESION, []).append(evento.id_evento)
+        return evento.id_evento
+
+    @classmethod
+    def procesar_pendientes(cls, limite=None):
+        """Reclama un lote de eventos y evalúa las recompensas una vez por usuario.
+
+        Devuelve el número de eventos reclamados (0 si no quedaba ninguno).
+        """
+        limite = limite or current_app.config.get('RECOMPENSAS_EVENTOS_LOTE', 100)
+        eventos = cls._reclamar_lote(limite)
+        cls._procesar(eventos)
+        return len(eventos)
+
+    @classmethod
+    def procesar_todo(cls):
+        """Procesa lotes hasta vaciar la bandeja; devuelve el total de eventos tratados.
+
+        Para tras un lote formado solo por reintentos: si vuelven a fallar, seguir solo
+        gastaría sus intentos (los siguientes barridos del worker los recogen).
+        """
+        limite = current_app.config.get('RECOMPENSAS_EVENTOS_LOTE', 100)
+        total = 0
+        while True:
+            eventos = cls._reclamar_lote(limite)
+            if not eventos:
+                return total
+            cls._procesar(eventos)
+            total += len(eventos)
+            if all(evento['intentos'] > 1 for evento in eventos):
+                return total
+
+    @classmethod
+    def procesar_ids(cls, ids):
+        """Procesa solo los eventos indicados que sigan reclamables; devuelve cuántos trató"""
+        eventos = cls._reclamar_lote(len(ids), ids=ids)
+        cls._procesar(eventos)
+        return len(eventos)
+
+    @classmethod
+    def obtener_evento(cls, usuario_id, evento_id):
+        """Estado de un evento del usuario para el polling del cliente"""
+        return EventoRecompensa.query.filter_by(id_evento=evento_id, usuario_id=usuario_id).first()
+
+    @classmethod
+    def init_app(cls, app):
+        """En modo 'sync' procesa al final de la petición solo los eventos confirmados en ella"""
+        @app.after_request
+        def _procesar_eventos_sync(respuesta):
+            ids = g.pop('eventos_recompensa_sync', None)
+            if ids:
+                try:
+                    cls.procesar_ids(ids)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Error procesando eventos de recompensa')
+            return respuesta
+
+    @classmethod
+    def _procesar(cls, eventos):
+        """Evalúa las recompensas una vez por usuario; un fallo se reintenta con espera creciente"""
+        config = current_app.config
+        max_intentos = config.get('RECOMPENSAS_EVENTOS_MAX_INTENTOS', 5)
+        espera = config.get('RECOMPENSAS_EVENTOS_REINTENTO_SEGUNDOS', 300)
+
+        por_usuario = {}
+        for evento in eventos:
+            por_usuario.setdefault(evento['usuario_id'], []).append(evento)
+
+        for usuario_id, del_usuario in por_usuario.items():
+            try:
+                resultado = RecompensaService.verificar_todas_recompensas_usuario(usuario_id)
+                otorgadas = resultado['recompensas_otorgadas']
+                ahora = datetime.utcnow()
+                # Las recompensas nuevas se asocian al evento más reciente del usuario
+                for evento in del_usuario:
+                    cls._actualizar(evento['id_evento'], estado='Procesado', procesado=ahora, resultado={
+                        'recompensas_otorgadas': otorgadas if evento is del_usuario[-1] else []
+                    })
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.exception('Error evaluando recompensas de %s', usuario_id)
+                ahora = datetime.utcnow()
+                for evento in del_usuario:
+                    estado = 'Error' if evento['intentos'] >= max_intentos else 'Pendiente'
+                    cls._actualizar(evento['id_evento'], estado=estado, lote=None, resultado={'error': str(e)},
+                                    reintentar_desde=ahora + timedelta(seconds=evento['intentos'] * espera))
+                db.session.commit()
+
+    @classmethod
+    def _reclamar_lote(cls, limite, ids=None):
+        """Marca EnProceso un lote con un token propio para que otros workers no lo tomen.
+
+        Los Pendiente que ya fallaron esperan a reintentar_desde. También recupera eventos
+        EnProceso abandonados (worker caído) tras el plazo de reintento. Con ids, solo esos.
+        """
+        ahora = datetime.utcnow()
+        plazo = ahora - timedelta(seconds=current_app.config.get('RECOMPENSAS_EVENTOS_REINTENTO_SEGUNDOS', 300))
+        reclamables = or_(
+            and_(EventoRecompensa.estado == 'Pendiente',
+                 or_(EventoRecompensa.reintentar_desde.is_(None), EventoRecompensa.reintentar_desde <= ahora)),
+            and_(EventoRecompensa.estado == 'EnProceso', EventoRecompensa.reclamado < plazo)
+        )
+        if ids is not None:
+            reclamables = and_(EventoRecompensa.id_evento.in_(ids), reclamables)
+
+        ids = [
+            fila[0] for fila in db.session.query(EventoRecompensa.id_evento)
+            .filter(reclamables).order_by(EventoRecompensa.creado).limit(limite)
+        ]
+        if not ids:
+            return []
+
+        lote = generate_uuid()
+        db.session.query(EventoRecompensa).filter(
+            EventoRecompensa.id_evento.in_(ids), reclamables
+        ).update({
+            EventoRecompensa.estado: 'EnProceso',
+            EventoRecompensa.lote: lote,
+            EventoRecompensa.reclamado: ahora,
+            EventoRecompensa.intentos: EventoRecompensa.intentos + 1
+        }, synchronize_session=False)
+        db.session.commit()
+
+        filas = db.session.query(
+            EventoRecompensa.id_evento, EventoRecompensa.usuario_id, EventoRecompensa.intentos
+        ).filter(EventoRecompensa.lote == lote).order_by(EventoRecompensa.creado).all()
+        return [{'id_evento': f[0], 'usuario_id': f[1], 'intentos': f[2]} for f in filas]
+
+    @staticmethod
+    def _actualizar(evento_id, **valores):
+        db.session.query(EventoRecompensa).filter(
+            EventoRecompensa.id_evento == evento_id
+        ).update(valores, synchronize_session=False)
+
+    @classmethod
+    def _tras_commit(cls, sesion):
+        ids = sesion.info.pop(cls.CLAVE_SESION, None)
+        if ids:
+            cls._despachar(ids)
+
+    @classmethod
+    def _tras_rollback(cls, sesion, transaccion_anterior):
+        # Deshacer un SAVEPOINT (begin_nested) no descarta los eventos de la transacción externa
+        if transaccion_anterior.parent is None:
+            sesion.info.pop(cls.CLAVE_SESION, None)
+
+    @classmethod
+    def _despachar(cls, ids):
+        """Avisa al worker de que hay eventos nuevos (sin usar la sesión recién confirmada)"""
+        modo = current_app.config.get('RECOMPENSAS_EVENTOS_MODO', 'thread')
+        if modo == 'sync':
+            # Solo los de esta petición: la bandeja del resto de usuarios no es asunto suyo
+            if has_request_context():
+                g.setdefault('eventos_recompensa_sync', []).extend(ids)
+        elif modo == 'redis':
+            try:
+                cls._cliente_redis().rpush(cls.COLA_REDIS, *ids)
+            except Exception:
+                # Quedan Pendiente en la tabla: el barrido periódico del worker los recoge
+                current_app.logger.warning('No se pudieron encolar %d eventos en Redis', len(ids), exc_info=True)
+        else:
+            _PoolEventos.de(current_app._get_current_object()).programar()
+
+    @staticmethod
+    def _cliente_redis():
+        cliente = current_app.extensions.get('synapse_eventos_redis')
+        if cliente is None:
+            import redis
+            cliente = redis.Redis.from_url(current_app.config['RECOMPENSAS_EVENTOS_REDIS_URL'])
+            current_app.extensions['synapse_eventos_redis'] = cliente
+        return cliente
+
+
+class _PoolEventos:
+    """Pool de hilos del proceso; agrupa los avisos para no encolar una tarea por evento"""
+
+    def __init__(self, app):
+        self.app = app
+        self._ejecutor = ThreadPoolExecutor(
+            max_workers=app.config.get('RECOMPENSAS_EVENTOS_WORKERS', 2),
+            thread_name_prefix='eventos-recompensa'
+        )
+        self._lock = threading.Lock()
+        self._programada = False
+
+    @classmethod
+    def de(cls, app):
+        pool = app.extensions.get('synapse_eventos_pool')
+        if pool is None:
+            pool = app.extensions.setdefault('synapse_eventos_pool', cls(app))
+        return pool
+
+    def programar(self):
+        with self._lock:
+            if self._programada:
+                return
+            self._programada = True
+        self._ejecutor.submit(self._ejecutar)
+
+    def _ejecutar(self):
+        with self._lock:
+            self._programada = False
+        with self.app.app_context():
+            try:
+                EventoService.procesar_todo()
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception('Error procesando eventos de recompensa')
@@ -1,5 +1,9 @@
 # services/meditacion_service.py
-from app.models import db, Sesion, Tecnica, SesionTecnicaParam
+from app.models import db, Sesion, SesionTecnicaParam
+from app.services.evento_service import EventoService
+from app.services.progreso_service import ProgresoService
+from app.services.parametro_service import ParametroService
+from app.services.tecnica_service import TecnicaService
 from datetime import datetime
 
 class MeditacionService:
@@ -30,22 +34,16 @@ class MeditacionService:
             raise ValueError("Tipo de meditación no válido")
         
         # Obtener o crear técnica Meditación
-        tecnica_meditacion = Tecnica.query.filter_by(nombre='Meditación').first()
-        if not tecnica_meditacion:
-            tecnica_meditacion = Tecnica(
-                nombre='Meditación',
-                categoria='bienestar'
-            )
-            db.session.add(tecnica_meditacion)
-            db.session.flush()
+        tecnica_meditacion_id = TecnicaService.obtener_o_crear('Meditación', 'bienestar')
         
         # Crear sesión
         nueva_sesion = Sesion(
             usuario_id=usuario_id,
-            tecnica_id=tecnica_meditacion.tecnica_id,
-            inicio=datetime.utcnow(),
+            tecnica_id=tecnica_meditacion_id,
+            fecha_inicio=datetime.utcnow(),
             es_grupal=False,
-            estado='EnEjecucion'
+            estado='EnEjecucion',
+            duracion_real=0
         )
         
         db.session.add(nueva_sesion)
@@ -60,9 +58,9 @@ class MeditacionService:
         
         for param in parametros:
             sesion_param = SesionTecnicaParam(
-                sesion_id=nueva_sesion.sesion_id,
-                codigo=param['codigo'],
-                cantidad=param['cantidad']
+                id_sesion=nueva_sesion.id_sesion,
+                parametro=param['codigo'],
+                valor=param['cantidad']
             )
             db.session.add(sesion_param)
         
@@ -75,7 +73,7 @@ class MeditacionService:
         """Finaliza una sesión de meditación"""
         
         sesion = Sesion.query.filter_by(
-            sesion_id=sesion_id,
+            id_sesion=sesion_id,
             usuario_id=usuario_id,
             estado='EnEjecucion'
         ).first()
@@ -84,26 +82,27 @@ class MeditacionService:
             raise ValueError("Sesión no encontrada o no está en ejecución")
         
         ahora = datetime.utcnow()
-        duracion_real = int((ahora - sesion.inicio).total_seconds() / 60)
+        duracion_real = int((ahora - sesion.fecha_inicio).total_seconds() / 60)
         
         # Actualizar sesión
-        sesion.fin = ahora
+        sesion.fecha_fin = ahora
         sesion.duracion_real = duracion_real
         sesion.estado = 'Completado' if completada else 'Cancelado'
         
         # Agregar calificación si se proporciona
         if calificacion is not None and 1 <= calificacion <= 5:
-            calificacion_param = SesionTecnicaParam(
-                sesion_id=sesion_id,
-                codigo='calificacion',
-                cantidad=str(calificacion)
-            )
-            db.session.add(calificacion_param)
+            ParametroService.asignar(sesion, 'calificacion', calificacion)
+        
+        ProgresoService.registrar_sesion(sesion)
         
+        # Solo una sesión completada puede otorgar recompensas
+        evento_id = None
+        if completada:
+            evento_id = EventoService.emitir(usuario_id, 'meditacion_finalizada', sesion.id_sesion)
         db.session.commit()
         
         # Obtener parámetros para la respuesta
-        parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+        parametros = ParametroService.como_dict(sesion)
         duracion_planificada = int(parametros.get('duracion_planificada', 0))
         tipo_meditacion = parametros.get('tipo_meditacion', 'mindfulness')
         
@@ -115,7 +114,8 @@ class MeditacionService:
             'duracion_real': duracion_real,
             'tipo_meditacion': tipo_meditacion,
             'calificacion': calificacion,
-            'porcentaje_completado': round((duracion_real / duracion_planificada) * 100, 2) if duracion_planificada > 0 else 0
+            'porcentaje_completado': round((duracion_real / duracion_planificada) * 100, 2) if duracion_planificada > 0 else 0,
+            'evento_id': evento_id
         }
     
     @classmethod
@@ -128,23 +128,23 @@ class MeditacionService:
         """Obtiene el historial de meditaciones del usuario"""
         
         # Obtener técnica de meditación
-        tecnica_meditacion = Tecnica.query.filter_by(nombre='Meditación').first()
+        tecnica_meditacion = TecnicaService.por_nombre('Meditación')
         if not tecnica_meditacion:
             return []
         
-        sesiones = Sesion.query.filter_by(
+        sesiones = ParametroService.con_parametros(Sesion.query.filter_by(
             usuario_id=usuario_id,
-            tecnica_id=tecnica_meditacion.tecnica_id
-        ).order_by(Sesion.inicio.desc()).limit(limite).all()
+            tecnica_id=tecnica_meditacion['id_tecnica']
+        )).order_by(Sesion.fecha_inicio.desc()).limit(limite).all()
         
         historial = []
         for sesion in sesiones:
-            parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+            parametros = ParametroService.como_dict(sesion)
             
             historial.append({
-                'sesion_id': sesion.sesion_id,
-                'fecha': sesion.inicio.date().isoformat(),
-                'hora_inicio': sesion.inicio.time().strftime('%H:%M'),
+                'sesion_id': sesion.id_sesion,
+                'fecha': sesion.fecha_inicio.date().isoformat(),
+                'hora_inicio': sesion.fecha_inicio.time().strftime('%H:%M'),
                 'duracion_real': sesion.duracion_real,
                 'estado': sesion.estado,
                 'tipo_meditacion': parametros.get('tipo_meditacion', 'mindfulness'),
@@ -156,15 +156,15 @@ class MeditacionService:
     @classmethod
     def _formatear_respuesta_meditacion(cls, sesion):
         """Formatea la respuesta con información de la meditación"""
-        parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+        parametros = ParametroService.como_dict(sesion)
         
         ahora = datetime.utcnow()
-        tiempo_transcurrido = (ahora - sesion.inicio).total_seconds() / 60
+        tiempo_transcurrido = (ahora - sesion.fecha_inicio).total_seconds() / 60
         
         return {
-            'sesion_id': sesion.sesion_id,
+            'sesion_id': sesion.id_sesion,
             'estado': sesion.estado,
-            'inicio': sesion.inicio.isoformat(),
+            'inicio': sesion.fecha_inicio.isoformat(),
             'duracion_planificada': int(parametros.get('duracion_planificada', 10)),
             'tipo_meditacion': parametros.get('tipo_meditacion', 'mindfulness'),
             'tiempo_transcurrido': round(tiempo_transcurrido, 2)
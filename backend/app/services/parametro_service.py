@@ -0,0 +1,32 @@
+# services/parametro_service.py
+from app.models import db, Sesion, SesionTecnicaParam
+from sqlalchemy.orm import selectinload
+
+class ParametroService:
+
+    @classmethod
+    def con_parametros(cls, query):
+        """Agrega la carga por lotes de parámetros a una consulta de sesiones.
+
+        Los parámetros de todas las sesiones del resultado se traen con una sola
+        consulta IN (...) adicional, sin importar cuántas sesiones haya.
+        """
+        return query.options(selectinload(Sesion.parametros))
+
+    @classmethod
+    def como_dict(cls, sesion):
+        """Devuelve los parámetros de la sesión como {parametro: valor}"""
+        return {p.parametro: p.valor for p in sesion.parametros}
+
+    @classmethod
+    def asignar(cls, sesion, parametro, valor):
+        """Actualiza el valor de un parámetro de la sesión o lo crea si no existe"""
+        existente = next((p for p in sesion.parametros if p.parametro == parametro), None)
+        if existente:
+            existente.valor = str(valor)
+            return existente
+
+        nuevo = SesionTecnicaParam(id_sesion=sesion.id_sesion, parametro=parametro, valor=str(valor))
+        sesion.parametros.append(nuevo)
+        db.session.add(nuevo)
+        return nuevo
@@ -0,0 +1,108 @@
+# services/password_service.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashOcupadoError(Exception):
+    """No quedó un hilo libre en el pool de hashing a tiempo (se responde con 503)"""
+
+
+class PasswordService:
+    """Hashing de contraseñas con algoritmo y coste configurables, fuera del hilo de la petición.
+
+    El cálculo se hace en un pool acotado (PASSWORD_HASH_WORKERS) para que una ráfaga de
+    logins no ocupe todos los workers con CPU; bcrypt y hashlib liberan el GIL mientras
+    calculan. Los hashes existentes se siguen verificando aunque cambie la configuración y
+    se regeneran en el siguiente login correcto (ver necesita_rehash).
+    """
+
+    # Coste por defecto de cada algoritmo: rondas (bcrypt), N (scrypt) o iteraciones (pbkdf2)
+    COSTES_DEFECTO = {'bcrypt': 12, 'scrypt': 32768, 'pbkdf2': 1000000}
+
+    @classmethod
+    def generar(cls, password):
+        """Hash de password con la configuración actual"""
+        algoritmo, coste = cls._configuracion()
+        return cls._en_pool(calcular_hash, password, algoritmo, coste)
+
+    @classmethod
+    def verificar(cls, hash_guardado, password):
+        """True si password corresponde al hash (de cualquier algoritmo soportado)"""
+        return cls._en_pool(comprobar_hash, hash_guardado, password)
+
+    @classmethod
+    def necesita_rehash(cls, hash_guardado):
+        """True si el hash se generó con un algoritmo o coste distinto del configurado"""
+        return metodo_de(hash_guardado) != metodo(*cls._configuracion())
+
+    @classmethod
+    def _configuracion(cls):
+        algoritmo = current_app.config.get('PASSWORD_ALGORITMO', 'scrypt')
+        if algoritmo not in cls.COSTES_DEFECTO:
+            raise ValueError(f'PASSWORD_ALGORITMO no soportado: {algoritmo}')
+        coste = current_app.config.get('PASSWORD_COSTE') or cls.COSTES_DEFECTO[algoritmo]
+        return algoritmo, int(coste)
+
+    @classmethod
+    def _en_pool(cls, funcion, *args):
+        pool = current_app.extensions.get('synapse_password_pool')
+        if pool is None:
+            pool = current_app.extensions.setdefault(
+                'synapse_password_pool', _PoolHash(current_app.config.get('PASSWORD_HASH_WORKERS', 4))
+            )
+        return pool.ejecutar(funcion, args, current_app.config.get('PASSWORD_HASH_TIMEOUT_SEGUNDOS', 10))
+
+
+class _PoolHash:
+    """Pool de hashing sin cola: un hash solo se envía cuando hay un hilo libre.
+
+    El plazo limita la espera por ese hilo, no el cálculo: un hash que ya empezó no se puede
+    interrumpir, así que se espera a que termine en lugar de responder 503 con la CPU ocupada.
+    """
+
+    def __init__(self, hilos):
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='password-hash')
+        self._libres = threading.BoundedSemaphore(hilos)
+
+    def ejecutar(self, funcion, args, espera_maxima):
+        if not self._libres.acquire(timeout=espera_maxima):
+            raise HashOcupadoError('Servicio ocupado, inténtalo de nuevo en unos segundos')
+        try:
+            futuro = self._ejecutor.submit(funcion, *args)
+        except BaseException:
+            self._libres.release()
+            raise
+        futuro.add_done_callback(lambda _: self._libres.release())
+        return futuro.result()
+
+
+def metodo(algoritmo, coste):
+    """Identificador de parámetros con el que empieza cada hash (p. ej. 'scrypt:32768:8:1')"""
+    if algoritmo == 'bcrypt':
+        return f'bcrypt:{coste}'
+    if algoritmo == 'scrypt':
+        return f'scrypt:{coste}:8:1'
+    return f'pbkdf2:sha256:{coste}'
+
+
+def metodo_de(hash_guardado):
+    """Identificador de parámetros de un hash ya guardado"""
+    if hash_guardado.startswith('$2'):
+        return f'bcrypt:{int(hash_guardado.split("$")[2])}'
+    return hash_guardado.split('$', 1)[0]
+
+
+def calcular_hash(password, algoritmo, coste):
+    if algoritmo == 'bcrypt':
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=coste)).decode('ascii')
+    return generate_password_hash(password, method=metodo(algoritmo, coste))
+
+
+def comprobar_hash(hash_guardado, password):
+    if hash_guardado.startswith('$2'):
+        return bcrypt.checkpw(password.encode('utf-8'), hash_guardado.encode('ascii'))
+    return check_password_hash(hash_guardado, password)
@@ -1,5 +1,9 @@
 # services/pomodoro_service.py
-from app.models import Sesion, Tecnica, SesionTecnicaParam
+from app.models import db, Sesion, SesionTecnicaParam
+from app.services.evento_service import EventoService
+from app.services.progreso_service import ProgresoService
+from app.services.parametro_service import ParametroService
+from app.services.tecnica_service import TecnicaService
 from datetime import datetime, timedelta
 import uuid
 
@@ -20,22 +24,16 @@ class PomodoroService:
             raise ValueError("Ya tienes una sesión en ejecución")
         
         # Obtener o crear técnica Pomodoro
-        tecnica_pomodoro = Tecnica.query.filter_by(nombre='Pomodoro').first()
-        if not tecnica_pomodoro:
-            tecnica_pomodoro = Tecnica(
-                nombre='Pomodoro',
-                categoria='productividad'
-            )
-            db.session.add(tecnica_pomodoro)
-            db.session.flush()
+        tecnica_pomodoro_id = TecnicaService.obtener_o_crear('Pomodoro', 'productividad')
         
         # Crear sesión
         nueva_sesion = Sesion(
             usuario_id=usuario_id,
-            tecnica_id=tecnica_pomodoro.tecnica_id,
-            inicio=datetime.utcnow(),
+            tecnica_id=tecnica_pomodoro_id,
+            fecha_inicio=datetime.utcnow(),
             es_grupal=False,
-            estado='EnEjecucion'
+            estado='EnEjecucion',
+            duracion_real=0
         )
         
         db.session.add(nueva_sesion)
@@ -54,9 +52,9 @@ class PomodoroService:
         
         for param in parametros:
             sesion_param = SesionTecnicaParam(
-                sesion_id=nueva_sesion.sesion_id,
-                codigo=param['codigo'],
-                cantidad=param['cantidad']
+                id_sesion=nueva_sesion.id_sesion,
+                parametro=param['codigo'],
+                valor=param['cantidad']
             )
             db.session.add(sesion_param)
         
@@ -69,7 +67,7 @@ class PomodoroService:
         """Completa un ciclo de trabajo o descanso"""
         
         sesion = Sesion.query.filter_by(
-            sesion_id=sesion_id,
+            id_sesion=sesion_id,
             usuario_id=usuario_id,
             estado='EnEjecucion'
         ).first()
@@ -78,7 +76,7 @@ class PomodoroService:
             raise ValueError("Sesión no encontrada o no está en ejecución")
         
         # Obtener parámetros actuales
-        parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+        parametros = ParametroService.como_dict(sesion)
         
         ahora = datetime.utcnow()
         tiempo_inicio_fase = datetime.fromisoformat(parametros['tiempo_inicio_fase'])
@@ -95,37 +93,22 @@ class PomodoroService:
             # Completar fase de trabajo
             ciclos_completados = int(parametros['ciclos_completados']) + 1
             
-            # Actualizar ciclos completados
-            param_ciclos = next((p for p in sesion.parametros if p.codigo == 'ciclos_completados'), None)
-            if param_ciclos:
-                param_ciclos.cantidad = str(ciclos_completados)
-            
-            # Cambiar a fase de descanso
-            param_fase = next((p for p in sesion.parametros if p.codigo == 'fase_actual'), None)
-            if param_fase:
-                param_fase.cantidad = 'descanso'
-            
-            # Actualizar tiempo de inicio de fase
-            param_tiempo = next((p for p in sesion.parametros if p.codigo == 'tiempo_inicio_fase'), None)
-            if param_tiempo:
-                param_tiempo.cantidad = ahora.isoformat()
+            # Actualizar ciclos completados, cambiar a fase de descanso y reiniciar el tiempo de fase
+            ParametroService.asignar(sesion, 'ciclos_completados', ciclos_completados)
+            ParametroService.asignar(sesion, 'fase_actual', 'descanso')
+            ParametroService.asignar(sesion, 'tiempo_inicio_fase', ahora.isoformat())
             
             resultado.update({
                 'ciclo_completado': True,
                 'fase_siguiente': 'descanso',
-                'ciclos_completados': ciclos_completados
+                'ciclos_completados': ciclos_completados,
+                'evento_id': EventoService.emitir(usuario_id, 'pomodoro_ciclo', sesion.id_sesion)
             })
             
         elif tipo_ciclo == 'descanso':
             # Completar fase de descanso, volver a trabajo
-            param_fase = next((p for p in sesion.parametros if p.codigo == 'fase_actual'), None)
-            if param_fase:
-                param_fase.cantidad = 'trabajo'
-            
-            # Actualizar tiempo de inicio de fase
-            param_tiempo = next((p for p in sesion.parametros if p.codigo == 'tiempo_inicio_fase'), None)
-            if param_tiempo:
-                param_tiempo.cantidad = ahora.isoformat()
+            ParametroService.asignar(sesion, 'fase_actual', 'trabajo')
+            ParametroService.asignar(sesion, 'tiempo_inicio_fase', ahora.isoformat())
             
             resultado.update({
                 'fase_siguiente': 'trabajo'
@@ -139,7 +122,7 @@ class PomodoroService:
         """Finaliza una sesión de Pomodoro"""
         
         sesion = Sesion.query.filter_by(
-            sesion_id=sesion_id,
+            id_sesion=sesion_id,
             usuario_id=usuario_id,
             estado='EnEjecucion'
         ).first()
@@ -148,17 +131,23 @@ class PomodoroService:
             raise ValueError("Sesión no encontrada o no está en ejecución")
         
         ahora = datetime.utcnow()
-        duracion_total = int((ahora - sesion.inicio).total_seconds() / 60)
+        duracion_total = int((ahora - sesion.fecha_inicio).total_seconds() / 60)
         
         # Actualizar sesión
-        sesion.fin = ahora
+        sesion.fecha_fin = ahora
         sesion.duracion_real = duracion_total
         sesion.estado = 'Completado' if completado_totalmente else 'Cancelado'
+        ProgresoService.registrar_sesion(sesion)
+        
+        # Solo una sesión completada puede otorgar recompensas
+        evento_id = None
+        if completado_totalmente:
+            evento_id = EventoService.emitir(usuario_id, 'pomodoro_finalizado', sesion.id_sesion)
         
         db.session.commit()
         
         # Obtener estadísticas finales
-        parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+        parametros = ParametroService.como_dict(sesion)
         ciclos_completados = int(parametros.get('ciclos_completados', 0))
         ciclos_objetivo = int(parametros.get('ciclos_objetivo', 4))
         modo_no_distraccion = parametros.get('modo_no_distraccion', 'False') == 'True'
@@ -171,7 +160,8 @@ class PomodoroService:
             'ciclos_objetivo': ciclos_objetivo,
             'duracion_total_minutos': duracion_total,
             'modo_no_distraccion': modo_no_distraccion,
-            'porcentaje_completado': round((ciclos_completados / ciclos_objetivo) * 100, 2)
+            'porcentaje_completado': round((ciclos_completados / ciclos_objetivo) * 100, 2),
+            'evento_id': evento_id
         }
     
     @classmethod
@@ -179,7 +169,7 @@ class PomodoroService:
         """Obtiene el estado actual de un Pomodoro en ejecución"""
         
         sesion = Sesion.query.filter_by(
-            sesion_id=sesion_id,
+            id_sesion=sesion_id,
             usuario_id=usuario_id
         ).first()
         
@@ -191,7 +181,7 @@ class PomodoroService:
     @classmethod
     def _formatear_respuesta_pomodoro(cls, sesion):
         """Formatea la respuesta con información del Pomodoro"""
-        parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+        parametros = ParametroService.como_dict(sesion)
         
         ahora = datetime.utcnow()
         tiempo_transcurrido = 0
@@ -200,9 +190,9 @@ class PomodoroService:
             tiempo_transcurrido = (ahora - tiempo_inicio_fase).total_seconds() / 60
         
         return {
-            'sesion_id': sesion.sesion_id,
+            'sesion_id': sesion.id_sesion,
             'estado': sesion.estado,
-            'inicio': sesion.inicio.isoformat(),
+            'inicio': sesion.fecha_inicio.isoformat(),
             'duracion_trabajo': int(parametros.get('duracion_trabajo', 25)),
             'duracion_descanso': int(parametros.get('duracion_descanso', 5)),
             'ciclos_objetivo': int(parametros.get('ciclos_objetivo', 4)),
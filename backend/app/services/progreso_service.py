@@ -0,0 +1,197 @@
+# services/progreso_service.py
+from app.models import db, Progreso, Sesion, Tarea
+from app.services.version_service import VersionService
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+
+class ProgresoService:
+
+    # Columnas del rollup diario que se mantienen de forma incremental
+    COLUMNAS_ROLLUP = ('minutos_estudio', 'sesiones_realizadas', 'tareas_completadas')
+
+    @classmethod
+    def registrar_sesion(cls, sesion, signo=1):
+        """Suma (o resta con signo=-1) una sesión completada al rollup de su día"""
+        if sesion.estado != 'Completado' or not sesion.fecha_inicio:
+            return
+        cls.aplicar_delta(
+            sesion.usuario_id,
+            sesion.fecha_inicio.date(),
+            minutos_estudio=signo * (sesion.duracion_real or 0),
+            sesiones_realizadas=signo
+        )
+
+    @classmethod
+    def registrar_tarea(cls, tarea, signo=1):
+        """Suma (o resta con signo=-1) una tarea completada al rollup del día en que se completó"""
+        if tarea.estado != 'Completado':
+            return
+        fecha = tarea.fecha_completada or tarea.fecha_creacion
+        if not fecha:
+            return
+        cls.aplicar_delta(tarea.usuario_id, fecha.date(), tareas_completadas=signo)
+
+    @classmethod
+    def aplicar_delta(cls, usuario_id, fecha, **deltas):
+        """Aplica incrementos al registro (usuario, fecha) dentro de la transacción actual.
+
+        No hace commit: el llamador confirma junto con el cambio que originó el delta.
+        """
+        deltas = {col: valor for col, valor in deltas.items() if valor}
+        if not deltas:
+            return
+
+        tabla = Progreso.__table__
+        actualizar = update(tabla).where(
+            tabla.c.usuario_id == usuario_id,
+            tabla.c.fecha == fecha
+        ).values({col: tabla.c[col] + valor for col, valor in deltas.items()})
+
+        # Escritura con Core: la versión de la colección no la ve el ORM
+        VersionService.marcar(usuario_id, 'progreso')
+        if db.session.execute(actualizar).rowcount:
+            return
+
+        # No existe el día todavía: insertarlo. Si otra petición lo creó en paralelo,
+        # la restricción única falla y se reintenta como UPDATE.
+        valores = {col: max(deltas.get(col, 0), 0) for col in cls.COLUMNAS_ROLLUP}
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(tabla).values(usuario_id=usuario_id, fecha=fecha, **valores))
+        except IntegrityError:
+            db.session.execute(actualizar)
+
+    @classmethod
+    def reconstruir(cls, desde, hasta, usuario_id=None):
+        """Recalcula el rollup para el rango [desde, hasta] a partir de Sesion y Tarea.
+
+        Trabaja en bloque (una consulta agregada por fuente) y usa filtros de rango
+        sobre las columnas de fecha para aprovechar los índices. No hace commit.
+        Devuelve el número de días (usuario, fecha) con actividad escritos.
+        """
+        inicio = datetime.combine(desde, datetime.min.time())
+        fin = datetime.combine(hasta + timedelta(days=1), datetime.min.time())
+        agregados = {}
+
+        def acumular(filas, columnas):
+            for fila in filas:
+                clave = (fila[0], cls._como_fecha(fila[1]))
+                dia = agregados.setdefault(clave, dict.fromkeys(cls.COLUMNAS_ROLLUP, 0))
+                for col, valor in zip(columnas, fila[2:]):
+                    dia[col] += int(valor or 0)
+
+        # Sesiones completadas por (usuario, día de inicio)
+        dia_sesion = func.date(Sesion.fecha_inicio)
+        consulta = db.session.query(
+            Sesion.usuario_id, dia_sesion,
+            func.sum(Sesion.duracion_real), func.count(Sesion.id_sesion)
+        ).filter(
+            Sesion.fecha_inicio >= inicio,
+            Sesion.fecha_inicio < fin,
+            Sesion.estado == 'Completado'
+        )
+        if usuario_id:
+            consulta = consulta.filter(Sesion.usuario_id == usuario_id)
+        acumular(consulta.group_by(Sesion.usuario_id, dia_sesion), ('minutos_estudio', 'sesiones_realizadas'))
+
+        # Tareas completadas por (usuario, día de completado). Las tareas anteriores a
+        # fecha_completada usan su fecha de creación, igual que registrar_tarea.
+        for columna, extra in (
+            (Tarea.fecha_completada, None),
+            (Tarea.fecha_creacion, Tarea.fecha_completada.is_(None))
+        ):
+            dia_tarea = func.date(columna)
+            consulta = db.session.query(
+                Tarea.usuario_id, dia_tarea, func.count(Tarea.id_tarea)
+            ).filter(
+                columna >= inicio,
+                columna < fin,
+                Tarea.estado == 'Completado'
+            )
+            if extra is not None:
+                consulta = consulta.filter(extra)
+            if usuario_id:
+                consulta = consulta.filter(Tarea.usuario_id == usuario_id)
+            acumular(consulta.group_by(Tarea.usuario_id, dia_tarea), ('tareas_completadas',))
+
+        tabla = Progreso.__table__
+        en_rango = [tabla.c.fecha >= desde, tabla.c.fecha <= hasta]
+        if usuario_id:
+            en_rango.append(tabla.c.usuario_id == usuario_id)
+
+        existentes = {
+            (fila.usuario_id, fila.fecha)
+            for fila in db.session.execute(
+                db.select(tabla.c.usuario_id, tabla.c.fecha).where(*en_rango)
+            )
+        }
+
+        # Poner a cero el rango y volver a escribir solo los días con actividad
+        db.session.execute(
+            update(tabla).where(*en_rango).values(dict.fromkeys(cls.COLUMNAS_ROLLUP, 0))
+        )
+
+        actualizaciones = []
+        inserciones = []
+        for (uid, fecha), valores in agregados.items():
+            fila = dict(valores, b_usuario_id=uid, b_fecha=fecha)
+            if (uid, fecha) in existentes:
+                actualizaciones.append(fila)
+            else:
+                inserciones.append(dict(valores, usuario_id=uid, fecha=fecha))
+
+        if actualizaciones:
+            db.session.execute(
+                update(tabla).where(
+                    tabla.c.usuario_id == db.bindparam('b_usuario_id'),
+                    tabla.c.fecha == db.bindparam('b_fecha')
+                ),
+                actualizaciones
+            )
+        if inserciones:
+            db.session.execute(insert(tabla), inserciones)
+
+        for uid in {uid for uid, _ in existentes} | {uid for uid, _ in agregados}:
+            VersionService.marcar(uid, 'progreso')
+
+        return len(agregados)
+
+    @classmethod
+    def racha_maxima(cls, dias):
+        """Racha más larga de días consecutivos con actividad (dias ordenados por fecha)"""
+        racha_maxima = 0
+        racha = 0
+        for p in dias:
+            if cls._con_actividad(p):
+                racha += 1
+                racha_maxima = max(racha_maxima, racha)
+            else:
+                racha = 0
+        return racha_maxima
+
+    @classmethod
+    def racha_actual(cls, dias, hoy=None):
+        """Días consecutivos con actividad que terminan hoy"""
+        racha = 0
+        fecha_esperada = hoy or date.today()
+        for p in sorted(dias, key=lambda x: x.fecha, reverse=True):
+            if p.fecha == fecha_esperada and cls._con_actividad(p):
+                racha += 1
+                fecha_esperada = fecha_esperada - timedelta(days=1)
+            else:
+                break
+        return racha
+
+    @staticmethod
+    def _con_actividad(p):
+        return p.minutos_estudio > 0 or p.sesiones_realizadas > 0
+
+    @staticmethod
+    def _como_fecha(valor):
+        """func.date devuelve texto en SQLite y date en MariaDB"""
+        if isinstance(valor, str):
+            return date.fromisoformat(valor[:10])
+        if isinstance(valor, datetime):
+            return valor.date()
+        return valor
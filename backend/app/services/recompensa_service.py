@@ -1,7 +1,15 @@
 # services/recompensa_service.py
-from app.models import db, Recompensa, RecompensaUsuario, Usuario, Sesion, Tarea, SesionTecnicaParam
-from datetime import datetime, date, timedelta
-import json
+from app.models import db, Recompensa, RecompensaUsuario, Usuario, Sesion, Tarea, SesionTecnicaParam, SistemaMeta
+from app.services.parametro_service import ParametroService
+from app.services.tecnica_service import TecnicaService
+from app.services.version_service import VersionService
+from app.utils import generate_uuid
+from app.utils.cache import obtener_cache
+from bisect import bisect_right
+from datetime import datetime, date
+from flask import current_app
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
 
 class RecompensaService:
     
@@ -12,177 +20,148 @@ class RecompensaService:
         'ALTA': {'valor': 50, 'nombre': 'Oro'},
         'MUY_ALTA': {'valor': 100, 'nombre': 'Platino'}
     }
+
+    # Índice compilado de reglas (tipo de requisito -> umbrales ascendentes) en caché
+    CLAVE_REGLAS = 'recompensas:reglas'
     
+    # Versión del catálogo de recompensas del sistema. Subirla al cambiar CATALOGO_SISTEMA
+    # o los hitos, y sembrar de nuevo (scripts/sembrar_catalogo.py o una migración nueva
+    # con las filas congeladas, como la 0005).
+    VERSION_CATALOGO = 1
+    CLAVE_VERSION_CATALOGO = 'catalogo_recompensas_version'
+    HITOS_MEDITACION = [5, 10, 25, 50, 100]
+
+    CATALOGO_SISTEMA = [
+        {
+            'nombre': 'Meditador Principiante',
+            'descripcion': 'Completa tu primera meditación',
+            'nivel': 'BAJA',
+            'requisitos': {'meditaciones_completadas': 1}
+        },
+        {
+            'nombre': 'Organizador Eficiente',
+            'descripcion': 'Completa una tarea en el tiempo asignado',
+            'nivel': 'MEDIA',
+            'requisitos': {'tareas_completadas_tiempo': 1}
+        },
+        {
+            'nombre': 'Maestro del Pomodoro',
+            'descripcion': 'Completa un ciclo completo de Pomodoro',
+            'nivel': 'ALTA',
+            'requisitos': {'pomodoros_completos': 1}
+        },
+        {
+            'nombre': 'Productividad Extrema',
+            'descripcion': 'Completa una tarea en la mitad del tiempo asignado',
+            'nivel': 'MUY_ALTA',
+            'requisitos': {'tareas_anticipadas_mitad_tiempo': 1}
+        },
+        {
+            'nombre': 'Concentración Total',
+            'descripcion': 'Completa un Pomodoro con modo no distracción activo',
+            'nivel': 'MUY_ALTA',
+            'requisitos': {'pomodoros_sin_distraccion': 1}
+        }
+    ]
+
     @classmethod
-    def inicializar_recompensas_sistema(cls):
-        """Crea las recompensas base del sistema si no existen"""
-        
-        recompensas_base = [
-            {
-                'nombre': 'Meditador Principiante',
-                'descripcion': 'Completa tu primera meditación',
-                'tipo': 'puntos',
-                'valor': cls.NIVELES['BAJA']['valor'],
-                'requisitos': {'meditaciones_completadas': 1}
-            },
-            {
-                'nombre': 'Organizador Eficiente',
-                'descripcion': 'Completa una tarea en el tiempo asignado',
-                'tipo': 'puntos',
-                'valor': cls.NIVELES['MEDIA']['valor'],
-                'requisitos': {'tareas_completadas_tiempo': 1}
-            },
-            {
-                'nombre': 'Maestro del Pomodoro',
-                'descripcion': 'Completa un ciclo completo de Pomodoro',
-                'tipo': 'puntos',
-                'valor': cls.NIVELES['ALTA']['valor'],
-                'requisitos': {'pomodoros_completos': 1}
-            },
-            {
-                'nombre': 'Productividad Extrema',
-                'descripcion': 'Completa una tarea en la mitad del tiempo asignado',
-                'tipo': 'puntos',
-                'valor': cls.NIVELES['MUY_ALTA']['valor'],
-                'requisitos': {'tareas_anticipadas_mitad_tiempo': 1}
-            },
+    def definiciones_catalogo(cls):
+        """Filas de recompensa del catálogo del sistema, incluidos los hitos de meditación"""
+        definiciones = [
             {
-                'nombre': 'Concentración Total',
-                'descripcion': 'Completa un Pomodoro con modo no distracción activo',
+                'nombre': r['nombre'],
+                'descripcion': r['descripcion'],
                 'tipo': 'puntos',
-                'valor': cls.NIVELES['MUY_ALTA']['valor'],
-                'requisitos': {'pomodoros_sin_distraccion': 1}
+                'valor': cls.NIVELES[r['nivel']]['valor'],
+                'requisitos': r['requisitos']
             }
+            for r in cls.CATALOGO_SISTEMA
         ]
-        
-        for recompensa_data in recompensas_base:
-            existing = Recompensa.query.filter_by(nombre=recompensa_data['nombre']).first()
-            if not existing:
-                nueva_recompensa = Recompensa(
-                    nombre=recompensa_data['nombre'],
-                    descripcion=recompensa_data['descripcion'],
-                    tipo=recompensa_data['tipo'],
-                    valor=recompensa_data['valor'],
-                    requisitos=recompensa_data['requisitos']
-                )
-                db.session.add(nueva_recompensa)
-        
-        db.session.commit()
-    
-    @classmethod
-    def verificar_recompensas_meditacion(cls, usuario_id, sesion_id):
-        """Verifica y otorga recompensas por completar meditación"""
-        
-        # Contar meditaciones completadas
-        from app.models import Tecnica
-        
-        tecnica_meditacion = Tecnica.query.filter_by(nombre='Meditación').first()
-        if not tecnica_meditacion:
-            return
-        
-        meditaciones_completadas = Sesion.query.filter_by(
-            usuario_id=usuario_id,
-            tecnica_id=tecnica_meditacion.tecnica_id,
-            estado='Completado'
-        ).count()
-        
-        # Verificar recompensa de primera meditación
-        if meditaciones_completadas == 1:
-            cls._otorgar_recompensa_por_tipo(usuario_id, 'meditaciones_completadas', 1)
-        
-        # Verificar recompensas por hitos de meditación
-        hitos_meditacion = [5, 10, 25, 50, 100]
-        for hito in hitos_meditacion:
-            if meditaciones_completadas == hito:
-                cls._crear_recompensa_hito_meditacion(hito)
-                cls._otorgar_recompensa_por_tipo(usuario_id, 'meditaciones_completadas', hito)
-    
-    @classmethod
-    def verificar_recompensas_tarea_completada(cls, usuario_id, tarea_id):
-        """Verifica recompensas por completar tarea en tiempo"""
-        
-        tarea = Tarea.query.get(tarea_id)
-        if not tarea or tarea.estado != 'Completado':
-            return
-        
-        hoy = date.today()
-        
-        # Verificar si se completó a tiempo
-        if tarea.fecha_vencimiento and hoy <= tarea.fecha_vencimiento:
-            cls._otorgar_recompensa_por_tipo(usuario_id, 'tareas_completadas_tiempo', 1)
-    
+        for hito in cls.HITOS_MEDITACION:
+            definiciones.append({
+                'nombre': f'Meditador {cls._obtener_titulo_hito(hito)}',
+                'descripcion': f'Completa {hito} meditaciones',
+                'tipo': 'puntos',
+                'valor': cls._calcular_valor_hito(hito),
+                'requisitos': {'meditaciones_completadas': hito}
+            })
+        return definiciones
+
     @classmethod
-    def verificar_recompensas_tarea_anticipada(cls, usuario_id, tarea_id):
-        """Verifica recompensas por completar tarea anticipadamente"""
-        
-        tarea = Tarea.query.get(tarea_id)
-        if not tarea or tarea.estado != 'Completado':
-            return
-        
-        hoy = date.today()
-        
-        if tarea.fecha_vencimiento and hoy < tarea.fecha_vencimiento:
-            dias_anticipados = (tarea.fecha_vencimiento - hoy).days
-            tiempo_total = (tarea.fecha_vencimiento - tarea.fecha_creacion.date()).days
-            
-            # Si se completó en la mitad del tiempo o menos
-            if tiempo_total > 0 and dias_anticipados >= (tiempo_total / 2):
-                cls._otorgar_recompensa_por_tipo(usuario_id, 'tareas_anticipadas_mitad_tiempo', 1)
-            else:
-                # Recompensa normal por completar anticipadamente
-                cls._otorgar_recompensa_por_tipo(usuario_id, 'tareas_completadas_tiempo', 1)
-    
+    def sembrar_catalogo(cls, conexion=None):
+        """Inserta o actualiza en bloque el catálogo del sistema y registra su versión.
+
+        Es idempotente. Con conexion=None usa la transacción de la sesión actual y no
+        hace commit. Devuelve (insertadas, actualizadas).
+        """
+        conexion = conexion if conexion is not None else db.session.connection()
+        tabla = Recompensa.__table__
+        meta = SistemaMeta.__table__
+        definiciones = cls.definiciones_catalogo()
+
+        existentes = {
+            fila.nombre: fila.id_recompensa
+            for fila in conexion.execute(
+                select(tabla.c.nombre, tabla.c.id_recompensa).where(
+                    tabla.c.nombre.in_([d['nombre'] for d in definiciones])
+                )
+            )
+        }
+        nuevas = [dict(d, id_recompensa=generate_uuid()) for d in definiciones if d['nombre'] not in existentes]
+        cambios = [dict(d, b_id=existentes[d['nombre']]) for d in definiciones if d['nombre'] in existentes]
+
+        if nuevas:
+            conexion.execute(insert(tabla), nuevas)
+        if cambios:
+            conexion.execute(update(tabla).where(tabla.c.id_recompensa == bindparam('b_id')), cambios)
+
+        marcador = {'valor': str(cls.VERSION_CATALOGO), 'actualizado': datetime.utcnow()}
+        actualizado = conexion.execute(
+            update(meta).where(meta.c.clave == cls.CLAVE_VERSION_CATALOGO).values(**marcador)
+        ).rowcount
+        if not actualizado:
+            conexion.execute(insert(meta).values(clave=cls.CLAVE_VERSION_CATALOGO, **marcador))
+
+        return len(nuevas), len(cambios)
+
     @classmethod
-    def verificar_recompensas_pomodoro(cls, usuario_id, sesion_id):
-        """Verifica recompensas por ciclo de pomodoro"""
-        # Esta se llama en cada ciclo completado, la recompensa principal se otorga al completar todo
-        pass
-    
+    def catalogo_al_dia(cls):
+        """Comprueba el marcador de versión del catálogo (desde caché, sin escribir nada)"""
+        cache = obtener_cache()
+        version = cache.get(cls.CLAVE_VERSION_CATALOGO)
+        if version is None:
+            marcador = db.session.get(SistemaMeta, cls.CLAVE_VERSION_CATALOGO)
+            version = int(marcador.valor) if marcador else 0
+            cache.set(cls.CLAVE_VERSION_CATALOGO, version)
+            if version < cls.VERSION_CATALOGO:
+                current_app.logger.warning(
+                    'Catálogo de recompensas en versión %s (se esperaba %s): ejecutar '
+                    'flask db upgrade o scripts/sembrar_catalogo.py', version, cls.VERSION_CATALOGO
+                )
+        return version >= cls.VERSION_CATALOGO
+
     @classmethod
-    def verificar_recompensas_pomodoro_completo(cls, usuario_id, sesion_id):
-        """Verifica recompensas por completar pomodoro completo"""
-        
-        sesion = Sesion.query.get(sesion_id)
-        if not sesion:
-            return
-        
-        parametros = {p.codigo: p.cantidad for p in sesion.parametros}
-        ciclos_completados = int(parametros.get('ciclos_completados', 0))
-        ciclos_objetivo = int(parametros.get('ciclos_objetivo', 4))
-        modo_no_distraccion = parametros.get('modo_no_distraccion', 'False') == 'True'
-        
-        # Verificar pomodoro completo
-        if ciclos_completados >= ciclos_objetivo:
-            cls._otorgar_recompensa_por_tipo(usuario_id, 'pomodoros_completos', 1)
-            
-            # Verificar recompensa especial por modo no distracción
-            if modo_no_distraccion:
-                cls._otorgar_recompensa_por_tipo(usuario_id, 'pomodoros_sin_distraccion', 1)
+    def inicializar_recompensas_sistema(cls):
+        """Siembra el catálogo del sistema y confirma (uso en scripts, no en peticiones)"""
+        resultado = cls.sembrar_catalogo()
+        if any(resultado):
+            VersionService.marcar_global('catalogo_recompensas')
+        db.session.commit()
+        obtener_cache().delete(cls.CLAVE_VERSION_CATALOGO)
+        cls.invalidar_reglas()
+        return resultado
     
     @classmethod
     def verificar_todas_recompensas_usuario(cls, usuario_id):
         """Verifica todas las recompensas disponibles para un usuario"""
         
-        # Asegurar que las recompensas base existan
-        cls.inicializar_recompensas_sistema()
+        # El catálogo se siembra al migrar; aquí solo se comprueba su versión
+        cls.catalogo_al_dia()
         
         stats = cls._obtener_estadisticas_usuario_para_recompensas(usuario_id)
-        recompensas_otorgadas = []
-        
-        # Verificar cada tipo de recompensa
-        tipos_verificacion = [
-            'meditaciones_completadas',
-            'tareas_completadas_tiempo', 
-            'pomodoros_completos',
-            'tareas_anticipadas_mitad_tiempo',
-            'pomodoros_sin_distraccion'
-        ]
         
-        for tipo in tipos_verificacion:
-            if stats.get(tipo, 0) > 0:
-                recompensa = cls._otorgar_recompensa_por_tipo(usuario_id, tipo, stats[tipo])
-                if recompensa:
-                    recompensas_otorgadas.append(recompensa)
+        # Todos los tipos de requisito se evalúan en una pasada y se otorgan en un solo commit
+        recompensas_otorgadas = cls.otorgar_recompensas(usuario_id, stats)
         
         return {
             'recompensas_otorgadas': recompensas_otorgadas,
@@ -201,11 +180,11 @@ class RecompensaService:
         stats = cls._obtener_estadisticas_usuario_para_recompensas(usuario_id)
         
         # Obtener recompensas del usuario
-        recompensas_usuario = RecompensaUsuario.query.filter_by(usuario_id=usuario_id).count()
+        recompensas_usuario = RecompensaUsuario.query.filter_by(id_usuario=usuario_id).count()
         puntos_totales = db.session.query(
             db.func.sum(Recompensa.valor)
         ).join(RecompensaUsuario).filter(
-            RecompensaUsuario.usuario_id == usuario_id
+            RecompensaUsuario.id_usuario == usuario_id
         ).scalar() or 0
         
         return {
@@ -222,30 +201,29 @@ class RecompensaService:
         """Obtiene estadísticas específicas para verificar recompensas"""
         
         # Meditaciones completadas
-        from app.models import Tecnica
-        tecnica_meditacion = Tecnica.query.filter_by(nombre='Meditación').first()
+        tecnica_meditacion = TecnicaService.por_nombre('Meditación')
         meditaciones_completadas = 0
         if tecnica_meditacion:
             meditaciones_completadas = Sesion.query.filter_by(
                 usuario_id=usuario_id,
-                tecnica_id=tecnica_meditacion.tecnica_id,
+                tecnica_id=tecnica_meditacion['id_tecnica'],
                 estado='Completado'
             ).count()
         
         # Pomodoros completados
-        tecnica_pomodoro = Tecnica.query.filter_by(nombre='Pomodoro').first()
+        tecnica_pomodoro = TecnicaService.por_nombre('Pomodoro')
         pomodoros_completos = 0
         pomodoros_sin_distraccion = 0
         
         if tecnica_pomodoro:
-            sesiones_pomodoro = Sesion.query.filter_by(
+            sesiones_pomodoro = ParametroService.con_parametros(Sesion.query.filter_by(
                 usuario_id=usuario_id,
-                tecnica_id=tecnica_pomodoro.tecnica_id,
+                tecnica_id=tecnica_pomodoro['id_tecnica'],
                 estado='Completado'
-            ).all()
+            )).all()
             
             for sesion in sesiones_pomodoro:
-                parametros = {p.codigo: p.cantidad for p in sesion.parametros}
+                parametros = ParametroService.como_dict(sesion)
                 ciclos_completados = int(parametros.get('ciclos_completados', 0))
                 ciclos_objetivo = int(parametros.get('ciclos_objetivo', 4))
                 modo_no_distraccion = parametros.get('modo_no_distraccion', 'False') == 'True'
@@ -278,59 +256,108 @@ class RecompensaService:
         }
     
     @classmethod
-    def _otorgar_recompensa_por_tipo(cls, usuario_id, tipo_requisito, cantidad):
-        """Otorga recompensa basada en tipo de logro"""
-        
-        # Buscar recompensa que coincida con el tipo
-        recompensas_aplicables = Recompensa.query.all()
-        
-        for recompensa in recompensas_aplicables:
-            if tipo_requisito in recompensa.requisitos:
-                valor_requerido = recompensa.requisitos[tipo_requisito]
-                
-                # Verificar si el usuario ya tiene esta recompensa
-                ya_tiene = RecompensaUsuario.query.filter_by(
-                    usuario_id=usuario_id,
-                    recompensa_id=recompensa.recompensa_id
-                ).first()
-                
-                if not ya_tiene and cantidad >= valor_requerido:
-                    # Otorgar recompensa
-                    nueva_recompensa_usuario = RecompensaUsuario(
-                        usuario_id=usuario_id,
-                        recompensa_id=recompensa.recompensa_id
-                    )
-                    
-                    db.session.add(nueva_recompensa_usuario)
-                    db.session.commit()
-                    
-                    return {
-                        'recompensa_id': recompensa.recompensa_id,
-                        'nombre': recompensa.nombre,
-                        'descripcion': recompensa.descripcion,
-                        'valor': recompensa.valor
-                    }
-        
-        return None
-    
+    def otorgar_recompensas(cls, usuario_id, stats):
+        """Otorga todas las recompensas cuyos requisitos cumple stats ({tipo: cantidad}).
+
+        Usa el índice compilado de reglas, consulta una sola vez las recompensas que el
+        usuario ya tiene e inserta las nuevas en un único commit.
+        """
+        reglas = cls.reglas()
+        candidatas = cls._recompensas_alcanzadas(reglas, stats)
+        if not candidatas:
+            return []
+
+        for intento in range(2):
+            obtenidas = {
+                fila[0] for fila in db.session.query(RecompensaUsuario.id_recompensa).filter(
+                    RecompensaUsuario.id_usuario == usuario_id
+                )
+            }
+            nuevas = [rid for rid in candidatas if rid not in obtenidas]
+            if not nuevas:
+                return []
+
+            db.session.add_all([RecompensaUsuario(id_usuario=usuario_id, id_recompensa=rid) for rid in nuevas])
+            try:
+                db.session.commit()
+                break
+            except IntegrityError:
+                # Otra petición otorgó alguna de ellas en paralelo: recalcular una vez
+                db.session.rollback()
+                if intento:
+                    raise
+
+        return [
+            {
+                'recompensa_id': rid,
+                'nombre': reglas['recompensas'][rid]['nombre'],
+                'descripcion': reglas['recompensas'][rid]['descripcion'],
+                'valor': reglas['recompensas'][rid]['valor']
+            }
+            for rid in nuevas
+        ]
+
     @classmethod
-    def _crear_recompensa_hito_meditacion(cls, hito):
-        """Crea recompensas por hitos de meditación si no existen"""
-        
-        nombre = f'Meditador {cls._obtener_titulo_hito(hito)}'
-        existing = Recompensa.query.filter_by(nombre=nombre).first()
-        
-        if not existing:
-            valor = cls._calcular_valor_hito(hito)
-            nueva_recompensa = Recompensa(
-                nombre=nombre,
-                descripcion=f'Completa {hito} meditaciones',
-                tipo='puntos',
-                valor=valor,
-                requisitos={'meditaciones_completadas': hito}
-            )
-            db.session.add(nueva_recompensa)
-            db.session.commit()
+    def reglas(cls):
+        """Índice compilado de reglas de recompensa (desde caché)"""
+        cache = obtener_cache()
+        reglas = cache.get(cls.CLAVE_REGLAS)
+        if reglas is None:
+            reglas = cls._compilar_reglas(Recompensa.query.all())
+            cache.set(cls.CLAVE_REGLAS, reglas)
+        return reglas
+
+    @classmethod
+    def invalidar_reglas(cls):
+        """Descartar el índice de reglas; llamar después de confirmar cambios en Recompensa"""
+        obtener_cache().delete(cls.CLAVE_REGLAS)
+
+    @staticmethod
+    def _compilar_reglas(recompensas):
+        """Agrupa los umbrales por tipo de requisito, ordenados de menor a mayor"""
+        por_tipo = {}
+        datos = {}
+        for recompensa in recompensas:
+            requisitos = {
+                tipo: umbral for tipo, umbral in (recompensa.requisitos or {}).items()
+                if isinstance(umbral, (int, float)) and not isinstance(umbral, bool)
+            }
+            if not requisitos:
+                continue
+            datos[recompensa.id_recompensa] = {
+                'nombre': recompensa.nombre,
+                'descripcion': recompensa.descripcion,
+                'valor': recompensa.valor,
+                'requisitos': requisitos
+            }
+            for tipo, umbral in requisitos.items():
+                por_tipo.setdefault(tipo, []).append((umbral, recompensa.id_recompensa))
+
+        indice = {}
+        for tipo, umbrales in por_tipo.items():
+            umbrales.sort()
+            indice[tipo] = {'umbrales': [u for u, _ in umbrales], 'ids': [rid for _, rid in umbrales]}
+        return {'por_tipo': indice, 'recompensas': datos}
+
+    @staticmethod
+    def _recompensas_alcanzadas(reglas, stats):
+        """ids de recompensas con todos sus requisitos cumplidos, en una pasada por tipo"""
+        alcanzadas = []
+        vistas = set()
+        for tipo, cantidad in stats.items():
+            regla = reglas['por_tipo'].get(tipo)
+            if not regla or not cantidad:
+                continue
+            # Los umbrales están ordenados: todo lo anterior al corte se cumple para este tipo
+            corte = bisect_right(regla['umbrales'], cantidad)
+            for rid in regla['ids'][:corte]:
+                if rid in vistas:
+                    continue
+                vistas.add(rid)
+                requisitos = reglas['recompensas'][rid]['requisitos']
+                if all(stats.get(t, 0) >= u for t, u in requisitos.items()):
+                    alcanzadas.append(rid)
+        return alcanzadas
     
     @classmethod
     def _obtener_titulo_hito(cls, hito):
@@ -0,0 +1,72 @@
+# services/tecnica_service.py
+from app.models import db, Tecnica
+from app.utils.cache import obtener_cache
+from sqlalchemy import event
+
+class TecnicaService:
+
+    # El catálogo completo se guarda como una sola entrada ya indexada
+    CLAVE_CATALOGO = 'tecnicas:catalogo'
+
+    @classmethod
+    def catalogo(cls):
+        """Catálogo de técnicas indexado por id, nombre y categoría (desde caché)"""
+        cache = obtener_cache()
+        catalogo = cache.get(cls.CLAVE_CATALOGO)
+        if catalogo is None:
+            catalogo = cls._indexar([t.to_dict() for t in Tecnica.query.order_by(Tecnica.nombre).all()])
+            cache.set(cls.CLAVE_CATALOGO, catalogo)
+        return catalogo
+
+    @classmethod
+    def listar(cls, categoria=None):
+        catalogo = cls.catalogo()
+        if categoria:
+            return catalogo['por_categoria'].get(categoria, [])
+        return catalogo['todas']
+
+    @classmethod
+    def por_id(cls, tecnica_id):
+        return cls.catalogo()['por_id'].get(tecnica_id)
+
+    @classmethod
+    def por_nombre(cls, nombre):
+        return cls.catalogo()['por_nombre'].get(nombre)
+
+    @classmethod
+    def categorias(cls):
+        return sorted(cls.catalogo()['por_categoria'])
+
+    @classmethod
+    def obtener_o_crear(cls, nombre, categoria):
+        """id de la técnica con ese nombre; si no existe la crea en la transacción actual.
+
+        El catálogo en caché se invalida cuando esa transacción se confirma.
+        """
+        tecnica = cls.por_nombre(nombre)
+        if tecnica:
+            return tecnica['id_tecnica']
+
+        nueva = Tecnica(nombre=nombre, categoria=categoria)
+        db.session.add(nueva)
+        db.session.flush()
+        event.listen(db.session(), 'after_commit', lambda session: cls.invalidar(), once=True)
+        return nueva.id_tecnica
+
+    @classmethod
+    def invalidar(cls):
+        """Descartar el catálogo en caché; llamar después de confirmar cambios en Tecnica"""
+        obtener_cache().delete(cls.CLAVE_CATALOGO)
+
+    @staticmethod
+    def _indexar(tecnicas):
+        por_categoria = {}
+        for tecnica in tecnicas:
+            if tecnica['categoria']:
+                por_categoria.setdefault(tecnica['categoria'], []).append(tecnica)
+        return {
+            'todas': tecnicas,
+            'por_id': {t['id_tecnica']: t for t in tecnicas},
+            'por_nombre': {t['nombre']: t for t in tecnicas},
+            'por_categoria': por_categoria
+        }
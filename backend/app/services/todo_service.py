@@ -1,5 +1,9 @@
 # services/todo_service.py
 from app.models import db, Tarea, Usuario
+from app.services.estadisticas_service import EstadisticasTareasService
+from app.services.evento_service import EventoService
+from app.services.progreso_service import ProgresoService
+from sqlalchemy.orm import joinedload
 from datetime import datetime, date
 
 class TodoService:
@@ -9,7 +13,7 @@ class TodoService:
         """Obtiene todas las listas de tareas organizadas del usuario"""
         
         # Agrupar tareas por sala (lista)
-        tareas = Tarea.query.filter_by(usuario_id=usuario_id).all()
+        tareas = Tarea.query.options(joinedload(Tarea.sala)).filter_by(usuario_id=usuario_id).all()
         
         # Organizar por listas (salas) y tareas individuales
         listas = {}
@@ -18,8 +22,7 @@ class TodoService:
         for tarea in tareas:
             if tarea.sala_id:
                 if tarea.sala_id not in listas:
-                    from app.models import Sala
-                    sala = Sala.query.get(tarea.sala_id)
+                    sala = tarea.sala
                     listas[tarea.sala_id] = {
                         'id': tarea.sala_id,
                         'nombre': sala.nombre if sala else 'Lista sin nombre',
@@ -102,6 +105,8 @@ class TodoService:
         
         # Actualizar tarea
         tarea.estado = 'Completado'
+        tarea.fecha_completada = datetime.utcnow()
+        ProgresoService.registrar_tarea(tarea)
         
         # Agregar comentario si se completó anticipadamente
         if completada_anticipadamente:
@@ -111,6 +116,7 @@ class TodoService:
             else:
                 tarea.comentario = comentario_anticipado
         
+        evento_id = EventoService.emitir(usuario_id, 'tarea_completada', tarea.id_tarea)
         db.session.commit()
         
         return {
@@ -119,49 +125,23 @@ class TodoService:
             'completada_anticipadamente': completada_anticipadamente,
             'dias_anticipados': dias_anticipados,
             'fecha_completada': hoy.isoformat(),
-            'fecha_vencimiento': tarea.fecha_vencimiento.isoformat() if tarea.fecha_vencimiento else None
+            'fecha_vencimiento': tarea.fecha_vencimiento.isoformat() if tarea.fecha_vencimiento else None,
+            'evento_id': evento_id
         }
     
     @classmethod
     def obtener_estadisticas_productividad(cls, usuario_id):
         """Obtiene estadísticas detalladas de productividad"""
         
-        hoy = date.today()
+        # Todos los contadores salen de una sola consulta agregada
+        contadores = EstadisticasTareasService.contadores(usuario_id)
         
-        # Estadísticas básicas
-        total_tareas = Tarea.query.filter_by(usuario_id=usuario_id).count()
-        tareas_completadas = Tarea.query.filter_by(usuario_id=usuario_id, estado='Completado').count()
-        
-        # Tareas completadas anticipadamente
-        tareas_anticipadas = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.estado == 'Completado',
-            Tarea.comentario.like('%días antes de tiempo%')
-        ).count()
-        
-        # Tareas vencidas
-        tareas_vencidas = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.estado != 'Completado',
-            Tarea.fecha_vencimiento < hoy
-        ).count()
-        
-        # Tareas de esta semana
-        inicio_semana = hoy - timedelta(days=hoy.weekday())
-        fin_semana = inicio_semana + timedelta(days=6)
-        
-        tareas_semana = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.fecha_creacion >= inicio_semana,
-            Tarea.fecha_creacion <= fin_semana
-        ).count()
-        
-        tareas_completadas_semana = Tarea.query.filter(
-            Tarea.usuario_id == usuario_id,
-            Tarea.estado == 'Completado',
-            Tarea.fecha_creacion >= inicio_semana,
-            Tarea.fecha_creacion <= fin_semana
-        ).count()
+        total_tareas = contadores['total']
+        tareas_completadas = contadores['completadas']
+        tareas_anticipadas = contadores['anticipadas']
+        tareas_vencidas = contadores['vencidas']
+        tareas_semana = contadores['semana']['creadas']
+        tareas_completadas_semana = contadores['semana']['completadas']
         
         return {
             'resumen_general': {
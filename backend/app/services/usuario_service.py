@@ -0,0 +1,96 @@
+# services/usuario_service.py
+from app.models import db, Tarea
+from app.utils.pagination import codificar_cursor
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
+class UsuarioService:
+
+    VISTAS = ('summary', 'profile', 'full')
+    INCLUSIONES = ('tareas',)
+
+    # Tareas embebidas por usuario con include=tareas (el resto se pagina aparte)
+    TAREAS_POR_USUARIO = 5
+    TAREAS_POR_USUARIO_MAXIMO = 20
+
+    @classmethod
+    def opciones(cls, args, vista='profile'):
+        """Lee view, include y tareas_limit de la query string.
+
+        Lanza ValueError con un mensaje para el cliente si algún valor no es válido.
+        """
+        vista = args.get('view', vista)
+        if vista not in cls.VISTAS:
+            raise ValueError(f"view debe ser uno de: {', '.join(cls.VISTAS)}")
+
+        inclusiones = {i.strip() for i in args.get('include', '').split(',') if i.strip()}
+        desconocidas = inclusiones - set(cls.INCLUSIONES)
+        if desconocidas:
+            raise ValueError(f"include no válido: {', '.join(sorted(desconocidas))}")
+
+        try:
+            limite_tareas = int(args.get('tareas_limit', cls.TAREAS_POR_USUARIO))
+        except ValueError:
+            raise ValueError('tareas_limit debe ser un número entero')
+
+        return {
+            'vista': vista,
+            'incluir_tareas': 'tareas' in inclusiones,
+            'limite_tareas': max(1, min(limite_tareas, cls.TAREAS_POR_USUARIO_MAXIMO))
+        }
+
+    @classmethod
+    def serializar(cls, usuarios, vista='profile', incluir_tareas=False, limite_tareas=TAREAS_POR_USUARIO,
+                   privado=None):
+        """Serializa una lista de usuarios; con incluir_tareas embebe sus tareas más recientes.
+
+        privado(id_usuario) dice si se pueden mostrar los datos privados de cada usuario (vista
+        full y tareas); sin él, ninguno. A los demás se les sirve la vista profile y sin tareas.
+        Las tareas de todos los usuarios se cargan en una sola consulta. Si un usuario
+        tiene más, 'tareas_siguiente_cursor' sirve para GET /api/usuarios/<id>/tareas.
+        """
+        privados = set()
+        if privado is not None and (vista == 'full' or incluir_tareas):
+            privados = {u.id_usuario for u in usuarios if privado(u.id_usuario)}
+        datos = [
+            usuario.to_dict('profile' if vista == 'full' and usuario.id_usuario not in privados else vista)
+            for usuario in usuarios
+        ]
+        if not incluir_tareas or not privados:
+            return datos
+
+        por_usuario = cls._tareas_recientes(list(privados), limite_tareas + 1)
+        for dato in datos:
+            if dato['id_usuario'] not in privados:
+                continue
+            tareas = por_usuario.get(dato['id_usuario'], [])
+            pagina = tareas[:limite_tareas]
+            dato['tareas'] = [tarea.to_dict() for tarea in pagina]
+            dato['tareas_siguiente_cursor'] = (
+                codificar_cursor(pagina[-1].fecha_creacion, pagina[-1].id_tarea)
+                if len(tareas) > limite_tareas else None
+            )
+        return datos
+
+    @classmethod
+    def serializar_uno(cls, usuario, **opciones):
+        return cls.serializar([usuario], **opciones)[0]
+
+    @classmethod
+    def _tareas_recientes(cls, usuario_ids, por_usuario):
+        """Las N tareas más recientes de cada usuario con ROW_NUMBER() en una consulta"""
+        fila = func.row_number().over(
+            partition_by=Tarea.usuario_id,
+            order_by=(Tarea.fecha_creacion.desc(), Tarea.id_tarea.desc())
+        ).label('fila')
+        numeradas = select(Tarea, fila).where(Tarea.usuario_id.in_(usuario_ids)).subquery()
+        tarea = aliased(Tarea, numeradas)
+
+        tareas = db.session.query(tarea).filter(numeradas.c.fila <= por_usuario).order_by(
+            numeradas.c.usuario_id, numeradas.c.fila
+        ).all()
+
+        resultado = {}
+        for t in tareas:
+            resultado.setdefault(t.usuario_id, []).append(t)
+        return resultado
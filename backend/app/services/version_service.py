@@ -0,0 +1,147 @@
+# services/version_service.py
+from datetime import datetime
+
+from sqlalchemy import and_, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import (
+    db, ColeccionVersion, Progreso, Recompensa, RecompensaUsuario, Sesion, SesionTecnicaParam, Tarea, Tecnica
+)
+
+
+class VersionService:
+    """Versión de cada colección por usuario, para responder 304 sin leer las tablas principales.
+
+    Toda escritura ORM sobre los modelos de COLECCIONES incrementa la versión (usuario,
+    colección) en la misma transacción, así que la versión nunca avanza sin los datos ni al
+    revés y vale entre workers. Las escrituras con Core (rollup de progreso, siembra del
+    catálogo) llaman a marcar() explícitamente.
+    """
+
+    # Modelo -> (colección, atributo del usuario dueño)
+    COLECCIONES = {
+        Tarea: ('tareas', 'usuario_id'),
+        Sesion: ('sesiones', 'usuario_id'),
+        Progreso: ('progreso', 'usuario_id'),
+        RecompensaUsuario: ('recompensas', 'id_usuario'),
+    }
+    # Catálogos compartidos por todos los usuarios
+    GLOBALES = {
+        Tecnica: 'tecnicas',
+        Recompensa: 'catalogo_recompensas',
+    }
+    GLOBAL = ''
+
+    @classmethod
+    def versiones(cls, usuario_id, colecciones):
+        """({colección: versión}, último cambio) con una lectura por clave primaria.
+
+        Las colecciones sin fila todavía tienen versión 0.
+        """
+        tabla = ColeccionVersion.__table__
+        globales = [c for c in colecciones if c in cls.GLOBALES.values()]
+        propias = [c for c in colecciones if c not in globales]
+
+        condiciones = []
+        if propias:
+            condiciones.append(and_(tabla.c.usuario_id == usuario_id, tabla.c.coleccion.in_(propias)))
+        if globales:
+            condiciones.append(and_(tabla.c.usuario_id == cls.GLOBAL, tabla.c.coleccion.in_(globales)))
+
+        versiones = dict.fromkeys(colecciones, 0)
+        ultimo = None
+        for fila in db.session.execute(
+            select(tabla.c.coleccion, tabla.c.version, tabla.c.actualizado).where(or_(*condiciones))
+        ):
+            versiones[fila.coleccion] = fila.version
+            if ultimo is None or fila.actualizado > ultimo:
+                ultimo = fila.actualizado
+        return versiones, ultimo
+
+    @classmethod
+    def marcar(cls, usuario_id, *colecciones, conexion=None):
+        """Incrementa las versiones en la transacción de conexion (o la de la sesión actual)"""
+        cls._incrementar({(usuario_id, c) for c in colecciones}, conexion or db.session.connection())
+
+    @classmethod
+    def marcar_global(cls, *colecciones, conexion=None):
+        cls.marcar(cls.GLOBAL, *colecciones, conexion=conexion)
+
+    @classmethod
+    def _incrementar(cls, claves, conexion):
+        if not claves:
+            return
+        tabla = ColeccionVersion.__table__
+        ahora = datetime.utcnow()
+        for usuario_id, coleccion in sorted(claves):
+            if conexion.dialect.name in ('sqlite', 'mysql', 'mariadb'):
+                conexion.execute(cls._upsert(conexion.dialect.name, tabla, usuario_id, coleccion, ahora))
+                continue
+            actualizar = update(tabla).where(
+                tabla.c.usuario_id == usuario_id, tabla.c.coleccion == coleccion
+            ).values(version=tabla.c.version + 1, actualizado=ahora)
+            if not conexion.execute(actualizar).rowcount:
+                conexion.execute(insert(tabla).values(
+                    usuario_id=usuario_id, coleccion=coleccion, version=1, actualizado=ahora
+                ))
+
+    @staticmethod
+    def _upsert(dialecto, tabla, usuario_id, coleccion, ahora):
+        """INSERT ... ON CONFLICT / ON DUPLICATE KEY que incrementa la versión existente"""
+        valores = dict(usuario_id=usuario_id, coleccion=coleccion, version=1, actualizado=ahora)
+        if dialecto == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as insertar
+            sentencia = insertar(tabla).values(**valores)
+            return sentencia.on_conflict_do_update(
+                index_elements=[tabla.c.usuario_id, tabla.c.coleccion],
+                set_={'version': tabla.c.version + 1, 'actualizado': ahora}
+            )
+        from sqlalchemy.dialects.mysql import insert as insertar
+        sentencia = insertar(tabla).values(**valores)
+        return sentencia.on_duplicate_key_update(version=tabla.c.version + 1, actualizado=ahora)
+
+
+def _anotar_cambios(session, contexto_flush):
+    """Recoge (usuario, colección) de lo que se acaba de escribir en este flush"""
+    claves = session.info.setdefault('colecciones_cambiadas', set())
+    sesiones_param = set()
+    modificados = [o for o in session.dirty if session.is_modified(o, include_collections=False)]
+    for objeto in list(session.new) + modificados + list(session.deleted):
+        modelo = type(objeto)
+        if modelo in VersionService.COLECCIONES:
+            coleccion, atributo = VersionService.COLECCIONES[modelo]
+            usuario_id = getattr(objeto, atributo)
+            if usuario_id:
+                claves.add((usuario_id, coleccion))
+        elif modelo in VersionService.GLOBALES:
+            claves.add((VersionService.GLOBAL, VersionService.GLOBALES[modelo]))
+        elif modelo is SesionTecnicaParam and objeto.id_sesion:
+            sesiones_param.add(objeto.id_sesion)
+    if sesiones_param:
+        session.info['colecciones_param'] = session.info.get('colecciones_param', set()) | sesiones_param
+
+
+def _incrementar_cambios(session, contexto_flush):
+    claves = session.info.pop('colecciones_cambiadas', set())
+    sesiones_param = session.info.pop('colecciones_param', None)
+    if not claves and not sesiones_param:
+        return
+    conexion = session.connection()
+    if sesiones_param:
+        # Los parámetros solo conocen su sesión: el dueño sale de la propia tabla sesion
+        tabla = Sesion.__table__
+        for (usuario_id,) in conexion.execute(
+            select(tabla.c.usuario_id).where(tabla.c.id_sesion.in_(sesiones_param)).distinct()
+        ):
+            claves.add((usuario_id, 'sesiones'))
+    VersionService._incrementar(claves, conexion)
+
+
+def _descartar_cambios(session):
+    session.info.pop('colecciones_cambiadas', None)
+    session.info.pop('colecciones_param', None)
+
+
+event.listen(Session, 'after_flush', _anotar_cambios)
+event.listen(Session, 'after_flush_postexec', _incrementar_cambios)
+event.listen(Session, 'after_rollback', _descartar_cambios)
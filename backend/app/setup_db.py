@@ -5,7 +5,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pymysql
-from app import create_app
+from app import create_models_app
 from app.models import db
 from app.config import Config
 
@@ -31,7 +31,7 @@ def create_database():
 
 def create_tables():
     # Crear la app y cargar configuración para crear tablas
-    app = create_app('development')
+    app = create_models_app('development')
     with app.app_context():
         db.create_all()
         print("Tablas creadas exitosamente.")
@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class CacheLocal:
+    """Caché LRU con expiración por entrada, local al proceso y segura entre hilos"""
+
+    def __init__(self, max_entradas=1024, ttl=300):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self._datos[clave]
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[1]
+
+    def set(self, clave, valor, ttl=None):
+        expira = time.monotonic() + (ttl or self.ttl)
+        with self._lock:
+            self._datos[clave] = (expira, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def delete(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self):
+        return {'backend': 'local', 'aciertos': self.aciertos, 'fallos': self.fallos, 'entradas': len(self._datos)}
+
+
+class CacheRedis:
+    """Caché compartida entre workers sobre Redis; los valores se guardan como JSON"""
+
+    def __init__(self, url, ttl=300, prefijo='synapse:'):
+        import redis
+        self._cliente = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefijo = prefijo
+        self.aciertos = 0
+        self.fallos = 0
+
+    def get(self, clave):
+        crudo = self._cliente.get(self.prefijo + clave)
+        if crudo is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return json.loads(crudo)
+
+    def set(self, clave, valor, ttl=None):
+        self._cliente.set(self.prefijo + clave, json.dumps(valor), ex=ttl or self.ttl)
+
+    def delete(self, clave):
+        self._cliente.delete(self.prefijo + clave)
+
+    def clear(self):
+        claves = list(self._cliente.scan_iter(match=self.prefijo + '*'))
+        if claves:
+            self._cliente.delete(*claves)
+
+    def estadisticas(self):
+        return {'backend': 'redis', 'aciertos': self.aciertos, 'fallos': self.fallos}
+
+
+def obtener_cache():
+    """Caché de la aplicación actual, creada en el primer uso según CACHE_BACKEND"""
+    cache = current_app.extensions.get('synapse_cache')
+    if cache is None:
+        ttl = current_app.config.get('CACHE_TTL_SEGUNDOS', 300)
+        if current_app.config.get('CACHE_BACKEND', 'local') == 'redis':
+            cache = CacheRedis(current_app.config['CACHE_REDIS_URL'], ttl=ttl)
+        else:
+            cache = CacheLocal(current_app.config.get('CACHE_MAX_ENTRADAS', 1024), ttl=ttl)
+        current_app.extensions['synapse_cache'] = cache
+    return cache
@@ -0,0 +1,43 @@
+import gzip
+
+from flask import request
+
+# Sufijo del ETag de la variante comprimida: un ETag fuerte identifica bytes exactos
+SUFIJO_GZIP = '-gz'
+
+TIPOS_COMPRIMIBLES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+
+def configurar_compresion(app):
+    """Comprime con gzip las respuestas de más de COMPRESION_MINIMO_BYTES si el cliente lo acepta.
+
+    Por debajo del umbral la cabecera gzip y el tiempo de CPU no compensan el ahorro.
+    """
+    if not app.config.get('COMPRESION_ACTIVA', True):
+        return
+    minimo = app.config.get('COMPRESION_MINIMO_BYTES', 1024)
+    nivel = app.config.get('COMPRESION_NIVEL', 6)
+
+    @app.after_request
+    def _comprimir(respuesta):
+        if respuesta.mimetype not in TIPOS_COMPRIMIBLES:
+            return respuesta
+        # Cachés intermedias: el cuerpo depende de Accept-Encoding
+        respuesta.vary.add('Accept-Encoding')
+
+        if (respuesta.status_code < 200 or respuesta.status_code in (204, 304)
+                or respuesta.direct_passthrough or respuesta.is_streamed
+                or 'Content-Encoding' in respuesta.headers
+                or request.accept_encodings['gzip'] <= 0):
+            return respuesta
+
+        datos = respuesta.get_data()
+        if len(datos) < minimo:
+            return respuesta
+
+        respuesta.set_data(gzip.compress(datos, compresslevel=nivel, mtime=0))
+        respuesta.headers['Content-Encoding'] = 'gzip'
+        etag, debil = respuesta.get_etag()
+        if etag:
+            respuesta.set_etag(etag + SUFIJO_GZIP, weak=debil)
+        return respuesta
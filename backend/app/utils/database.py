@@ -0,0 +1,136 @@
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+
+def opciones_motor(config):
+    """SQLALCHEMY_ENGINE_OPTIONS a partir de los DB_* de la configuración y del dialecto.
+
+    Las claves que la configuración ya defina en SQLALCHEMY_ENGINE_OPTIONS tienen prioridad.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    explicitas = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            # Una sola conexión compartida: la base en memoria vive mientras viva ella
+            opciones = {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+        else:
+            # Espera a nivel de driver; el PRAGMA busy_timeout se fija además al conectar
+            opciones = {'connect_args': {'timeout': config.get('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000}}
+    else:
+        opciones = {
+            'pool_size': config.get('DB_POOL_SIZE', 10),
+            'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+            'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+            'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        }
+        if config.get('DB_ISOLATION_LEVEL'):
+            opciones['isolation_level'] = config['DB_ISOLATION_LEVEL']
+
+    opciones.update(explicitas)
+    return opciones
+
+
+def instrumentar_motor(app, db):
+    """Ajustes por conexión (PRAGMA de SQLite, timeout de sentencias) y contadores del pool"""
+    with app.app_context():
+        motores = list(db.engines.values())
+    for motor in motores:
+        if motor.dialect.name == 'sqlite':
+            event.listen(motor, 'connect', _pragmas_sqlite(app.config))
+        elif motor.dialect.name in ('mysql', 'mariadb') and app.config.get('DB_STATEMENT_TIMEOUT_MS'):
+            event.listen(motor, 'connect', _timeout_mysql(app.config['DB_STATEMENT_TIMEOUT_MS']))
+        _ContadoresPool.de(motor)
+
+
+def estadisticas_pool(motor):
+    """Estado del pool: ocupación actual (QueuePool) y contadores desde el arranque"""
+    pool = motor.pool
+    datos = {'clase': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        datos.update({
+            'tamaño': pool.size(),
+            'en_uso': pool.checkedout(),
+            'libres': pool.checkedin(),
+            'desbordamiento': max(pool.overflow(), 0),
+            'max_desbordamiento': pool._max_overflow,
+        })
+    datos.update(_ContadoresPool.de(motor).leer())
+    return datos
+
+
+def _pragmas_sqlite(config):
+    pragmas = [f"PRAGMA busy_timeout = {int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}"]
+    if config.get('SQLITE_SYNCHRONOUS'):
+        pragmas.append(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+    modo = config.get('SQLITE_JOURNAL_MODE')
+
+    def aplicar(conexion_dbapi, registro):
+        cursor = conexion_dbapi.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            # WAL solo tiene sentido en archivo (lecturas concurrentes con una escritura)
+            if modo and cursor.execute('PRAGMA database_list').fetchone()[2]:
+                cursor.execute(f'PRAGMA journal_mode = {modo}')
+        finally:
+            cursor.close()
+    return aplicar
+
+
+def _timeout_mysql(milisegundos):
+    def aplicar(conexion_dbapi, registro):
+        cursor = conexion_dbapi.cursor()
+        try:
+            # MariaDB limita cualquier sentencia (segundos); MySQL solo los SELECT (milisegundos)
+            if 'mariadb' in conexion_dbapi.get_server_info().lower():
+                cursor.execute(f'SET SESSION max_statement_time = {milisegundos / 1000:.3f}')
+            else:
+                cursor.execute(f'SET SESSION max_execution_time = {int(milisegundos)}')
+        finally:
+            cursor.close()
+    return aplicar
+
+
+class _ContadoresPool:
+    """Contadores acumulados a partir de los eventos del pool de un motor"""
+
+    def __init__(self, motor):
+        self._lock = threading.Lock()
+        self._datos = dict.fromkeys(
+            ('conexiones_abiertas', 'checkouts', 'invalidadas', 'max_en_uso'), 0
+        )
+        self._en_uso = 0
+        event.listen(motor, 'connect', lambda *a: self._sumar('conexiones_abiertas'))
+        event.listen(motor, 'checkout', self._checkout)
+        event.listen(motor, 'checkin', self._checkin)
+        event.listen(motor, 'invalidate', lambda *a: self._sumar('invalidadas'))
+
+    @classmethod
+    def de(cls, motor):
+        contadores = getattr(motor, '_synapse_contadores', None)
+        if contadores is None:
+            contadores = motor._synapse_contadores = cls(motor)
+        return contadores
+
+    def leer(self):
+        with self._lock:
+            return dict(self._datos)
+
+    def _sumar(self, clave):
+        with self._lock:
+            self._datos[clave] += 1
+
+    def _checkout(self, *args):
+        with self._lock:
+            self._datos['checkouts'] += 1
+            self._en_uso += 1
+            self._datos['max_en_uso'] = max(self._datos['max_en_uso'], self._en_uso)
+
+    def _checkin(self, *args):
+        with self._lock:
+            self._en_uso = max(self._en_uso - 1, 0)
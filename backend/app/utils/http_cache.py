@@ -0,0 +1,74 @@
+import hashlib
+from datetime import date, datetime, timezone
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.services.version_service import VersionService
+from app.utils.compression import SUFIJO_GZIP
+
+
+def condicional(*colecciones):
+    """GET condicional para rutas que solo leen colecciones del usuario autenticado.
+
+    El ETag (fuerte) se calcula con las versiones de las colecciones (ver VersionService),
+    el usuario, la ruta con su query string y el día actual; si coincide con If-None-Match
+    se responde 304 sin ejecutar la vista. Va debajo de @jwt_required().
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            usuario_id = get_jwt_identity()
+            versiones, ultimo = VersionService.versiones(usuario_id, colecciones)
+            etag = calcular_etag(usuario_id, versiones)
+            modificado = _last_modified(ultimo)
+
+            coincidente = _no_modificado(etag, modificado)
+            if coincidente:
+                respuesta = current_app.response_class(status=304)
+                etag = coincidente
+            else:
+                respuesta = current_app.make_response(vista(*args, **kwargs))
+                if respuesta.status_code != 200:
+                    return respuesta
+            respuesta.set_etag(etag)
+            if modificado:
+                respuesta.last_modified = modificado
+            # El navegador guarda la respuesta pero revalida siempre
+            respuesta.headers['Cache-Control'] = 'private, no-cache'
+            return respuesta
+        return envoltura
+    return decorador
+
+
+def calcular_etag(usuario_id, versiones):
+    """Huella de la representación: mismas versiones, usuario, URL y día => mismo cuerpo"""
+    partes = [usuario_id, request.path, request.query_string.decode(), date.today().isoformat()]
+    partes += [f'{coleccion}={versiones[coleccion]}' for coleccion in sorted(versiones)]
+    return hashlib.blake2b('|'.join(partes).encode(), digest_size=12).hexdigest()
+
+
+def _last_modified(ultimo):
+    """Último cambio redondeado a segundos, o None si aún puede cambiar dentro del mismo segundo.
+
+    Last-Modified tiene resolución de segundos: anunciarlo para un cambio del segundo en curso
+    permitiría un 304 con datos viejos si llega otra escritura en ese mismo segundo.
+    """
+    if ultimo is None or (datetime.utcnow() - ultimo).total_seconds() < 1:
+        return None
+    return ultimo.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def _no_modificado(etag, modificado):
+    """ETag con el que responder 304 (la variante que tiene el cliente) o None"""
+    if request.if_none_match:
+        # El cliente puede guardar la variante gzip (ver utils/compression.py)
+        for variante in (etag, etag + SUFIJO_GZIP):
+            if request.if_none_match.contains(variante):
+                return variante
+        return None
+    # If-Modified-Since solo cuenta si el cliente no envió ETag (RFC 9110)
+    if modificado and request.if_modified_since and modificado <= request.if_modified_since:
+        return etag
+    return None
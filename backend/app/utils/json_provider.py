@@ -0,0 +1,85 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional: sin ella se usa el json de la biblioteca estándar
+    orjson = None
+
+
+def _por_defecto(o):
+    """Tipos que no son JSON nativo. Fechas en ISO 8601, igual que los to_dict() de los modelos"""
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+class JSONProviderEstandar(DefaultJSONProvider):
+    """Proveedor de Flask con el json estándar; solo cambia las fechas a ISO 8601"""
+
+    nombre = 'estandar'
+    default = staticmethod(_por_defecto)
+
+
+class JSONProviderOrjson(DefaultJSONProvider):
+    """Proveedor sobre orjson: serializa en C y escribe bytes directamente en la respuesta.
+
+    datetime, date y UUID los convierte orjson sin pasar por Python. A diferencia del json
+    estándar no escapa los caracteres no ASCII (el cuerpo sigue siendo UTF-8 válido).
+    """
+
+    nombre = 'orjson'
+
+    def dumps(self, obj, **kwargs):
+        return self._serializar(obj, sangria=kwargs.get('indent') is not None).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        sangria = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._serializar(obj, sangria) + b'\n', mimetype=self.mimetype)
+
+    def _serializar(self, obj, sangria=False):
+        opciones = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        if sangria:
+            opciones |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_por_defecto, option=opciones)
+        except TypeError:
+            # Enteros de más de 64 bits u otros casos que orjson no admite
+            return json.dumps(obj, default=_por_defecto, sort_keys=self.sort_keys).encode()
+
+
+PROVEEDORES = {'orjson': JSONProviderOrjson, 'estandar': JSONProviderEstandar}
+
+
+def configurar_json(app):
+    """Instala el proveedor JSON según JSON_PROVIDER ('auto', 'orjson' o 'estandar').
+
+    'auto' usa orjson si está instalado; pedir 'orjson' sin tenerlo instalado avisa en el log
+    y usa el estándar en vez de fallar al arrancar.
+    """
+    pedido = app.config.get('JSON_PROVIDER', 'auto')
+    if pedido not in ('auto', *PROVEEDORES):
+        raise ValueError(f'JSON_PROVIDER no soportado: {pedido}')
+
+    nombre = 'orjson' if pedido in ('auto', 'orjson') and orjson is not None else 'estandar'
+    if pedido == 'orjson' and orjson is None:
+        app.logger.warning('JSON_PROVIDER=orjson pero orjson no está instalado; se usa el json estándar')
+    app.json = PROVEEDORES[nombre](app)
+    return nombre
@@ -0,0 +1,67 @@
+import time
+
+from sqlalchemy.pool import StaticPool
+
+from ..models import db
+from ..services.busqueda_service import BusquedaUsuariosService
+from ..services.recompensa_service import RecompensaService
+from ..services.tecnica_service import TecnicaService
+from .metrics import tras_fork as _metricas_tras_fork
+
+# Recursos perezosos de app.extensions con hilos o sockets propios: un proceso hijo no
+# hereda los hilos del padre, así que tras el fork se descartan y se crean en el primer uso
+RECURSOS_POR_PROCESO = (
+    'synapse_eventos_pool', 'synapse_dashboard_pool', 'synapse_password_pool',
+    'synapse_accesos', 'synapse_eventos_redis',
+)
+
+
+def precalentar(app):
+    """Carga lo que pagaría la primera petición de cada worker y devuelve los ms por paso.
+
+    Catálogos cacheados (técnicas, reglas y catálogo de recompensas), backend de búsqueda y
+    tabla de rutas. Un paso que falla (p. ej. base aún sin migrar) se registra y no impide
+    arrancar. Al terminar se cierran las conexiones abiertas: con preload_app esto se ejecuta
+    en el maestro y ningún socket debe cruzar el fork.
+    """
+    pasos = (
+        ('tecnicas', TecnicaService.catalogo),
+        ('reglas_recompensa', RecompensaService.reglas),
+        ('catalogo_recompensas', RecompensaService.catalogo_al_dia),
+        ('busqueda', BusquedaUsuariosService.backend),
+        ('rutas', lambda: app.url_map.bind('localhost').match('/health')),
+    )
+    tiempos = {}
+    with app.app_context():
+        for nombre, paso in pasos:
+            inicio = time.perf_counter()
+            try:
+                paso()
+            except Exception:
+                db.session.rollback()
+                app.logger.warning('Precalentamiento: falló %s', nombre, exc_info=True)
+            tiempos[nombre] = round((time.perf_counter() - inicio) * 1000, 2)
+        db.session.remove()
+        _desechar_conexiones(cerrar=True)
+    app.logger.info('Precalentamiento en %.1f ms: %s', sum(tiempos.values()), tiempos)
+    return tiempos
+
+
+def tras_fork(app):
+    """post_fork de gunicorn con preload_app: el worker no reutiliza nada abierto en el maestro.
+
+    Las conexiones heredadas se olvidan sin cerrarlas (close=False): el socket es compartido
+    y cerrarlo desde el hijo cortaría el del maestro. Los pools de hilos se recrean al usarse.
+    """
+    with app.app_context():
+        _desechar_conexiones(cerrar=False)
+    for clave in RECURSOS_POR_PROCESO:
+        app.extensions.pop(clave, None)
+    _metricas_tras_fork(app)
+
+
+def _desechar_conexiones(cerrar):
+    for motor in db.engines.values():
+        # La base SQLite en memoria vive en su única conexión: desecharla la vaciaría
+        if not isinstance(motor.pool, StaticPool):
+            motor.dispose(close=cerrar)
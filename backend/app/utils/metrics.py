@@ -0,0 +1,224 @@
+import hmac
+import os
+import threading
+import time
+
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from .cache import CacheRedis
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+    )
+    from prometheus_client import multiprocess
+except ImportError:  # dependencia opcional: sin ella /metrics no se registra
+    multiprocess = None
+
+# Límites en segundos pensados para una API JSON: la mayoría de rutas responde en decenas de ms
+LATENCIA_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metricas = None
+_lock = threading.Lock()
+
+
+def modo_multiproceso():
+    """True si prometheus_client escribe en PROMETHEUS_MULTIPROC_DIR (varios workers de gunicorn).
+
+    La variable debe estar definida antes de arrancar el proceso: prometheus_client decide al
+    importarse si guarda los valores en memoria o en archivos mmap de ese directorio.
+    """
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir'))
+
+
+def marcar_worker_terminado(pid):
+    """Hook child_exit de gunicorn: retira los gauges 'live*' de un worker que ya no existe"""
+    if multiprocess is not None and modo_multiproceso():
+        multiprocess.mark_process_dead(pid)
+
+
+def tras_fork(app):
+    """post_fork de gunicorn con preload_app: el worker parte de lo que dejó el maestro.
+
+    En modo multiproceso cada worker escribe en archivos con su pid; al cambiar de pid
+    prometheus_client reabre los valores desde cero y la capacidad del pool se perdería.
+    Los fallos de caché del precalentamiento tampoco son del worker: no se cuentan.
+    """
+    if _metricas is None:
+        return
+    for nombre, capacidad in _metricas._capacidades.items():
+        _metricas.pool_capacidad.labels(nombre).set(capacidad)
+    cache = app.extensions.get('synapse_cache')
+    if cache is not None:
+        app.extensions['synapse_cache_vistos'] = {'aciertos': cache.aciertos, 'fallos': cache.fallos}
+
+
+class _Metricas:
+    """Métricas del proceso; se crean una sola vez aunque se construyan varias apps"""
+
+    def __init__(self):
+        self.duracion = Histogram(
+            'synapse_http_request_duration_seconds', 'Latencia de las peticiones HTTP',
+            ['blueprint', 'endpoint', 'method'], buckets=LATENCIA_BUCKETS
+        )
+        self.peticiones = Counter(
+            'synapse_http_requests_total', 'Peticiones HTTP respondidas',
+            ['blueprint', 'endpoint', 'method', 'status']
+        )
+        self.en_curso = Gauge(
+            'synapse_http_requests_in_flight', 'Peticiones HTTP en curso', multiprocess_mode='livesum'
+        )
+        self.pool_capacidad = Gauge(
+            'synapse_db_pool_capacity', 'Conexiones máximas del pool (tamaño más desbordamiento)',
+            ['engine'], multiprocess_mode='livesum'
+        )
+        self.pool_en_uso = Gauge(
+            'synapse_db_pool_checked_out', 'Conexiones del pool prestadas en este momento',
+            ['engine'], multiprocess_mode='livesum'
+        )
+        self.pool_conexiones = Counter(
+            'synapse_db_pool_connections', 'Conexiones nuevas abiertas contra la base', ['engine']
+        )
+        self.pool_invalidadas = Counter(
+            'synapse_db_pool_invalidations', 'Conexiones descartadas por error o desconexión', ['engine']
+        )
+        self.cache = Counter(
+            'synapse_cache_requests', 'Lecturas de la caché de la aplicación por resultado',
+            ['backend', 'result']
+        )
+        # Hijos por combinación de etiquetas: .labels() toma un lock y arma una tupla en cada llamada
+        self._hijos = {}
+        # Capacidad fijada por motor, para volver a publicarla en cada worker tras el fork
+        self._capacidades = {}
+
+    def hijos(self, blueprint, endpoint, metodo, estado):
+        clave = (endpoint, metodo, estado)
+        hijos = self._hijos.get(clave)
+        if hijos is None:
+            hijos = self._hijos[clave] = (
+                self.duracion.labels(blueprint, endpoint, metodo),
+                self.peticiones.labels(blueprint, endpoint, metodo, estado),
+            )
+        return hijos
+
+    def cache_hijo(self, backend, resultado):
+        clave = ('cache', backend, resultado)
+        hijo = self._hijos.get(clave)
+        if hijo is None:
+            hijo = self._hijos[clave] = self.cache.labels(backend, resultado)
+        return hijo
+
+
+def _obtener_metricas():
+    global _metricas
+    if _metricas is None:
+        with _lock:
+            if _metricas is None:
+                _metricas = _Metricas()
+    return _metricas
+
+
+def configurar_metricas(app, db):
+    """Expone METRICAS_RUTA en formato de texto de Prometheus.
+
+    - Histograma de latencia por blueprint, endpoint y método, y contador por código de estado.
+    - Peticiones en curso, conexiones del pool de cada motor y aciertos/fallos de la caché.
+    - Con PROMETHEUS_MULTIPROC_DIR cada worker escribe en archivos mmap de ese directorio y
+      la ruta agrega los de todos los procesos, responda el worker que responda.
+    - Con METRICAS_REQUIERE_TOKEN (producción) y sin METRICAS_TOKEN no se registra nada.
+    """
+    if not app.config.get('METRICAS_ACTIVAS', True):
+        return
+    if multiprocess is None:
+        app.logger.warning('METRICAS_ACTIVAS pero prometheus_client no está instalado; no se expone /metrics')
+        return
+    token = app.config.get('METRICAS_TOKEN')
+    if app.config.get('METRICAS_REQUIERE_TOKEN') and not token:
+        app.logger.warning('METRICAS_ACTIVAS sin METRICAS_TOKEN; no se expone /metrics')
+        return
+
+    metricas = _obtener_metricas()
+    ruta = app.config.get('METRICAS_RUTA', '/metrics')
+
+    with app.app_context():
+        motores = dict(db.engines)
+    for nombre, motor in motores.items():
+        _instrumentar_pool(metricas, nombre or 'default', motor)
+
+    @app.before_request
+    def _iniciar_medicion():
+        if request.path == ruta:
+            return
+        g.metricas_inicio = time.perf_counter()
+        metricas.en_curso.inc()
+
+    @app.after_request
+    def _registrar_peticion(respuesta):
+        inicio = g.get('metricas_inicio')
+        if inicio is None:
+            return respuesta
+        regla = request.url_rule
+        endpoint = request.endpoint if regla is not None else 'sin_ruta'
+        duracion, peticiones = metricas.hijos(
+            request.blueprint or '', endpoint, request.method, str(respuesta.status_code)
+        )
+        duracion.observe(time.perf_counter() - inicio)
+        peticiones.inc()
+        _contar_cache(metricas)
+        return respuesta
+
+    @app.teardown_request
+    def _cerrar_medicion(excepcion=None):
+        if g.pop('metricas_inicio', None) is not None:
+            metricas.en_curso.dec()
+
+    def exponer():
+        if token and not hmac.compare_digest(
+                request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return Response('no autorizado\n', status=401, mimetype='text/plain')
+        if modo_multiproceso():
+            registro = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registro)
+        else:
+            registro = REGISTRY
+        return Response(generate_latest(registro), mimetype=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule(ruta, 'metricas', exponer, methods=['GET'])
+
+
+def _instrumentar_pool(metricas, nombre, motor):
+    if getattr(motor, '_synapse_metricas', False):
+        return
+    motor._synapse_metricas = True
+    pool = motor.pool
+    if isinstance(pool, QueuePool):
+        metricas._capacidades[nombre] = pool.size() + max(pool._max_overflow, 0)
+        metricas.pool_capacidad.labels(nombre).set(metricas._capacidades[nombre])
+    en_uso = metricas.pool_en_uso.labels(nombre)
+    conexiones = metricas.pool_conexiones.labels(nombre)
+    invalidadas = metricas.pool_invalidadas.labels(nombre)
+    event.listen(motor, 'checkout', lambda *a: en_uso.inc())
+    event.listen(motor, 'checkin', lambda *a: en_uso.dec())
+    event.listen(motor, 'connect', lambda *a: conexiones.inc())
+    event.listen(motor, 'invalidate', lambda *a: invalidadas.inc())
+
+
+def _contar_cache(metricas):
+    """Pasa a los contadores lo que la caché del proceso acumuló desde la última petición"""
+    cache = current_app.extensions.get('synapse_cache')
+    if cache is None:
+        return
+    with _lock:
+        vistos = current_app.extensions.setdefault('synapse_cache_vistos', {'aciertos': 0, 'fallos': 0})
+        deltas = {}
+        for atributo in ('aciertos', 'fallos'):
+            actual = getattr(cache, atributo)
+            if actual > vistos[atributo]:
+                deltas[atributo] = actual - vistos[atributo]
+                vistos[atributo] = actual
+    if deltas:
+        backend = 'redis' if isinstance(cache, CacheRedis) else 'local'
+        for atributo, delta in deltas.items():
+            metricas.cache_hijo(backend, 'hit' if atributo == 'aciertos' else 'miss').inc(delta)
@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import date, datetime
+from urllib.parse import urlencode
+
+from flask import current_app, jsonify, request
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+
+class PaginacionError(ValueError):
+    """Parámetros de paginación o proyección inválidos (se responde con 400)"""
+
+
+def parametros_pagina():
+    """Lee limit y cursor de la query string aplicando el límite por defecto y el máximo"""
+    por_defecto = current_app.config.get('PAGINACION_LIMITE_DEFECTO', 50)
+    maximo = current_app.config.get('PAGINACION_LIMITE_MAXIMO', 200)
+
+    limite = request.args.get('limit', por_defecto)
+    try:
+        limite = int(limite)
+    except (TypeError, ValueError):
+        raise PaginacionError('limit debe ser un número entero')
+    if limite < 1:
+        raise PaginacionError('limit debe ser mayor que 0')
+
+    return min(limite, maximo), decodificar_cursor(request.args.get('cursor'))
+
+
+def codificar_cursor(valor_orden, valor_id):
+    """Cursor opaco con la posición (orden, id) de la última fila entregada"""
+    if isinstance(valor_orden, (datetime, date)):
+        valor_orden = valor_orden.isoformat()
+    crudo = json.dumps([valor_orden, valor_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """Devuelve (valor_orden, valor_id) o None si no se envió cursor"""
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        posicion = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError):
+        raise PaginacionError('cursor inválido')
+    # Una cadena o un objeto de dos elementos también se desempaquetarían
+    if not isinstance(posicion, list) or len(posicion) != 2:
+        raise PaginacionError('cursor inválido')
+    return posicion[0], posicion[1]
+
+
+def paginar(query, columna_orden, columna_id, limite, cursor):
+    """Aplica paginación keyset descendente sobre (columna_orden, columna_id).
+
+    Devuelve (filas, siguiente_cursor); siguiente_cursor es None en la última página.
+    """
+    if cursor:
+        try:
+            valor_orden = _convertir(columna_orden, cursor[0])
+            valor_id = _convertir(columna_id, cursor[1])
+        except (TypeError, ValueError):
+            raise PaginacionError('cursor inválido')
+        query = query.filter(or_(
+            columna_orden < valor_orden,
+            and_(columna_orden == valor_orden, columna_id < valor_id)
+        ))
+
+    filas = query.order_by(columna_orden.desc(), columna_id.desc()).limit(limite + 1).all()
+
+    siguiente = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        ultima = filas[-1]
+        siguiente = codificar_cursor(getattr(ultima, columna_orden.key), getattr(ultima, columna_id.key))
+    return filas, siguiente
+
+
+def campos_solicitados(modelo, excluidos=()):
+    """Lee fields= y lo valida contra las columnas del modelo; None si no se pidió proyección"""
+    crudo = request.args.get('fields')
+    if not crudo:
+        return None
+
+    campos = [c.strip() for c in crudo.split(',') if c.strip()]
+    columnas = set(modelo.__table__.columns.keys()) - set(excluidos)
+    desconocidos = [c for c in campos if c not in columnas]
+    if desconocidos:
+        raise PaginacionError(f"Campos no válidos: {', '.join(desconocidos)}")
+    return campos
+
+
+def proyectar(query, modelo, campos, requeridos=()):
+    """Limita el SELECT a las columnas pedidas (más las requeridas por el cursor)"""
+    if not campos:
+        return query
+    cargar = list(dict.fromkeys(list(campos) + [c.key for c in requeridos]))
+    return query.options(load_only(*[getattr(modelo, c) for c in cargar]))
+
+
+def serializar(objeto, campos):
+    """to_dict() completo o solo los campos proyectados"""
+    if not campos:
+        return objeto.to_dict()
+    resultado = {}
+    for campo in campos:
+        valor = getattr(objeto, campo)
+        resultado[campo] = valor.isoformat() if isinstance(valor, (datetime, date)) else valor
+    return resultado
+
+
+def respuesta_paginada(items, siguiente_cursor, limite):
+    """Lista JSON con el cursor de la página siguiente en cabeceras.
+
+    El cuerpo sigue siendo un arreglo para no romper a los clientes existentes.
+    """
+    respuesta = jsonify(items)
+    if siguiente_cursor:
+        argumentos = request.args.to_dict()
+        argumentos.update(cursor=siguiente_cursor, limit=limite)
+        respuesta.headers['X-Next-Cursor'] = siguiente_cursor
+        respuesta.headers['Link'] = f'<{request.base_url}?{urlencode(argumentos)}>; rel="next"'
+    return respuesta, 200
+
+
+def _convertir(columna, valor):
+    """Reconstruye el valor del cursor con el tipo de la columna; TypeError si no encaja"""
+    tipo = columna.type.python_type
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    if tipo is float and isinstance(valor, int) and not isinstance(valor, bool):
+        return float(valor)
+    if not isinstance(valor, tipo) or (isinstance(valor, bool) and tipo is not bool):
+        raise TypeError(f'se esperaba {tipo.__name__} en el cursor')
+    return valor
@@ -0,0 +1,135 @@
+import heapq
+import json
+import logging
+import random
+import time
+
+from flask import g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger('synapse.sql')
+
+
+class PerfilPeticion:
+    """Sentencias SQL de una petición: cuántas, tiempo total y las más lentas"""
+
+    def __init__(self, top=5):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tiempo_ms = 0.0
+        self.top = top
+        self._lentas = []  # heap mínimo de (ms, orden, sentencia)
+
+    def anotar(self, sentencia, ms):
+        self.consultas += 1
+        self.tiempo_ms += ms
+        entrada = (ms, self.consultas, sentencia)
+        if len(self._lentas) < self.top:
+            heapq.heappush(self._lentas, entrada)
+        elif ms > self._lentas[0][0]:
+            heapq.heapreplace(self._lentas, entrada)
+
+    def lentas(self, max_caracteres=300):
+        return [
+            {'ms': round(ms, 2), 'sentencia': _abreviar(sentencia, max_caracteres)}
+            for ms, _, sentencia in sorted(self._lentas, reverse=True)
+        ]
+
+
+def perfil_actual():
+    """Perfil SQL de la petición en curso o None fuera de una petición"""
+    return g.get('perfil_sql') if has_app_context() else None
+
+
+def configurar_perfil_sql(app, db):
+    """Cuenta y cronometra las sentencias de cada petición y registra las lentas.
+
+    - Con SQL_PERFIL_CABECERAS añade X-Query-Count y Server-Timing a cada respuesta.
+    - Sentencias de más de SQL_LENTA_MS (en peticiones, scripts o workers) y peticiones con
+      más de SQL_PETICION_MAX_CONSULTAS sentencias o más de SQL_PETICION_LENTA_MS en la base
+      se escriben como JSON en el logger 'synapse.sql', muestreadas con SQL_LENTA_MUESTREO.
+    """
+    if not app.config.get('SQL_PERFIL_ACTIVO', True):
+        return
+    umbral_ms = app.config.get('SQL_LENTA_MS', 200)
+    muestreo = app.config.get('SQL_LENTA_MUESTREO', 1.0)
+    max_consultas = app.config.get('SQL_PETICION_MAX_CONSULTAS', 50)
+    peticion_lenta_ms = app.config.get('SQL_PETICION_LENTA_MS', 500)
+    top = app.config.get('SQL_PERFIL_TOP', 5)
+    max_caracteres = app.config.get('SQL_LOG_MAX_CARACTERES', 1000)
+    cabeceras = app.config.get('SQL_PERFIL_CABECERAS', False)
+
+    # El inicio va en el contexto de ejecución de la sentencia y no en la conexión: si la
+    # sentencia falla no hay after_cursor_execute y no quedaría nada que desapilar
+    def antes(conexion, cursor, sentencia, parametros, contexto, executemany):
+        if contexto is not None:
+            contexto.synapse_sql_inicio = time.perf_counter()
+
+    def despues(conexion, cursor, sentencia, parametros, contexto, executemany):
+        inicio = getattr(contexto, 'synapse_sql_inicio', None)
+        if inicio is None:
+            return
+        ms = (time.perf_counter() - inicio) * 1000
+
+        perfil = perfil_actual()
+        if perfil is not None:
+            perfil.anotar(sentencia, ms)
+        if ms >= umbral_ms and random.random() < muestreo:
+            _registrar('sql_lenta', {
+                'ms': round(ms, 2),
+                'sentencia': _abreviar(sentencia, max_caracteres),
+                'executemany': executemany,
+            })
+
+    with app.app_context():
+        motores = list(db.engines.values())
+    for motor in motores:
+        event.listen(motor, 'before_cursor_execute', antes)
+        event.listen(motor, 'after_cursor_execute', despues)
+
+    @app.before_request
+    def _iniciar_perfil():
+        g.perfil_sql = PerfilPeticion(top)
+
+    @app.after_request
+    def _cerrar_perfil(respuesta):
+        perfil = g.pop('perfil_sql', None)
+        if perfil is None:
+            return respuesta
+        total_ms = (time.perf_counter() - perfil.inicio) * 1000
+
+        if cabeceras:
+            respuesta.headers['X-Query-Count'] = str(perfil.consultas)
+            respuesta.headers['Server-Timing'] = (
+                f'db;dur={perfil.tiempo_ms:.2f};desc="{perfil.consultas} consultas", app;dur={total_ms:.2f}'
+            )
+
+        motivo = None
+        if max_consultas and perfil.consultas > max_consultas:
+            motivo = 'muchas_consultas'
+        elif peticion_lenta_ms and perfil.tiempo_ms >= peticion_lenta_ms:
+            motivo = 'base_lenta'
+        if motivo and random.random() < muestreo:
+            _registrar('peticion_sql', {
+                'motivo': motivo,
+                'estado': respuesta.status_code,
+                'consultas': perfil.consultas,
+                'db_ms': round(perfil.tiempo_ms, 2),
+                'total_ms': round(total_ms, 2),
+                'lentas': perfil.lentas(max_caracteres),
+            })
+        return respuesta
+
+
+def _registrar(evento, datos):
+    registro = {'evento': evento}
+    if has_request_context():
+        registro.update(metodo=request.method, ruta=request.path, endpoint=request.endpoint)
+    registro.update(datos)
+    logger.warning(json.dumps(registro, ensure_ascii=False, default=str))
+
+
+def _abreviar(sentencia, max_caracteres):
+    """Una sola línea y longitud acotada (los parámetros nunca se registran)"""
+    plana = ' '.join(sentencia.split())
+    return plana if len(plana) <= max_caracteres else plana[:max_caracteres] + '…'
@@ -0,0 +1,102 @@
+"""Configuración de gunicorn para la API (gunicorn la lee sola desde este directorio):
+
+    gunicorn wsgi:app
+    GUNICORN_PERFIL=sync gunicorn wsgi:app
+
+Perfiles (GUNICORN_PERFIL):
+  - gthread (por defecto): núcleos + 1 workers con GUNICORN_THREADS hilos. Las peticiones
+    esperan sobre todo a la base, y los hilos la solapan sin multiplicar los procesos.
+  - sync: 2 × núcleos + 1 workers de un hilo. Aísla mejor las rutas pesadas en CPU (hash de
+    contraseñas) y necesita un proxy con buffer (nginx) delante.
+  - gevent: núcleos + 1 workers con GUNICORN_CONEXIONES greenlets. Para conexiones largas
+    (Socket.IO, long polling). Aplica el monkey-patching aquí, antes de importar la app.
+
+Comunes a todos los perfiles:
+  - preload_app (GUNICORN_PRELOAD): el maestro importa y precalienta la app una vez, y los
+    workers la heredan por fork (arranque más rápido y memoria compartida). Tras el fork,
+    cada worker desecha las conexiones y los pools de hilos heredados (utils/lifecycle.py).
+  - max_requests con jitter: cada worker se recicla tras unas GUNICORN_MAX_REQUESTS
+    peticiones, escalonadas para que no reinicien todos a la vez.
+  - WEB_CONCURRENCY fija el número de workers, GUNICORN_BIND la dirección de escucha.
+  - Con varios workers, PROMETHEUS_MULTIPROC_DIR debe apuntar a un directorio escribible.
+    Se vacía al arrancar el maestro.
+
+El pool de la base es por worker: DB_POOL_SIZE + DB_MAX_OVERFLOW debe cubrir sus hilos o
+greenlets concurrentes. Medir los perfiles con: python -m app.scripts.bench_gunicorn
+(resultados de referencia en docs/DESPLIEGUE.md)
+"""
+import glob
+import multiprocessing
+import os
+
+PERFILES = ('sync', 'gthread', 'gevent')
+
+perfil = os.environ.get('GUNICORN_PERFIL', 'gthread')
+if perfil not in PERFILES:
+    raise RuntimeError(f'GUNICORN_PERFIL debe ser uno de {PERFILES}, no {perfil!r}')
+
+if perfil == 'gevent':
+    # Antes de que el maestro importe la app con preload_app: socket, threading y PyMySQL
+    # (Python puro) pasan a ser cooperativos
+    from gevent import monkey
+    monkey.patch_all()
+
+nucleos = multiprocessing.cpu_count()
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = perfil
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * nucleos + 1 if perfil == 'sync' else nucleos + 1))
+if perfil == 'gthread':
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+if perfil == 'gevent':
+    worker_connections = int(os.environ.get('GUNICORN_CONEXIONES', 1000))
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# El latido de los workers en memoria: en discos lentos o contenedores un fsync lo retrasa
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG')  # '-' para stdout; sin log de accesos por defecto
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def on_starting(server):
+    # Archivos de una ejecución anterior: sus contadores se sumarían a los de esta
+    directorio = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directorio:
+        for archivo in glob.glob(os.path.join(directorio, '*.db')):
+            os.remove(archivo)
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        _precalentar(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from app.utils.lifecycle import tras_fork
+        tras_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _precalentar(worker.wsgi)
+
+
+def child_exit(server, worker):
+    from app.utils.metrics import marcar_worker_terminado
+    marcar_worker_terminado(worker.pid)
+
+
+def _precalentar(app):
+    if app.config.get('ARRANQUE_PRECALENTAR', True):
+        from app.utils.lifecycle import precalentar
+        precalentar(app)
@@ -0,0 +1,41 @@
+"""Rollup diario de progreso
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 13:24:10.412907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Dejar un solo registro por (usuario, día) antes de crear la restricción única.
+    # Los contadores se recalculan después con scripts/reconstruir_progreso.py.
+    # La subconsulta derivada evita el error 1093 de MariaDB al borrar de la misma tabla.
+    op.execute(
+        "DELETE FROM progreso WHERE id_progreso NOT IN ("
+        "SELECT id_progreso FROM (SELECT MIN(id_progreso) AS id_progreso "
+        "FROM progreso GROUP BY usuario_id, fecha) AS conservar)"
+    )
+
+    with op.batch_alter_table('progreso', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_progreso_usuario_fecha', ['usuario_id', 'fecha'])
+
+    with op.batch_alter_table('tarea', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fecha_completada', sa.DateTime(timezone=6), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('tarea', schema=None) as batch_op:
+        batch_op.drop_column('fecha_completada')
+
+    with op.batch_alter_table('progreso', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_progreso_usuario_fecha', type_='unique')
@@ -0,0 +1,56 @@
+"""Índices compuestos para los filtros más frecuentes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 13:31:02.734310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cada índice corresponde a un filtro real de las rutas; ver
+    # app/scripts/verificar_planes.py para la consulta que lo usa.
+    op.create_index('ix_tarea_usuario_estado', 'tarea', ['usuario_id', 'estado'], unique=False)
+    op.create_index('ix_tarea_usuario_fecha_creacion', 'tarea', ['usuario_id', 'fecha_creacion', 'id_tarea'], unique=False)
+    op.create_index('ix_tarea_sala_fecha_creacion', 'tarea', ['sala_id', 'fecha_creacion'], unique=False)
+    op.create_index('ix_tarea_fecha_completada', 'tarea', ['fecha_completada'], unique=False)
+    op.create_index('ix_sesion_usuario_fecha_inicio', 'sesion', ['usuario_id', 'fecha_inicio', 'id_sesion'], unique=False)
+    op.create_index('ix_sesion_usuario_estado', 'sesion', ['usuario_id', 'estado'], unique=False)
+    op.create_index('ix_sesion_tecnica', 'sesion', ['tecnica_id'], unique=False)
+    op.create_index('ix_sesion_fecha_inicio', 'sesion', ['fecha_inicio'], unique=False)
+    op.create_index('ix_sesiontecnicaparam_sesion', 'sesiontecnicaparam', ['id_sesion'], unique=False)
+    op.create_index('ix_salasesion_sesion', 'salasesion', ['id_sesion'], unique=False)
+    op.create_index('ix_usuariosala_sala_activo', 'usuariosala', ['id_sala', 'activo'], unique=False)
+    op.create_index('ix_sala_privada_fecha_creacion', 'sala', ['es_privada', 'fecha_creacion'], unique=False)
+    op.create_index('ix_tecnica_nombre', 'tecnica', ['nombre'], unique=False)
+    op.create_index('ix_tecnica_categoria', 'tecnica', ['categoria'], unique=False)
+    op.create_index('ix_recompensa_nombre', 'recompensa', ['nombre'], unique=False)
+    op.create_index('ix_recompensausuario_recompensa', 'recompensausuario', ['id_recompensa'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_recompensausuario_recompensa', table_name='recompensausuario')
+    op.drop_index('ix_recompensa_nombre', table_name='recompensa')
+    op.drop_index('ix_tecnica_categoria', table_name='tecnica')
+    op.drop_index('ix_tecnica_nombre', table_name='tecnica')
+    op.drop_index('ix_sala_privada_fecha_creacion', table_name='sala')
+    op.drop_index('ix_usuariosala_sala_activo', table_name='usuariosala')
+    op.drop_index('ix_salasesion_sesion', table_name='salasesion')
+    op.drop_index('ix_sesiontecnicaparam_sesion', table_name='sesiontecnicaparam')
+    op.drop_index('ix_sesion_fecha_inicio', table_name='sesion')
+    op.drop_index('ix_sesion_tecnica', table_name='sesion')
+    op.drop_index('ix_sesion_usuario_estado', table_name='sesion')
+    op.drop_index('ix_sesion_usuario_fecha_inicio', table_name='sesion')
+    op.drop_index('ix_tarea_fecha_completada', table_name='tarea')
+    op.drop_index('ix_tarea_sala_fecha_creacion', table_name='tarea')
+    op.drop_index('ix_tarea_usuario_fecha_creacion', table_name='tarea')
+    op.drop_index('ix_tarea_usuario_estado', table_name='tarea')
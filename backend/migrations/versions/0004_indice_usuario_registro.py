@@ -0,0 +1,25 @@
+"""Índice para el listado paginado de usuarios
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:02:47.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /api/usuarios pagina por (fecha_registro, id_usuario)
+    op.create_index('ix_usuario_fecha_registro', 'usuario', ['fecha_registro', 'id_usuario'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_usuario_fecha_registro', table_name='usuario')
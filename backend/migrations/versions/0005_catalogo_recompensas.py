@@ -0,0 +1,92 @@
+"""Tabla sistema_meta y siembra del catálogo de recompensas
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:21:09.402117
+
+"""
+import uuid
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# Catálogo del sistema en la versión 1, congelado: la migración no debe cambiar cuando
+# cambie RecompensaService. Las versiones siguientes se siembran con scripts/sembrar_catalogo.py
+# o con una migración nueva.
+VERSION_CATALOGO = '1'
+CATALOGO = [
+    # (nombre, descripcion, valor, requisitos)
+    ('Meditador Principiante', 'Completa tu primera meditación', 10, {'meditaciones_completadas': 1}),
+    ('Organizador Eficiente', 'Completa una tarea en el tiempo asignado', 25, {'tareas_completadas_tiempo': 1}),
+    ('Maestro del Pomodoro', 'Completa un ciclo completo de Pomodoro', 50, {'pomodoros_completos': 1}),
+    ('Productividad Extrema', 'Completa una tarea en la mitad del tiempo asignado', 100,
+     {'tareas_anticipadas_mitad_tiempo': 1}),
+    ('Concentración Total', 'Completa un Pomodoro con modo no distracción activo', 100,
+     {'pomodoros_sin_distraccion': 1}),
+    ('Meditador Dedicado', 'Completa 5 meditaciones', 10, {'meditaciones_completadas': 5}),
+    ('Meditador Persistente', 'Completa 10 meditaciones', 25, {'meditaciones_completadas': 10}),
+    ('Meditador Experto', 'Completa 25 meditaciones', 50, {'meditaciones_completadas': 25}),
+    ('Meditador Maestro', 'Completa 50 meditaciones', 50, {'meditaciones_completadas': 50}),
+    ('Meditador Guru', 'Completa 100 meditaciones', 100, {'meditaciones_completadas': 100}),
+]
+
+recompensa = sa.table('recompensa',
+    sa.column('id_recompensa', sa.String),
+    sa.column('nombre', sa.String),
+    sa.column('descripcion', sa.Text),
+    sa.column('tipo', sa.String),
+    sa.column('valor', sa.Integer),
+    sa.column('requisitos', sa.JSON),
+)
+sistema_meta = sa.table('sistema_meta',
+    sa.column('clave', sa.String),
+    sa.column('valor', sa.String),
+    sa.column('actualizado', sa.DateTime),
+)
+
+
+def upgrade():
+    op.create_table('sistema_meta',
+    sa.Column('clave', sa.String(length=100), nullable=False),
+    sa.Column('valor', sa.String(length=255), nullable=False),
+    sa.Column('actualizado', sa.DateTime(6), nullable=False),
+    sa.PrimaryKeyConstraint('clave')
+    )
+
+    # El catálogo se siembra aquí una sola vez en lugar de en cada verificación de recompensas.
+    # Las bases anteriores ya pueden tenerlo (se sembraba al verificar): se actualiza por nombre.
+    conexion = op.get_bind()
+    existentes = {
+        fila.nombre: fila.id_recompensa
+        for fila in conexion.execute(sa.select(recompensa.c.nombre, recompensa.c.id_recompensa).where(
+            recompensa.c.nombre.in_([nombre for nombre, *_ in CATALOGO])
+        ))
+    }
+    filas = [
+        {'nombre': nombre, 'descripcion': descripcion, 'tipo': 'puntos', 'valor': valor, 'requisitos': requisitos}
+        for nombre, descripcion, valor, requisitos in CATALOGO
+    ]
+    nuevas = [dict(fila, id_recompensa=str(uuid.uuid4())) for fila in filas if fila['nombre'] not in existentes]
+    if nuevas:
+        op.bulk_insert(recompensa, nuevas)
+    for fila in filas:
+        if fila['nombre'] in existentes:
+            op.execute(recompensa.update()
+                       .where(recompensa.c.id_recompensa == existentes[fila['nombre']]).values(**fila))
+
+    op.bulk_insert(sistema_meta, [
+        {'clave': 'catalogo_recompensas_version', 'valor': VERSION_CATALOGO, 'actualizado': datetime.utcnow()}
+    ])
+
+
+def downgrade():
+    # Las recompensas del catálogo se quedan: puede haber usuarios que ya las obtuvieron
+    op.drop_table('sistema_meta')
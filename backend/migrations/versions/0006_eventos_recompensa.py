@@ -0,0 +1,42 @@
+"""Bandeja de eventos para evaluar recompensas fuera de la petición
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 17:05:41.660218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('evento_recompensa',
+    sa.Column('id_evento', sa.String(length=36), nullable=False),
+    sa.Column('usuario_id', sa.String(length=36), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=False),
+    sa.Column('referencia_id', sa.String(length=36), nullable=True),
+    sa.Column('estado', sa.String(length=20), nullable=False),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('lote', sa.String(length=36), nullable=True),
+    sa.Column('reclamado', sa.DateTime(6), nullable=True),
+    sa.Column('resultado', sa.JSON(), nullable=True),
+    sa.Column('creado', sa.DateTime(6), nullable=False),
+    sa.Column('procesado', sa.DateTime(6), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id_usuario'], ),
+    sa.PrimaryKeyConstraint('id_evento')
+    )
+    op.create_index('ix_evento_recompensa_estado_creado', 'evento_recompensa', ['estado', 'creado'], unique=False)
+    op.create_index('ix_evento_recompensa_usuario_creado', 'evento_recompensa', ['usuario_id', 'creado', 'id_evento'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_evento_recompensa_usuario_creado', table_name='evento_recompensa')
+    op.drop_index('ix_evento_recompensa_estado_creado', table_name='evento_recompensa')
+    op.drop_table('evento_recompensa')
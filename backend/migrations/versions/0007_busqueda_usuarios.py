@@ -0,0 +1,119 @@
+"""Índice de búsqueda de usuarios (FTS5 / FULLTEXT / trigramas)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 18:12:03.815442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Nombres fijados aquí: la migración no importa la app
+TABLA_FTS = 'usuario_fts'
+INDICE_FULLTEXT = 'ft_usuario_busqueda'
+# Parte local del correo, la que se indexa junto con el username
+LOCAL = "substr({0}correo, 1, instr({0}correo || '@', '@') - 1)"
+
+usuario = sa.table('usuario',
+    sa.column('id_usuario', sa.String),
+    sa.column('username', sa.String),
+    sa.column('correo', sa.String),
+)
+usuario_ngrama = sa.table('usuario_ngrama',
+    sa.column('ngrama', sa.String),
+    sa.column('id_usuario', sa.String),
+)
+
+
+def upgrade():
+    op.create_table('usuario_ngrama',
+    sa.Column('ngrama', sa.String(length=3), nullable=False),
+    sa.Column('id_usuario', sa.String(length=36), nullable=False),
+    sa.ForeignKeyConstraint(['id_usuario'], ['usuario.id_usuario'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ngrama', 'id_usuario')
+    )
+    op.create_index('ix_usuario_ngrama_usuario', 'usuario_ngrama', ['id_usuario'], unique=False)
+
+    # Índice nativo de la base si lo soporta y carga inicial del backend que quede activo
+    dialecto = op.get_bind().dialect.name
+    if dialecto == 'sqlite' and _crear_fts5():
+        return
+    if dialecto in ('mysql', 'mariadb'):
+        # La propia base indexa las filas existentes y las que lleguen
+        op.execute(f'CREATE FULLTEXT INDEX {INDICE_FULLTEXT} ON usuario (username, correo)')
+        return
+    _cargar_ngramas()
+
+
+def downgrade():
+    conexion = op.get_bind()
+    dialecto = conexion.dialect.name
+    if dialecto == 'sqlite':
+        for sufijo in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {TABLA_FTS}_{sufijo}')
+        op.execute(f'DROP TABLE IF EXISTS {TABLA_FTS}')
+    elif dialecto in ('mysql', 'mariadb') and any(
+        indice['name'] == INDICE_FULLTEXT for indice in sa.inspect(conexion).get_indexes('usuario')
+    ):
+        op.execute(f'DROP INDEX {INDICE_FULLTEXT} ON usuario')
+
+    op.drop_index('ix_usuario_ngrama_usuario', table_name='usuario_ngrama')
+    op.drop_table('usuario_ngrama')
+
+
+def _crear_fts5():
+    """FTS5 con tokenizador trigram, triggers y carga inicial; False si SQLite no lo soporta"""
+    try:
+        op.execute(
+            f"CREATE VIRTUAL TABLE {TABLA_FTS} USING fts5("
+            f"id_usuario UNINDEXED, username, correo, tokenize='trigram')"
+        )
+    except sa.exc.OperationalError:
+        # SQLite sin FTS5 o anterior a 3.34 (sin tokenizador trigram)
+        return False
+    insertar = (
+        f"INSERT INTO {TABLA_FTS}(id_usuario, username, correo) "
+        f"VALUES (new.id_usuario, new.username, {LOCAL.format('new.')});"
+    )
+    borrar = f"DELETE FROM {TABLA_FTS} WHERE id_usuario = old.id_usuario;"
+    op.execute(f"CREATE TRIGGER {TABLA_FTS}_ai AFTER INSERT ON usuario BEGIN {insertar} END")
+    op.execute(f"CREATE TRIGGER {TABLA_FTS}_ad AFTER DELETE ON usuario BEGIN {borrar} END")
+    op.execute(f"CREATE TRIGGER {TABLA_FTS}_au AFTER UPDATE OF username, correo ON usuario BEGIN {borrar} {insertar} END")
+    op.execute(
+        f"INSERT INTO {TABLA_FTS}(id_usuario, username, correo) "
+        f"SELECT id_usuario, username, {LOCAL.format('')} FROM usuario"
+    )
+    return True
+
+
+def _cargar_ngramas(lote=5000):
+    """Trigramas en minúsculas del username y de la parte local del correo, por lotes"""
+    conexion = op.get_bind()
+    ultimo = ''
+    while True:
+        usuarios = conexion.execute(
+            sa.select(usuario.c.id_usuario, usuario.c.username, usuario.c.correo)
+            .where(usuario.c.id_usuario > ultimo).order_by(usuario.c.id_usuario).limit(lote)
+        ).all()
+        if not usuarios:
+            return
+        filas = [
+            {'ngrama': ngrama, 'id_usuario': u.id_usuario}
+            for u in usuarios
+            for ngrama in _trigramas(u.username or '') | _trigramas((u.correo or '').split('@', 1)[0])
+        ]
+        if filas:
+            op.bulk_insert(usuario_ngrama, filas)
+        ultimo = usuarios[-1].id_usuario
+
+
+def _trigramas(texto):
+    texto = texto.lower()
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
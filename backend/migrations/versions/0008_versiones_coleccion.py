@@ -0,0 +1,31 @@
+"""Versiones por usuario y colección para GET condicionales (ETag)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 19:02:41.207113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sin filas: todas las colecciones empiezan en versión 0 y avanzan con la primera escritura
+    op.create_table('coleccion_version',
+    sa.Column('usuario_id', sa.String(length=36), nullable=False),
+    sa.Column('coleccion', sa.String(length=30), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('actualizado', sa.DateTime(6), nullable=False),
+    sa.PrimaryKeyConstraint('usuario_id', 'coleccion')
+    )
+
+
+def downgrade():
+    op.drop_table('coleccion_version')
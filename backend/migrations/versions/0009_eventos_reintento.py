@@ -0,0 +1,26 @@
+"""Espera entre reintentos de los eventos de recompensa que fallan
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 21:14:08.532917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('evento_recompensa', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reintentar_desde', sa.DateTime(6), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('evento_recompensa', schema=None) as batch_op:
+        batch_op.drop_column('reintentar_desde')
@@ -0,0 +1,31 @@
+"""Índices lower() para la búsqueda de usuarios por prefijo sin distinguir mayúsculas
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 22:03:51.174406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MySQL/MariaDB comparan sin distinguir mayúsculas con la intercalación _ci de la columna
+    if op.get_bind().dialect.name in ('mysql', 'mariadb'):
+        return
+    op.create_index('ix_usuario_username_lower', 'usuario', [sa.text('lower(username)')], unique=False)
+    op.create_index('ix_usuario_correo_lower', 'usuario', [sa.text('lower(correo)')], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ('mysql', 'mariadb'):
+        return
+    op.drop_index('ix_usuario_correo_lower', table_name='usuario')
+    op.drop_index('ix_usuario_username_lower', table_name='usuario')
@@ -0,0 +1,162 @@
+"""Fixtures de la suite de presupuestos de rendimiento.
+
+Cada prueba recibe una app nueva de TestingConfig (SQLite en memoria) sembrada con
+tests/datos.py a cada tamaño de TAMAÑOS. Las llamadas hechas con el fixture `api` cuentan
+las sentencias SQL y el tiempo de la petición y fallan si superan el presupuesto declarado
+para su endpoint en tests/presupuestos.py.
+
+Variables de entorno:
+    PRESUPUESTO_FACTOR_TIEMPO  multiplica los presupuestos de tiempo (máquinas lentas); 0 los desactiva
+    PRESUPUESTO_REPETICIONES   veces que se repite cada GET para tomar la mediana del tiempo (3)
+"""
+import gc
+import os
+import statistics
+import time
+from urllib.parse import urlsplit
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db
+from app.services.acceso_service import AccesoService
+from tests.datos import sembrar
+from tests.presupuestos import PRESUPUESTOS, TAMAÑOS
+
+FACTOR_TIEMPO = float(os.environ.get('PRESUPUESTO_FACTOR_TIEMPO', 1))
+REPETICIONES = max(1, int(os.environ.get('PRESUPUESTO_REPETICIONES', 3)))
+
+# (endpoint, tamaño) -> (consultas, ms) máximos observados, para --presupuestos
+_observado = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption('--presupuestos', action='store_true',
+                     help='mostrar al final las consultas y el tiempo medidos por endpoint')
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption('--presupuestos') or not _observado:
+        return
+    terminalreporter.section('presupuestos por endpoint')
+    terminalreporter.write_line(
+        f"{'endpoint':<52}{'filas':>6}{'consultas':>11}{'máx':>5}{'ms':>9}{'máx':>7}")
+    for (endpoint, tamaño), (consultas, ms) in sorted(_observado.items()):
+        presupuesto = PRESUPUESTOS[endpoint]
+        terminalreporter.write_line(
+            f'{endpoint:<52}{tamaño:>6}{consultas:>11}{presupuesto.consultas:>5}{ms:>9.2f}{presupuesto.ms:>7}')
+
+
+class ClienteMedido:
+    """Cliente de pruebas que comprueba el presupuesto del endpoint en cada llamada"""
+
+    def __init__(self, app, ids, tamaño, token):
+        self.app = app
+        self.ids = ids
+        self.tamaño = tamaño
+        self.cliente = app.test_client()
+        self.cabeceras = {'Authorization': f'Bearer {token}'}
+        self.rutas = app.url_map.bind('localhost')
+        self.sentencias = []
+        with app.app_context():
+            self.motor = db.engine
+        event.listen(self.motor, 'before_cursor_execute', self._capturar)
+
+    def _capturar(self, conexion, cursor, sentencia, parametros, contexto, executemany):
+        self.sentencias.append(sentencia)
+
+    def cerrar(self):
+        event.remove(self.motor, 'before_cursor_execute', self._capturar)
+
+    def llamar(self, metodo, ruta, json=None, estado=200, autenticado=True):
+        """Hace la petición y devuelve la respuesta; falla si el estado o el presupuesto no cuadran.
+
+        Las consultas se cuentan en la primera llamada (cachés frías). Los GET se repiten
+        REPETICIONES veces y el tiempo comparado es la mediana.
+        """
+        ruta = ruta.format(**self.ids)
+        endpoint = self.rutas.match(urlsplit(ruta).path, method=metodo)[0]
+        presupuesto = PRESUPUESTOS.get(endpoint)
+        assert presupuesto is not None, f'{endpoint} no declara presupuesto en tests/presupuestos.py'
+
+        cabeceras = self.cabeceras if autenticado else {}
+        tiempos = []
+        # Sin recolector durante la medición, como timeit: sus pausas no son de la ruta
+        gc.disable()
+        try:
+            for i in range(REPETICIONES if metodo == 'GET' else 1):
+                self.sentencias.clear()
+                inicio = time.perf_counter()
+                respuesta = self.cliente.open(ruta, method=metodo, json=json, headers=cabeceras)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                if i == 0:
+                    primera, sentencias = respuesta, list(self.sentencias)
+        finally:
+            gc.enable()
+
+        assert primera.status_code == estado, \
+            f'{metodo} {ruta}: {primera.status_code} en vez de {estado}: {primera.get_data(as_text=True)[:300]}'
+
+        consultas, ms = len(sentencias), statistics.median(tiempos)
+        clave = (endpoint, self.tamaño)
+        anterior = _observado.get(clave, (0, 0.0))
+        _observado[clave] = (max(anterior[0], consultas), max(anterior[1], ms))
+
+        assert consultas <= presupuesto.consultas, (
+            f'{metodo} {ruta}: {consultas} consultas con {self.tamaño} filas '
+            f'(presupuesto {presupuesto.consultas}):\n' + '\n'.join(' '.join(s.split())[:160] for s in sentencias)
+        )
+        if FACTOR_TIEMPO:
+            limite = presupuesto.ms * FACTOR_TIEMPO
+            assert ms <= limite, f'{metodo} {ruta}: {ms:.1f} ms con {self.tamaño} filas (presupuesto {limite:.0f} ms)'
+        return primera
+
+    def get(self, ruta, **kwargs):
+        return self.llamar('GET', ruta, **kwargs)
+
+    def post(self, ruta, json=None, **kwargs):
+        return self.llamar('POST', ruta, json=json, **kwargs)
+
+    def put(self, ruta, json=None, **kwargs):
+        return self.llamar('PUT', ruta, json=json, **kwargs)
+
+    def patch(self, ruta, json=None, **kwargs):
+        return self.llamar('PATCH', ruta, json=json, **kwargs)
+
+    def delete(self, ruta, **kwargs):
+        return self.llamar('DELETE', ruta, **kwargs)
+
+
+@pytest.fixture(params=TAMAÑOS, ids=lambda tamaño: f'{tamaño}filas')
+def tamaño(request):
+    return request.param
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        # Los accesos pendientes se vuelcan ya: al salir del proceso la base en memoria no existe
+        AccesoService.volcar()
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def ids(app, tamaño):
+    with app.app_context():
+        return sembrar(db, tamaño)
+
+
+@pytest.fixture
+def api(app, ids, tamaño):
+    with app.app_context():
+        token = create_access_token(identity=ids['usuario'])
+    cliente = ClienteMedido(app, ids, tamaño, token)
+    yield cliente
+    cliente.cerrar()
@@ -0,0 +1,147 @@
+"""Datos de prueba deterministas a distintos tamaños.
+
+Con tamaño N el usuario principal tiene N tareas, N sesiones (con parámetros; una de cada
+tres grupal), N días de progreso, N eventos y la mitad de N recompensas obtenidas. Su sala
+tiene N participantes más, cada uno con una tarea en la sala, y hay N salas públicas ajenas.
+Las filas masivas se insertan en bloque: sembrar 200 no debe dominar el tiempo de la suite.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.models import (
+    Rol, Usuario, Tecnica, Tarea, Sesion, SesionTecnicaParam, Sala, UsuarioSala, SalaSesion,
+    Progreso, Recompensa, RecompensaUsuario, EventoRecompensa
+)
+from app.services.busqueda_service import BusquedaUsuariosService
+from app.services.password_service import PasswordService
+from app.services.recompensa_service import RecompensaService
+from app.utils import generate_uuid
+
+PASSWORD = 'Synapse/12345678'
+CORREO_PRINCIPAL = 'principal@synapse.com'
+ESTADOS_TAREA = ['Pendiente', 'EnProgreso', 'EnEspera', 'Completado']
+PRIORIDADES = ['baja', 'media', 'alta']
+
+
+def sembrar(db, tamaño):
+    """Siembra la base vacía y devuelve los ids que usan las rutas de las pruebas"""
+    azar = random.Random(tamaño)
+    ahora = datetime.utcnow().replace(microsecond=0)
+
+    rol = Rol(nombre='usuario')
+    db.session.add_all([rol, Rol(nombre='admin')])
+    db.session.flush()
+
+    principal = Usuario(username='principal', correo=CORREO_PRINCIPAL,
+                        password=PasswordService.generar(PASSWORD), rol_id=rol.id)
+    tecnicas = [
+        Tecnica(nombre='Pomodoro', categoria='productividad', duracion_estimada=25),
+        Tecnica(nombre='Meditación', categoria='bienestar', duracion_estimada=10),
+        Tecnica(nombre='Repaso espaciado', categoria='estudio'),
+    ]
+    db.session.add_all([principal, *tecnicas])
+    db.session.flush()
+    RecompensaService.sembrar_catalogo()
+
+    otros = [{
+        'id_usuario': generate_uuid(), 'username': f'participante{i}', 'correo': f'participante{i}@synapse.com',
+        'password': principal.password, 'rol_id': rol.id, 'activo': True,
+        'fecha_registro': ahora - timedelta(days=i + 1)
+    } for i in range(tamaño)]
+    db.session.execute(insert(Usuario.__table__), otros)
+
+    sala = Sala(nombre='Sala principal', creador_id=principal.id_usuario, max_participantes=tamaño + 10)
+    db.session.add(sala)
+    db.session.flush()
+    db.session.execute(insert(UsuarioSala.__table__), [
+        {'id_usuario': principal.id_usuario, 'id_sala': sala.id_sala, 'rol_en_sala': 'lider',
+         'activo': True, 'fecha_union': ahora},
+        *[{'id_usuario': otro['id_usuario'], 'id_sala': sala.id_sala, 'rol_en_sala': 'invitado',
+           'activo': True, 'fecha_union': ahora} for otro in otros]
+    ])
+    db.session.execute(insert(Sala.__table__), [{
+        'id_sala': generate_uuid(), 'nombre': f'Sala pública {i}', 'creador_id': otro['id_usuario'],
+        'es_privada': False, 'estado': 'activa', 'fecha_creacion': ahora - timedelta(hours=i)
+    } for i, otro in enumerate(otros)])
+
+    tareas = []
+    for i in range(tamaño):
+        estado = azar.choice(ESTADOS_TAREA)
+        creada = ahora - timedelta(hours=i)
+        tareas.append({
+            'id_tarea': generate_uuid(), 'usuario_id': principal.id_usuario,
+            'sala_id': sala.id_sala if i % 2 else None, 'titulo': f'Tarea {i}', 'estado': estado,
+            'prioridad': azar.choice(PRIORIDADES), 'completada': estado == 'Completado',
+            'fecha_creacion': creada, 'fecha_vencimiento': creada.date() + timedelta(days=azar.randint(-3, 10)),
+            'fecha_completada': creada + timedelta(hours=1) if estado == 'Completado' else None
+        })
+    db.session.execute(insert(Tarea.__table__), tareas)
+    db.session.execute(insert(Tarea.__table__), [{
+        'id_tarea': generate_uuid(), 'usuario_id': otro['id_usuario'], 'sala_id': sala.id_sala,
+        'titulo': f'Tarea de {otro["username"]}', 'estado': 'Pendiente', 'prioridad': 'media',
+        'completada': False, 'fecha_creacion': ahora - timedelta(minutes=i)
+    } for i, otro in enumerate(otros)])
+
+    sesiones, parametros, salas_sesion = [], [], []
+    for i in range(tamaño):
+        inicio = ahora - timedelta(days=i % 30, hours=i)
+        duracion = azar.randint(10, 60)
+        sesion_id = generate_uuid()
+        sesiones.append({
+            'id_sesion': sesion_id, 'usuario_id': principal.id_usuario,
+            'tecnica_id': tecnicas[i % len(tecnicas)].id_tecnica, 'fecha_inicio': inicio,
+            'fecha_fin': inicio + timedelta(minutes=duracion), 'duracion_real': duracion,
+            'estado': 'Completado', 'completada': True, 'es_grupal': i % 3 == 0
+        })
+        parametros += [
+            {'id_sesion': sesion_id, 'parametro': 'ciclos_objetivo', 'valor': '4'},
+            {'id_sesion': sesion_id, 'parametro': 'modo_no_distraccion', 'valor': str(i % 2 == 0)},
+        ]
+        if i % 3 == 0:
+            salas_sesion.append({'id_sesion': sesion_id, 'id_sala': sala.id_sala})
+    db.session.execute(insert(Sesion.__table__), sesiones)
+    db.session.execute(insert(SesionTecnicaParam.__table__), parametros)
+    db.session.execute(insert(SalaSesion.__table__), salas_sesion)
+
+    hoy = date.today()
+    db.session.execute(insert(Progreso.__table__), [{
+        'id_progreso': generate_uuid(), 'usuario_id': principal.id_usuario, 'fecha': hoy - timedelta(days=i),
+        'tareas_completadas': azar.randint(0, 3), 'sesiones_completadas': azar.randint(0, 3),
+        'sesiones_realizadas': azar.randint(0, 3), 'minutos_estudio': azar.randint(0, 120),
+        'puntos_acumulados': 0
+    } for i in range(tamaño)])
+
+    recompensas = [{
+        'id_recompensa': generate_uuid(), 'nombre': f'Constancia {i}', 'tipo': 'puntos', 'valor': 10,
+        'requisitos': {'sesiones_completadas': i + 1}
+    } for i in range(tamaño)]
+    db.session.execute(insert(Recompensa.__table__), recompensas)
+    db.session.execute(insert(RecompensaUsuario.__table__), [{
+        'id_usuario': principal.id_usuario, 'id_recompensa': recompensa['id_recompensa'],
+        'fecha_obtenida': ahora - timedelta(days=i), 'consumida': False
+    } for i, recompensa in enumerate(recompensas[:tamaño // 2])])
+
+    db.session.execute(insert(EventoRecompensa.__table__), [{
+        'id_evento': generate_uuid(), 'usuario_id': principal.id_usuario, 'tipo': 'sesion_finalizada',
+        'referencia_id': sesion['id_sesion'], 'estado': 'Procesado', 'intentos': 1,
+        'resultado': {'otorgadas': []}, 'creado': sesion['fecha_inicio'], 'procesado': sesion['fecha_inicio']
+    } for sesion in sesiones])
+
+    # Los usuarios insertados en bloque no pasan por el ORM que mantiene el índice n-grama
+    if BusquedaUsuariosService.backend() == 'ngram':
+        BusquedaUsuariosService.reconstruir(db.session.connection(), 'ngram')
+    db.session.commit()
+
+    return {
+        'usuario': principal.id_usuario,
+        'otro_usuario': otros[0]['id_usuario'],
+        'tarea': tareas[0]['id_tarea'],
+        'sesion': sesiones[0]['id_sesion'],
+        'sala': sala.id_sala,
+        'sala_publica': db.session.query(Sala.id_sala).filter(Sala.creador_id == otros[0]['id_usuario']).scalar(),
+        'tecnica': tecnicas[0].id_tecnica,
+        'recompensa': recompensas[-1]['id_recompensa'],
+        'recompensa_obtenida': recompensas[0]['id_recompensa'],
+    }
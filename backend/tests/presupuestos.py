@@ -0,0 +1,88 @@
+"""Presupuesto de cada endpoint: sentencias SQL máximas y milisegundos máximos.
+
+El presupuesto de consultas es el mismo en todos los tamaños de TAMAÑOS: una consulta por
+fila (N+1) lo rompe con el tamaño grande. El de tiempo se fija para el tamaño grande sobre
+SQLite en memoria; en máquinas lentas se relaja con PRESUPUESTO_FACTOR_TIEMPO.
+
+Al añadir una ruta hay que declarar aquí su presupuesto (test_cobertura lo exige).
+"""
+from dataclasses import dataclass
+
+TAMAÑOS = (5, 200)
+
+
+@dataclass(frozen=True)
+class Presupuesto:
+    consultas: int
+    ms: float
+
+
+PRESUPUESTOS = {
+    'auth.change_password': Presupuesto(2, 50),
+    'auth.get_current_user': Presupuesto(2, 50),
+    'auth.login': Presupuesto(2, 50),
+    'auth.register': Presupuesto(7, 50),
+    'dashboard.get_dashboard': Presupuesto(9, 50),
+    'meditacion_controller.iniciar_meditacion': Presupuesto(9, 50),
+    'pomodoro_controller.iniciar_pomodoro': Presupuesto(9, 100),
+    'progreso.actualizar_progreso': Presupuesto(8, 50),
+    'progreso.get_estadisticas_generales': Presupuesto(6, 50),
+    'progreso.get_progreso': Presupuesto(2, 50),
+    'progreso.get_progreso_hoy': Presupuesto(1, 50),
+    'progreso.get_progreso_mes': Presupuesto(2, 50),
+    'progreso.get_progreso_semana': Presupuesto(2, 50),
+    'recompensa.consumir_recompensa': Presupuesto(3, 50),
+    'recompensa.consumir_recompensa_patch': Presupuesto(3, 50),
+    'recompensa.create_recompensa': Presupuesto(3, 50),
+    'recompensa.delete_recompensa': Presupuesto(4, 50),
+    'recompensa.get_mis_recompensas': Presupuesto(2, 50),
+    'recompensa.get_recompensa': Presupuesto(1, 50),
+    'recompensa.get_recompensas': Presupuesto(1, 50),
+    'recompensa.get_recompensas_disponibles': Presupuesto(5, 50),  # obtenidas como subconsulta, no por recompensa
+    'recompensa.update_recompensa': Presupuesto(4, 50),
+    'recompensa_controller.listar_eventos': Presupuesto(1, 50),
+    'recompensa_controller.obtener_evento': Presupuesto(1, 50),
+    'recompensa_controller.verificar_recompensas_automaticas': Presupuesto(11, 200),  # agregados e inserción en bloque
+    'sala.actualizar_usuario_sala': Presupuesto(1, 50),
+    'sala.create_sala': Presupuesto(3, 50),
+    'sala.delete_sala': Presupuesto(9, 50),
+    'sala.get_sala': Presupuesto(3, 50),
+    'sala.get_salas': Presupuesto(1, 50),
+    'sala.get_salas_publicas': Presupuesto(1, 50),
+    'sala.salir_sala': Presupuesto(5, 50),
+    'sala.unirse_sala': Presupuesto(3, 50),
+    'sesion.create_sesion': Presupuesto(7, 50),
+    'sesion.delete_sesion': Presupuesto(9, 50),
+    'sesion.finalizar_sesion': Presupuesto(23, 200),  # incluye el evento procesado en modo sync
+    'sesion.get_estadisticas_sesiones': Presupuesto(6, 50),
+    'sesion.get_sesion': Presupuesto(3, 50),  # técnica por join, salas en una consulta
+    'sesion.get_sesiones': Presupuesto(3, 50),  # técnica por join, parámetros en una consulta
+    'sesion.iniciar_sesion': Presupuesto(4, 50),
+    'sesion.update_sesion': Presupuesto(12, 100),
+    'sistema.health_check': Presupuesto(1, 50),
+    'sistema.index': Presupuesto(0, 50),
+    'tarea.create_tarea': Presupuesto(4, 50),
+    'tarea.debug_tareas': Presupuesto(2, 50),
+    'tarea.delete_tarea': Presupuesto(3, 50),
+    'tarea.get_estadisticas_tareas': Presupuesto(3, 50),
+    'tarea.get_tarea': Presupuesto(2, 50),
+    'tarea.get_tareas': Presupuesto(2, 50),
+    'tarea.get_tareas_sala': Presupuesto(2, 50),  # autor de cada tarea en el mismo SELECT
+    'tarea.update_tarea': Presupuesto(23, 150),  # incluye el evento procesado en modo sync
+    'tecnica.create_tecnica': Presupuesto(4, 50),
+    'tecnica.delete_tecnica': Presupuesto(4, 50),
+    'tecnica.get_categorias': Presupuesto(1, 50),
+    'tecnica.get_tecnica': Presupuesto(1, 50),
+    'tecnica.get_tecnicas': Presupuesto(1, 50),
+    'tecnica.get_tecnicas_populares': Presupuesto(1, 50),
+    'tecnica.update_tecnica': Presupuesto(5, 50),
+    'todo_controller.obtener_listas_todo': Presupuesto(1, 50),
+    'usuario.create_usuario': Presupuesto(6, 50),
+    'usuario.delete_usuario': Presupuesto(2, 50),
+    'usuario.get_tareas_usuario': Presupuesto(3, 50),  # rol del solicitante si no es el propio usuario
+    'usuario.get_usuario': Presupuesto(2, 50),  # ídem con view=full
+    'usuario.get_usuarios': Presupuesto(3, 50),  # include=tareas: una consulta para toda la página, más el rol
+    # del solicitante si pide datos privados de otros (view=full, include=tareas)
+    'usuario.search_usuarios': Presupuesto(3, 50),
+    'usuario.update_usuario': Presupuesto(5, 50),
+}
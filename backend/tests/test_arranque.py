@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import create_app
+from app.services.tecnica_service import TecnicaService
+from app.utils.cache import obtener_cache
+from app.utils.lifecycle import RECURSOS_POR_PROCESO, precalentar, tras_fork
+
+
+def test_precalentar_llena_las_caches(app, ids):
+    tiempos = precalentar(app)
+    assert set(tiempos) == {'tecnicas', 'reglas_recompensa', 'catalogo_recompensas', 'busqueda', 'rutas'}
+    with app.app_context():
+        fallos = obtener_cache().fallos
+        assert len(TecnicaService.catalogo()['todas']) == 3
+        assert obtener_cache().fallos == fallos
+        assert 'synapse_busqueda_backend' in app.extensions
+
+
+def test_tras_fork_descarta_recursos_del_maestro(app, ids):
+    for clave in RECURSOS_POR_PROCESO:
+        app.extensions[clave] = object()
+    precalentar(app)
+    tras_fork(app)
+    assert not set(RECURSOS_POR_PROCESO) & set(app.extensions)
+    # La caché precalentada se conserva
+    assert 'synapse_cache' in app.extensions
+
+
+def test_seleccion_de_blueprints():
+    app = create_app('testing', blueprints='auth, tareas')
+    assert set(app.blueprints) == {'sistema', 'auth', 'tarea'}
+    assert set(create_app('testing').blueprints) >= {'sistema', 'auth', 'dashboard', 'pomodoro_controller'}
+    with pytest.raises(ValueError, match='inexistente'):
+        create_app('testing', blueprints=['auth', 'inexistente'])
+
+
+def test_sin_blueprints_de_la_api():
+    app = create_app('testing', blueprints='ninguno')
+    assert set(app.blueprints) == {'sistema'}
+    # Sin la API tampoco se inicializan sus extensiones
+    assert 'flask-jwt-extended' not in app.extensions
+    assert app.test_client().get('/health').status_code == 200
+
+
+def test_app_de_modelos_no_importa_la_capa_web():
+    # En un intérprete nuevo: en este ya están importados por las demás pruebas
+    codigo = ("import sys; from app import create_models_app; app = create_models_app('testing'); "
+              "print(sorted(m for m in sys.modules if m.startswith(('flask_migrate', 'flask_jwt_extended', "
+              "'prometheus_client', 'app.routes', 'app.controllers')))); "
+              "print('app.services.version_service' in sys.modules and not app.blueprints)")
+    salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    assert salida.split('\n')[:2] == ['[]', 'True']
@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+from app.services.password_service import HashOcupadoError, _PoolHash
+from app.services.usuario_service import UsuarioService
+from tests.datos import CORREO_PRINCIPAL, PASSWORD
+
+
+def test_login(api):
+    respuesta = api.post('/api/auth/login', {'correo': CORREO_PRINCIPAL, 'password': PASSWORD}, autenticado=False)
+    assert respuesta.json['access_token']
+    assert respuesta.json['usuario']['id_usuario'] == api.ids['usuario']
+
+
+def test_login_credenciales_invalidas(api):
+    api.post('/api/auth/login', {'correo': CORREO_PRINCIPAL, 'password': 'otra'}, estado=401, autenticado=False)
+
+
+def test_registro(api):
+    respuesta = api.post('/api/auth/register', {
+        'username': 'nuevo', 'correo': 'nuevo@synapse.com', 'password': PASSWORD
+    }, estado=201, autenticado=False)
+    assert respuesta.json['usuario']['correo'] == 'nuevo@synapse.com'
+
+
+def test_registro_correo_repetido(api):
+    api.post('/api/auth/register', {
+        'username': 'otro', 'correo': CORREO_PRINCIPAL, 'password': PASSWORD
+    }, estado=400, autenticado=False)
+
+
+def test_usuario_actual(api):
+    assert api.get('/api/auth/me').json['id_usuario'] == api.ids['usuario']
+
+
+def test_usuario_actual_con_tareas(api):
+    respuesta = api.get('/api/auth/me?include=tareas')
+    assert len(respuesta.json['tareas']) == min(api.tamaño, UsuarioService.TAREAS_POR_USUARIO)
+
+
+def test_cambiar_password(api):
+    api.put('/api/auth/change-password', {'current_password': PASSWORD, 'new_password': 'Synapse/87654321'})
+    api.post('/api/auth/login', {'correo': CORREO_PRINCIPAL, 'password': 'Synapse/87654321'}, autenticado=False)
+
+
+def test_pool_hash_limita_solo_la_espera():
+    pool = _PoolHash(1)
+    liberar = threading.Event()
+    ocupado = threading.Thread(target=pool.ejecutar, args=(liberar.wait, (), 1))
+    ocupado.start()
+    time.sleep(0.05)
+    with pytest.raises(HashOcupadoError):
+        pool.ejecutar(lambda: None, (), 0.05)
+    liberar.set()
+    ocupado.join()
+    # Un hash más largo que el plazo no se corta si empezó con el hilo libre
+    assert pool.ejecutar(lambda: time.sleep(0.1) or 'hecho', (), 0.05) == 'hecho'
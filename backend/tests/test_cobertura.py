@@ -0,0 +1,10 @@
+from tests.presupuestos import PRESUPUESTOS
+
+# Rutas que no pasan por la base: estáticos y el scrape de Prometheus
+SIN_PRESUPUESTO = {'static', 'metricas'}
+
+
+def test_todos_los_endpoints_declaran_presupuesto(app):
+    endpoints = {regla.endpoint for regla in app.url_map.iter_rules()} - SIN_PRESUPUESTO
+    assert endpoints - set(PRESUPUESTOS) == set(), 'endpoints sin presupuesto'
+    assert set(PRESUPUESTOS) - endpoints == set(), 'presupuestos de endpoints que ya no existen'
@@ -0,0 +1,17 @@
+import pytest
+
+
+def test_dashboard(api):
+    respuesta = api.get('/api/dashboard')
+    assert respuesta.is_json
+
+
+# Cada sección del dashboard debe coincidir con el endpoint que sustituye
+@pytest.mark.parametrize('seccion, ruta', [
+    ('estadisticas_sesiones', '/api/sesiones/estadisticas'),
+    ('semana', '/api/progreso/semana'),
+    ('mes', '/api/progreso/mes'),
+    ('estadisticas_generales', '/api/progreso/estadisticas-generales'),
+])
+def test_seccion_igual_a_su_endpoint(api, seccion, ruta):
+    assert api.get('/api/dashboard').json[seccion] == api.get(ruta).json
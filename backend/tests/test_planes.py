@@ -0,0 +1,28 @@
+import sqlite3
+
+from app.scripts.verificar_planes import tablas_recorridas, verificar_rutas
+
+
+def test_sin_recorridos_completos(api):
+    # Mismas rutas que scripts/verificar_planes.py, con los datos de cada tamaño
+    problemas, fallidas = verificar_rutas(api.app, api.cliente, api.cabeceras, api.ids)
+    assert fallidas == []
+    assert problemas == []
+
+
+def test_recorrido_por_indice_cuenta_salvo_los_permitidos():
+    conexion = sqlite3.connect(':memory:')
+    conexion.executescript(
+        'CREATE TABLE tarea (id INTEGER PRIMARY KEY, usuario_id TEXT, titulo TEXT);'
+        'CREATE INDEX ix_tarea_usuario ON tarea (usuario_id);'
+        'CREATE TABLE usuario (id_usuario TEXT PRIMARY KEY, fecha_registro TEXT, username TEXT);'
+        'CREATE INDEX ix_usuario_fecha_registro ON usuario (fecha_registro, id_usuario);'
+    )
+    assert tablas_recorridas(conexion, 'SELECT * FROM tarea WHERE usuario_id = ?', ('u',)) == set()
+    assert tablas_recorridas(conexion, 'SELECT * FROM tarea', ()) == {'tarea'}
+    # Índice entero (también cubriente) sin estar en INDICES_ORDENADOS
+    assert tablas_recorridas(conexion, 'SELECT * FROM tarea ORDER BY usuario_id', ()) == {'tarea'}
+    assert tablas_recorridas(conexion, 'SELECT usuario_id FROM tarea ORDER BY usuario_id', ()) == {'tarea'}
+    assert tablas_recorridas(
+        conexion, 'SELECT * FROM usuario ORDER BY fecha_registro, id_usuario LIMIT 5', ()
+    ) == set()
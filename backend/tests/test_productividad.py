@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from flask import g
+
+from app.models import db, EventoRecompensa, Recompensa
+from app.services.evento_service import EventoService
+from app.services.recompensa_service import RecompensaService
+
+
+def test_iniciar_pomodoro(api):
+    respuesta = api.post('/api/productividad/pomodoro/iniciar', {'ciclos_objetivo': 2}, estado=201)
+    assert respuesta.json['pomodoro']
+    api.post('/api/productividad/pomodoro/iniciar', {}, estado=400)
+
+
+def test_iniciar_meditacion(api):
+    respuesta = api.post('/api/bienestar/meditacion/iniciar', {'duracion': 5}, estado=201)
+    assert respuesta.json['meditacion']
+
+
+def test_listas_todo(api):
+    assert api.get('/api/productividad/todo/listas').is_json
+
+
+def test_eventos(api):
+    eventos = api.get('/api/gamificacion/eventos').json
+    assert len(eventos) == min(api.tamaño, 50)
+    evento = api.get(f"/api/gamificacion/eventos/{eventos[0]['id_evento']}").json
+    assert evento['estado'] == 'Procesado'
+
+
+def test_verificar_recompensas_automaticas(api):
+    assert api.post('/api/gamificacion/recompensas/verificar-automaticas').is_json
+
+
+def test_evento_fallido_espera_antes_de_reintentarse(app, ids, monkeypatch):
+    def fallar(usuario_id):
+        raise RuntimeError('sin base')
+
+    monkeypatch.setattr(RecompensaService, 'verificar_todas_recompensas_usuario', fallar)
+    with app.app_context():
+        id_evento = EventoService.emitir(ids['usuario'], 'tarea_completada')
+        db.session.commit()
+        # Un solo intento: el evento fallido no se vuelve a reclamar en el mismo barrido
+        assert EventoService.procesar_todo() == 1
+        evento = db.session.get(EventoRecompensa, id_evento)
+        assert (evento.estado, evento.intentos) == ('Pendiente', 1)
+        assert evento.reintentar_desde > datetime.utcnow()
+        assert EventoService.procesar_todo() == 0
+
+        # Vencida la espera se reintenta una vez por barrido, no hasta agotar los intentos
+        evento.reintentar_desde = datetime.utcnow()
+        db.session.commit()
+        assert EventoService.procesar_todo() == 1
+        db.session.expire_all()
+        assert db.session.get(EventoRecompensa, id_evento).intentos == 2
+
+
+def test_modo_sync_solo_procesa_los_eventos_de_la_peticion(api, app):
+    with app.app_context():
+        ajeno = EventoService.emitir(api.ids['otro_usuario'], 'sesion_finalizada')
+        db.session.commit()
+    api.put('/api/tareas/{tarea}', {'estado': 'Completado'})
+    with app.app_context():
+        assert db.session.get(EventoRecompensa, ajeno).estado == 'Pendiente'
+        assert EventoRecompensa.query.filter_by(usuario_id=api.ids['usuario'], estado='Pendiente').count() == 0
+
+
+def test_savepoint_deshecho_no_descarta_los_eventos(app, ids):
+    with app.test_request_context():
+        id_evento = EventoService.emitir(ids['usuario'], 'tarea_completada')
+        try:
+            with db.session.begin_nested():
+                db.session.add(Recompensa(nombre='Duplicada', tipo='puntos', valor=1, requisitos={}))
+                raise RuntimeError('reintento')
+        except RuntimeError:
+            pass
+        db.session.commit()
+        assert g.eventos_recompensa_sync == [id_evento]
+
+        # Deshacer la transacción externa sí los descarta
+        EventoService.emitir(ids['usuario'], 'tarea_completada')
+        db.session.rollback()
+        g.pop('eventos_recompensa_sync')
+        db.session.commit()
+        assert 'eventos_recompensa_sync' not in g
@@ -0,0 +1,27 @@
+from datetime import date
+
+
+def test_listar(api):
+    assert len(api.get('/api/progreso').json) == min(api.tamaño, 50)
+
+
+def test_hoy(api):
+    assert api.get('/api/progreso/hoy').json['fecha'] == date.today().isoformat()
+
+
+def test_semana(api):
+    assert api.get('/api/progreso/semana').is_json
+
+
+def test_mes(api):
+    hoy = date.today()
+    assert api.get(f'/api/progreso/mes?año={hoy.year}&mes={hoy.month}').is_json
+
+
+def test_estadisticas_generales(api):
+    assert api.get('/api/progreso/estadisticas-generales').is_json
+
+
+def test_actualizar(api):
+    respuesta = api.post('/api/progreso/actualizar')
+    assert respuesta.json['progreso']['fecha'] == date.today().isoformat()
@@ -0,0 +1,41 @@
+from app.services.recompensa_service import RecompensaService
+
+CATALOGO = len(RecompensaService.definiciones_catalogo())
+
+
+def test_listar(api):
+    assert len(api.get('/api/recompensas').json) == CATALOGO + api.tamaño
+
+
+def test_obtener(api):
+    assert api.get('/api/recompensas/{recompensa}').json['id_recompensa'] == api.ids['recompensa']
+
+
+def test_mis_recompensas(api):
+    assert len(api.get('/api/recompensas/mis-recompensas').json) == api.tamaño // 2
+
+
+def test_disponibles(api):
+    disponibles = api.get('/api/recompensas/disponibles').json
+    assert len(disponibles) == CATALOGO + api.tamaño - api.tamaño // 2
+    assert api.ids['recompensa_obtenida'] not in {r['id_recompensa'] for r in disponibles}
+
+
+def test_crear_actualizar_y_eliminar(api):
+    recompensa = api.post('/api/recompensas', {
+        'nombre': 'Nueva', 'valor': 5, 'requisitos': {'tareas_completadas': 3}
+    }, estado=201).json
+    ruta = f"/api/recompensas/{recompensa['id_recompensa']}"
+    assert api.put(ruta, {'valor': 15, 'tipo': 'tecnica'}).json['valor'] == 15
+    api.delete(ruta)
+    api.get(ruta, estado=404)
+
+
+def test_consumir(api):
+    api.post('/api/recompensas/consumir', {'recompensa_id': api.ids['recompensa_obtenida']})
+    api.post('/api/recompensas/consumir', {'recompensa_id': api.ids['recompensa']}, estado=404)
+
+
+def test_consumir_patch(api):
+    api.patch('/api/recompensas/consumir/{recompensa_obtenida}')
+    api.patch('/api/recompensas/consumir/{recompensa_obtenida}', estado=400)
@@ -0,0 +1,41 @@
+def test_listar(api):
+    salas = api.get('/api/salas').json
+    assert [sala['id_sala'] for sala in salas] == [api.ids['sala']]
+
+
+def test_listar_publicas(api):
+    # Las salas públicas ajenas más la principal, que también es pública
+    assert len(api.get('/api/salas/publicas').json) == min(api.tamaño + 1, 50)
+
+
+def test_obtener_con_participantes(api):
+    sala = api.get('/api/salas/{sala}').json
+    assert sala['total_participantes'] == api.tamaño + 1
+
+
+def test_crear_privada(api):
+    sala = api.post('/api/salas', {'nombre': 'Privada', 'es_privada': True}, estado=201).json
+    assert sala['codigo_acceso']
+
+
+def test_unirse_y_salir(api):
+    api.post('/api/salas/unirse', {'sala_id': api.ids['sala_publica']})
+    api.post('/api/salas/unirse', {'sala_id': api.ids['sala_publica']}, estado=400)
+    api.post('/api/salas/{sala_publica}/salir')
+    api.get('/api/salas/{sala_publica}', estado=403)
+
+
+def test_salir_transfiere_el_liderazgo(api):
+    api.post('/api/salas/{sala}/salir')
+    api.get('/api/salas/{sala}', estado=403)
+
+
+def test_actualizar_membresia(api):
+    api.put('/api/salas/{sala}/actualizar', {'rol_en_sala': 'lider'})
+
+
+def test_eliminar(api):
+    # Con participantes, tareas y sesiones grupales: las tareas quedan como personales
+    api.delete('/api/salas/{sala}')
+    assert api.get('/api/salas').json == []
+    assert api.get('/api/tareas/estadisticas').json['total'] == api.tamaño
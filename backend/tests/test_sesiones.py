@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+
+def test_listar(api):
+    sesiones = api.get('/api/sesiones').json
+    assert len(sesiones) == min(api.tamaño, 50)
+    assert all(sesion['tecnica'] and len(sesion['parametros']) == 2 for sesion in sesiones)
+
+
+def test_listar_proyectado(api):
+    sesiones = api.get('/api/sesiones?fields=id_sesion,estado&es_grupal=true').json
+    assert sesiones and set(sesiones[0]) == {'id_sesion', 'estado'}
+
+
+def test_obtener_grupal(api):
+    sesion = api.get('/api/sesiones/{sesion}').json
+    assert sesion['es_grupal'] and len(sesion['salas']) == 1
+    assert len(sesion['parametros']) == 2
+
+
+def test_estadisticas(api):
+    assert api.get('/api/sesiones/estadisticas').json['total_sesiones'] == api.tamaño
+
+
+def test_crear(api):
+    inicio = datetime.utcnow() - timedelta(minutes=30)
+    respuesta = api.post('/api/sesiones', {
+        'tecnica_id': api.ids['tecnica'], 'inicio': inicio.isoformat(), 'estado': 'Completado',
+        'fin': (inicio + timedelta(minutes=25)).isoformat(), 'parametros': [{'codigo': 'ciclos_objetivo', 'cantidad': 4}]
+    }, estado=201)
+    assert respuesta.json['tecnica_id'] == api.ids['tecnica']
+
+
+def test_iniciar_y_finalizar(api):
+    sesion = api.post('/api/sesiones/iniciar', {'tecnica_id': api.ids['tecnica']}, estado=201).json
+    api.post('/api/sesiones/iniciar', {'tecnica_id': api.ids['tecnica']}, estado=400)
+    respuesta = api.patch(f"/api/sesiones/{sesion['id_sesion']}/finalizar")
+    assert respuesta.json['sesion']['estado'] == 'Completado'
+    assert respuesta.json['evento_id']
+
+
+def test_actualizar(api):
+    respuesta = api.put('/api/sesiones/{sesion}', {
+        'estado': 'Completado', 'parametros': [{'codigo': 'ciclos_objetivo', 'cantidad': 6}]
+    })
+    assert respuesta.json['estado'] == 'Completado'
+
+
+def test_eliminar(api):
+    api.delete('/api/sesiones/{sesion}')
+    api.get('/api/sesiones/{sesion}', estado=404)
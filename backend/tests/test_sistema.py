@@ -0,0 +1,54 @@
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.config import ProductionConfig, TestingConfig
+from app.models import db
+from app.utils.sql_profiler import perfil_actual
+
+
+def test_index(api):
+    assert api.get('/', autenticado=False).json['endpoints']['auth'] == '/api/auth'
+
+
+def test_health(api):
+    assert api.get('/health', autenticado=False).json['database'] == 'connected'
+
+
+def test_health_sin_pool_en_produccion(monkeypatch):
+    if 'HEALTH_POOL' not in os.environ:
+        assert not ProductionConfig.HEALTH_POOL
+    monkeypatch.setattr(TestingConfig, 'HEALTH_POOL', False)
+    assert set(create_app('testing').test_client().get('/health').json) == {'status', 'database'}
+
+
+def test_metricas_exigen_token_donde_se_requiere(monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'METRICAS_REQUIERE_TOKEN', True)
+    monkeypatch.setattr(TestingConfig, 'METRICAS_TOKEN', None)
+    assert 'metricas' not in create_app('testing').view_functions
+
+    monkeypatch.setattr(TestingConfig, 'METRICAS_TOKEN', 'secreto')
+    cliente = create_app('testing').test_client()
+    assert cliente.get('/metrics').status_code == 401
+    assert cliente.get('/metrics', headers={'Authorization': 'Bearer secreto'}).status_code == 200
+
+
+def test_metricas_apagadas_por_defecto_en_produccion():
+    assert ProductionConfig.METRICAS_REQUIERE_TOKEN
+    if 'METRICAS_ACTIVAS' not in os.environ:
+        assert not ProductionConfig.METRICAS_ACTIVAS
+
+
+def test_perfil_sql_no_arrastra_sentencias_fallidas(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        with pytest.raises(OperationalError):
+            db.session.execute(text('SELECT * FROM tabla_inexistente'))
+        db.session.rollback()
+        db.session.execute(text('SELECT 1'))
+        # Solo cuenta la que terminó, y la fallida no deja nada en la conexión
+        assert perfil_actual().consultas == 1
+        assert 'synapse_sql_inicio' not in db.session.connection().info
@@ -0,0 +1,72 @@
+import base64
+from datetime import date, timedelta
+
+import pytest
+
+
+def test_listar(api):
+    respuesta = api.get('/api/tareas')
+    assert len(respuesta.json) == min(api.tamaño, 50)
+
+
+def test_listar_filtrado_y_proyectado(api):
+    pendientes = api.get('/api/tareas?estado=Pendiente').json
+    assert all(tarea['estado'] == 'Pendiente' for tarea in pendientes)
+    proyectadas = api.get('/api/tareas?limit=10&fields=id_tarea,titulo').json
+    assert set(proyectadas[0]) == {'id_tarea', 'titulo'}
+
+
+def test_paginar_hasta_el_final(api):
+    vistas, ruta = 0, '/api/tareas?limit=50'
+    while ruta:
+        respuesta = api.get(ruta)
+        vistas += len(respuesta.json)
+        cursor = respuesta.headers.get('X-Next-Cursor')
+        ruta = f'/api/tareas?limit=50&cursor={cursor}' if cursor else None
+    assert vistas == api.tamaño
+
+
+@pytest.mark.parametrize('posicion', ['"ab"', '{"a":1,"b":2}', '["2026-01-01T00:00:00"]',
+                                      '["2026-01-01T00:00:00",{"x":1}]', '["2026-01-01T00:00:00",5]',
+                                      '[5,"id"]'])
+def test_cursor_invalido(api, posicion):
+    cursor = base64.urlsafe_b64encode(posicion.encode()).decode().rstrip('=')
+    assert api.get(f'/api/tareas?cursor={cursor}', estado=400).json['error'] == 'cursor inválido'
+
+
+def test_obtener(api):
+    assert api.get('/api/tareas/{tarea}').json['id_tarea'] == api.ids['tarea']
+
+
+def test_estadisticas(api):
+    assert api.get('/api/tareas/estadisticas').json['total'] == api.tamaño
+
+
+def test_tareas_de_la_sala(api):
+    # Las del principal en la sala (índices impares) más una por participante, con su autor
+    tareas = api.get('/api/tareas/sala/{sala}').json
+    assert len(tareas) == api.tamaño // 2 + api.tamaño
+    assert all(tarea['usuario']['Username'] for tarea in tareas)
+
+
+def test_depuracion(api):
+    assert api.get('/api/tareas/debug').json['estadisticas']['total'] == api.tamaño
+
+
+def test_crear(api):
+    respuesta = api.post('/api/tareas', {
+        'titulo': 'Nueva', 'fecha_vencimiento': (date.today() + timedelta(days=2)).isoformat(),
+        'sala_id': api.ids['sala'], 'prioridad': 'alta'
+    }, estado=201)
+    assert respuesta.json['estado'] == 'Pendiente'
+
+
+def test_completar(api):
+    api.put('/api/tareas/{tarea}', {'estado': 'Pendiente'})
+    respuesta = api.put('/api/tareas/{tarea}', {'estado': 'Completado', 'comentario': 'hecha'})
+    assert respuesta.json['estado'] == 'Completado'
+
+
+def test_eliminar(api):
+    api.delete('/api/tareas/{tarea}')
+    api.get('/api/tareas/{tarea}', estado=404)
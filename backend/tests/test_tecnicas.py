@@ -0,0 +1,24 @@
+def test_listar(api):
+    assert len(api.get('/api/tecnicas').json) == 3
+    assert all(t['categoria'] == 'bienestar' for t in api.get('/api/tecnicas?categoria=bienestar').json)
+
+
+def test_populares(api):
+    assert api.get('/api/tecnicas/populares').is_json
+
+
+def test_categorias(api):
+    assert api.get('/api/tecnicas/categorias').json
+
+
+def test_obtener(api):
+    assert api.get('/api/tecnicas/{tecnica}').json['nombre'] == 'Pomodoro'
+
+
+def test_crear_actualizar_y_eliminar(api):
+    tecnica = api.post('/api/tecnicas', {'nombre': 'Feynman', 'categoria': 'estudio'}, estado=201).json
+    ruta = f"/api/tecnicas/{tecnica['id_tecnica']}"
+    api.post('/api/tecnicas', {'nombre': 'Feynman'}, estado=400)
+    assert api.put(ruta, {'nombre': 'Método Feynman'}).json['nombre'] == 'Método Feynman'
+    api.delete(ruta)
+    api.get(ruta, estado=404)
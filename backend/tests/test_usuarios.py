@@ -0,0 +1,66 @@
+from app.middlewere.auth_middleware import invalidar_principal
+from app.models import db, Rol, Usuario
+from tests.datos import PASSWORD
+
+
+def test_listar(api):
+    assert len(api.get('/api/usuarios').json) == min(api.tamaño + 1, 50)
+
+
+def test_listar_con_tareas(api):
+    usuarios = api.get('/api/usuarios?include=tareas&view=full').json
+    # Tareas y vista full solo del propio usuario; el resto recibe la vista profile
+    propios = [u for u in usuarios if u['id_usuario'] == api.ids['usuario']]
+    assert propios and all('tareas' in u and 'celular' in u for u in propios)
+    assert all('tareas' not in u and 'celular' not in u for u in usuarios if u not in propios)
+
+
+def test_listar_proyectado(api):
+    usuarios = api.get('/api/usuarios?limit=10&fields=id_usuario,username').json
+    assert set(usuarios[0]) == {'id_usuario', 'username'}
+
+
+def test_obtener(api):
+    assert api.get('/api/usuarios/{otro_usuario}').json['id_usuario'] == api.ids['otro_usuario']
+
+
+def test_tareas_del_usuario(api):
+    assert len(api.get('/api/usuarios/{usuario}/tareas').json) == min(api.tamaño, 50)
+
+
+def test_datos_privados_de_otro_usuario(api):
+    api.get('/api/usuarios/{otro_usuario}/tareas', estado=403)
+    api.get('/api/usuarios/{otro_usuario}?view=full', estado=403)
+    assert 'celular' in api.get('/api/usuarios/{usuario}?view=full').json
+    encontrados = api.get('/api/usuarios/search?q=participante&view=full&include=tareas').json
+    assert encontrados and all('celular' not in u and 'tareas' not in u for u in encontrados)
+
+
+def test_admin_ve_datos_privados(api, app):
+    with app.app_context():
+        usuario = db.session.get(Usuario, api.ids['usuario'])
+        usuario.rol_id = Rol.query.filter_by(nombre='admin').one().id
+        db.session.commit()
+        invalidar_principal(api.ids['usuario'])
+    assert 'celular' in api.get('/api/usuarios/{otro_usuario}?view=full').json
+    api.get('/api/usuarios/{otro_usuario}/tareas')
+
+
+def test_buscar(api):
+    assert len(api.get('/api/usuarios/search?q=participante&limit=10').json) == min(api.tamaño, 10)
+
+
+def test_crear_actualizar_y_desactivar(api):
+    usuario = api.post('/api/usuarios', {
+        'username': 'creado', 'correo': 'creado@synapse.com', 'password': PASSWORD
+    }, estado=201).json
+    ruta = f"/api/usuarios/{usuario['id_usuario']}"
+    assert api.put(ruta, {'username': 'renombrado'}).json['username'] == 'renombrado'
+    api.delete(ruta)
+    assert api.get(ruta).json['activo'] is False
+
+
+def test_buscar_prefijo_corto_sin_distinguir_mayusculas(api):
+    api.post('/api/usuarios', {'username': 'ZoeMayus', 'correo': 'Zoe@Synapse.com', 'password': PASSWORD}, estado=201)
+    assert [u['username'] for u in api.get('/api/usuarios/search?q=ZO').json] == ['ZoeMayus']
+    assert [u['username'] for u in api.get('/api/usuarios/search?q=zo').json] == ['ZoeMayus']
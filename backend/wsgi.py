@@ -0,0 +1,14 @@
+"""Punto de entrada WSGI para producción: gunicorn -c gunicorn.conf.py wsgi:app
+
+A diferencia de run.py, la configuración por defecto es 'production'.
+"""
+import os
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno desde .env antes de leer la configuración
+load_dotenv()
+
+from app import create_app
+
+app = create_app(os.environ.get('FLASK_ENV', 'production'))